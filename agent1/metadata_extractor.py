@@ -1,24 +1,99 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import time
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import md5
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import orjson
 from pydantic import ValidationError
 
+from utils import llm_cache
 from utils.logger import get_logger, format_exception
+from utils.tokens import (
+    COMPLETION_RESERVE,
+    DEFAULT_MODEL,
+    context_window,
+    count_tokens,
+    split_text,
+)
 
 from agent1.openai_client import OpenAIJSONCaller, _usage_get
+from extract.cleaning import read_clean_text
+from extract.text_files import read_text
 from schemas.metadata import PaperMetadata
 
 META_DIR = Path(__file__).resolve().parents[1] / "data" / "meta"
+# Sections worth sending besides the front matter when filtering is enabled
+# (``sections=`` / ``--sections``); by default the full text is sent. Data
+# sources, GWAS thresholds and QC steps live in the methods and data
+# availability statements, but two-column layouts often spill methods text
+# into the neighbouring introduction and results spans, so those are kept
+# too. A source cited only in the reference list is still lost.
+RECOMMENDED_SECTIONS = (
+    "abstract",
+    "introduction",
+    "methods",
+    "results",
+    "declarations",
+)
+
+# Agent 1 requests kept in flight by ``MetadataExtractor.aextract_many``.
+DEFAULT_CONCURRENCY = 8
+
+# Free-text fields whose partial values from several windows are all kept,
+# joined with ``"; "``. Other text fields take the first window's value and
+# list fields the union in window order.
+JOINED_FIELDS = ("additional_QC",)
 
 
 logger = get_logger(__name__)
 
 
+def merge_metadata(
+    partials: Sequence[Optional[PaperMetadata]],
+) -> Optional[PaperMetadata]:
+    """Combine the metadata extracted from consecutive windows of one paper.
+
+    The result only depends on the order of ``partials``, not on which
+    request finished first. Missing windows (``None``) are skipped; ``None``
+    is returned when every window failed.
+    """
+    found = [p for p in partials if p is not None]
+    if not found:
+        return None
+    merged: Dict[str, Any] = {}
+    for name in PaperMetadata.model_fields:
+        values = [getattr(p, name) for p in found]
+        values = [v for v in values if v not in (None, "", [])]
+        if not values:
+            merged[name] = None
+        elif isinstance(values[0], list):
+            seen: Dict[str, str] = {}
+            for value in values:
+                for item in value:
+                    seen.setdefault(item.strip().lower(), item)
+            merged[name] = list(seen.values())
+        elif name in JOINED_FIELDS:
+            merged[name] = "; ".join(dict.fromkeys(values))
+        else:
+            merged[name] = values[0]
+    return PaperMetadata.model_validate(merged)
+
+
 class MetadataExtractor:
     """Extract metadata from text using OpenAI and validate against schema."""
 
@@ -27,8 +102,24 @@ class MetadataExtractor:
         client: Optional[OpenAIJSONCaller] = None,
         *,
         model: str = "gpt-4o-2024-05-13",
+        sections: Optional[Sequence[str]] = None,
+        clean: bool = True,
+        window_tokens: Optional[int] = None,
     ) -> None:
+        """``sections`` limits text read from files to those sections (see
+        ``extract.sections`` and ``RECOMMENDED_SECTIONS``); the default
+        ``None`` sends the full text. ``clean`` strips
+        running headers/footers and the reference list first (see
+        ``extract.cleaning``).
+
+        Papers too long for one request are split into windows that are
+        extracted concurrently and merged with :func:`merge_metadata`.
+        ``window_tokens`` caps the window size below what the model's
+        context window allows, trading more requests for lower latency."""
         self.client = client or OpenAIJSONCaller(model=model)
+        self.sections = sections
+        self.clean = clean
+        self.window_tokens = window_tokens
         META_DIR.mkdir(parents=True, exist_ok=True)
 
     @staticmethod
@@ -37,9 +128,20 @@ class MetadataExtractor:
 
     def _load_text(self, text_or_path: Union[str, Path]) -> tuple[str, Optional[Path]]:
         path = Path(text_or_path)
-        if path.exists():
-            data = orjson.loads(path.read_bytes())
-            text = self._join_pages(data.get("pages", []))
+        try:
+            is_file = path.exists()
+        except OSError:  # raw text too long to be a file name
+            is_file = False
+        if is_file:
+            if not self.clean:
+                return read_text(path, self.sections), path
+            text, stats = read_clean_text(path, self.sections)
+            logger.info(
+                "Cleaned %s: removed %d chars (~%d tokens)",
+                path.name,
+                stats.chars,
+                stats.tokens,
+            )
             return text, path
         return str(text_or_path), None
 
@@ -60,7 +162,7 @@ class MetadataExtractor:
         out_path.write_bytes(orjson.dumps(metadata.model_dump()))
 
         if text_path is not None:
-            new_text_path = text_path.with_name(f"{name}.json")
+            new_text_path = text_path.with_name(f"{name}{text_path.suffix}")
             if new_text_path != text_path:
                 try:
                     text_path.rename(new_text_path)
@@ -68,54 +170,177 @@ class MetadataExtractor:
                     pass
         return out_path
 
+    def _log_usage(self) -> None:
+        usage = getattr(self.client, "last_usage", None)
+        if usage:
+            logger.info(
+                "Tokens used: prompt=%s completion=%s total=%s",
+                _usage_get(usage, "prompt_tokens"),
+                _usage_get(usage, "completion_tokens"),
+                _usage_get(usage, "total_tokens"),
+            )
+
+    def _windows(self, text: str) -> List[str]:
+        """Return ``text`` split into windows that each fit one request."""
+        model = getattr(self.client, "model", DEFAULT_MODEL)
+        request_tokens = getattr(self.client, "request_tokens", None)
+        overhead = request_tokens("") if request_tokens is not None else 0
+        limit = context_window(model) - COMPLETION_RESERVE - overhead
+        if self.window_tokens is not None:
+            limit = min(limit, self.window_tokens)
+        tokens = count_tokens(text, model)
+        if tokens <= limit:
+            return [text]
+        windows = split_text(text, limit, model)
+        logger.info(
+            "Splitting %d tokens into %d windows of at most %d tokens",
+            tokens,
+            len(windows),
+            limit,
+        )
+        return windows
+
+    @staticmethod
+    def _validate(result: Dict[str, Any]) -> PaperMetadata:
+        return PaperMetadata.model_validate(result)
+
+    def _log_failed_attempt(
+        self, text: str, attempt: int, start: float, exc: BaseException
+    ) -> None:
+        logger.error(
+            "Validation failed on attempt %s after %.2fs (%s)",
+            attempt + 1,
+            time.time() - start,
+            format_exception(exc),
+        )
+        # A rejected reply must not be served again on retry or rerun.
+        cache_key = getattr(self.client, "cache_key", None)
+        if cache_key is not None:
+            llm_cache.discard(cache_key(text))
+
+    def _query(self, text: str) -> Optional[PaperMetadata]:
+        """Request metadata for ``text``, retrying once if it is invalid."""
+        for attempt in range(2):
+            start = time.time()
+            try:
+                metadata = self._validate(self.client.call(text))
+            except (ValidationError, Exception) as exc:
+                self._log_failed_attempt(text, attempt, start, exc)
+                self._log_usage()
+            else:
+                logger.info("API Call Duration: %.2fs", time.time() - start)
+                self._log_usage()
+                return metadata
+        return None
+
+    async def _aquery(
+        self, text: str, limit: asyncio.Semaphore | None = None
+    ) -> Optional[PaperMetadata]:
+        """Async variant of :meth:`_query`; each request holds a ``limit`` slot."""
+        for attempt in range(2):
+            start = time.time()
+            try:
+                async with limit or contextlib.nullcontext():
+                    reply = await self.client.acall(text)
+                metadata = self._validate(reply)
+            except (ValidationError, Exception) as exc:
+                self._log_failed_attempt(text, attempt, start, exc)
+            else:
+                logger.info("API Call Duration: %.2fs", time.time() - start)
+                return metadata
+        return None
+
+    def _finish(
+        self,
+        metadata: Optional[PaperMetadata],
+        drug_name: str | None,
+        src_path: Optional[Path],
+        text: str,
+    ) -> Optional[PaperMetadata]:
+        if metadata is None:
+            return None
+        if drug_name is not None:
+            metadata.targets = [drug_name]
+        self._save(metadata, src_path, text)
+        return metadata
+
     def extract(
         self, text_or_path: Union[str, Path], drug_name: str | None = None
     ) -> Optional[PaperMetadata]:
         """Extract metadata from ``text_or_path``.
 
         If ``drug_name`` is provided, ``metadata.targets`` is set to ``[drug_name]``
-        after validation.
+        after validation. A paper split into several windows is extracted in
+        up to ``DEFAULT_CONCURRENCY`` threads; windows that fail are left out
+        of the merge.
         """
         text, src_path = self._load_text(text_or_path)
-        for attempt in range(2):
-            start = time.time()
-            try:
-                result = self.client.call(text)
-                metadata = PaperMetadata.model_validate(result)
-                if drug_name is not None:
-                    metadata.targets = [drug_name]
-            except (ValidationError, Exception) as exc:
-                duration = time.time() - start
-                logger.error(
-                    "Validation failed on attempt %s after %.2fs (%s)",
-                    attempt + 1,
-                    duration,
-                    format_exception(exc),
-                )
-                usage = getattr(self.client, "last_usage", None)
-                if usage:
-                    logger.info(
-                        "Tokens used: prompt=%s completion=%s total=%s",
-                        _usage_get(usage, "prompt_tokens"),
-                        _usage_get(usage, "completion_tokens"),
-                        _usage_get(usage, "total_tokens"),
-                    )
-                if attempt == 1:
-                    return None
-            else:
-                duration = time.time() - start
-                logger.info("API Call Duration: %.2fs", duration)
-                usage = getattr(self.client, "last_usage", None)
-                if usage:
-                    logger.info(
-                        "Tokens used: prompt=%s completion=%s total=%s",
-                        _usage_get(usage, "prompt_tokens"),
-                        _usage_get(usage, "completion_tokens"),
-                        _usage_get(usage, "total_tokens"),
+        windows = self._windows(text)
+        if len(windows) == 1:
+            metadata = self._query(text)
+        else:
+            workers = min(len(windows), DEFAULT_CONCURRENCY)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                metadata = merge_metadata(list(pool.map(self._query, windows)))
+        return self._finish(metadata, drug_name, src_path, text)
+
+    async def aextract(
+        self,
+        text_or_path: Union[str, Path],
+        drug_name: str | None = None,
+        *,
+        limit: asyncio.Semaphore | None = None,
+    ) -> Optional[PaperMetadata]:
+        """Async variant of :meth:`extract` using ``client.acall``.
+
+        The windows of a long paper are requested together, each holding a
+        slot of ``limit`` while its request is in flight. Token usage is
+        logged by the client for each response.
+        """
+        text, src_path = await asyncio.to_thread(self._load_text, text_or_path)
+        windows = await asyncio.to_thread(self._windows, text)
+        partials = await asyncio.gather(*(self._aquery(w, limit) for w in windows))
+        metadata = partials[0] if len(windows) == 1 else merge_metadata(partials)
+        return self._finish(metadata, drug_name, src_path, text)
+
+    async def aextract_many(
+        self,
+        items: Iterable[Union[str, Path]],
+        drug_name: str | None = None,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> AsyncIterator[Tuple[Union[str, Path], Optional[PaperMetadata]]]:
+        """Extract metadata for ``items`` with at most ``concurrency`` requests
+        in flight.
+
+        Yields ``(item, metadata)`` as each paper completes, not in input
+        order. A paper that fails, including with an unexpected error, yields
+        ``None`` without affecting the others. The limit counts requests, so
+        the windows of long papers share it; at most ``concurrency`` papers
+        are loaded at a time.
+        """
+        papers = asyncio.Semaphore(max(1, concurrency))
+        requests = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(item: Union[str, Path]):
+            async with papers:
+                try:
+                    return item, await self.aextract(item, drug_name, limit=requests)
+                except Exception as exc:
+                    logger.error(
+                        "Metadata extraction failed for %s (%s)",
+                        item,
+                        format_exception(exc),
                     )
-                self._save(metadata, src_path, text)
-                return metadata
-        return None
+                    return item, None
+
+        tasks = [asyncio.create_task(run(item)) for item in items]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            for task in tasks:
+                task.cancel()
 
 
 if __name__ == "__main__":
@@ -1,19 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+import weakref
 from pathlib import Path
 from typing import Any, Dict
 
 import orjson
 import time
 
+from utils import llm_cache
 from utils.logger import get_logger, format_exception
+from utils.rate_limit import GOVERNOR
 from utils.secrets import get_openai_api_key
+from utils.tokens import (
+    context_window,
+    count_chat_tokens,
+    fits_context,
+    is_context_overflow,
+)
 
 # openai is imported lazily in tests via a stub if not installed
 import openai
 from openai import OpenAI
 
 _client: OpenAI | None = None
+# Async clients hold connections bound to the event loop that created them.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def get_client() -> OpenAI:
@@ -24,6 +38,16 @@ def get_client() -> OpenAI:
     return _client
 
 
+def get_async_client() -> Any:
+    """Return an ``AsyncOpenAI`` client cached for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = openai.AsyncOpenAI(api_key=get_openai_api_key())
+        _async_clients[loop] = client
+    return client
+
+
 try:  # OpenAI SDK v1.x
     AuthError = openai.AuthenticationError
     RateLimitError = openai.RateLimitError
@@ -56,82 +80,145 @@ class OpenAIJSONCaller:
             self.prompt = f.read()
         self.last_usage: Dict[str, int] | None = None
 
+    def _request(self, user_content: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.prompt},
+                {"role": "user", "content": user_content},
+            ],
+            "response_format": {"type": "json_object"},
+        }
+
+    def request_tokens(self, user_content: str) -> int:
+        """Return the prompt tokens of the request for ``user_content``."""
+        return count_chat_tokens(self._request(user_content)["messages"], self.model)
+
+    def _check_context(self, tokens: int) -> None:
+        if not fits_context(tokens, self.model):
+            logger.warning(
+                "Request of %d tokens leaves no room for a reply in the "
+                "%d-token context window of %s",
+                tokens,
+                context_window(self.model),
+                self.model,
+            )
+
+    def _log_failure(self, exc: Exception, attempt: int, duration: float) -> None:
+        if isinstance(exc, RateLimitError):
+            logger.warning(
+                "Rate limit hit on attempt %s after %.2fs: %s",
+                attempt + 1,
+                duration,
+                exc,
+            )
+        elif isinstance(exc, orjson.JSONDecodeError):
+            logger.error(
+                "JSON decode error on attempt %s (%s)",
+                attempt + 1,
+                format_exception(exc),
+            )
+        else:
+            logger.error(
+                "OpenAI request failed on attempt %s after %.2fs (%s)",
+                attempt + 1,
+                duration,
+                format_exception(exc),
+            )
+
+    def _parse(self, response: Any, duration: float) -> llm_cache.Reply:
+        """Log ``response`` usage; return its JSON content and total tokens."""
+        self.last_usage = response.usage
+        logger.info("API Call Duration: %.2fs", duration)
+        if self.last_usage:
+            logger.info(
+                "Tokens used: prompt=%s completion=%s total=%s",
+                _usage_get(self.last_usage, "prompt_tokens"),
+                _usage_get(self.last_usage, "completion_tokens"),
+                _usage_get(self.last_usage, "total_tokens"),
+            )
+        result = orjson.loads(response.choices[0].message.content)
+        logger.info("OpenAI call succeeded")
+        return result, _usage_get(self.last_usage, "total_tokens")
+
+    def cache_key(self, user_content: str) -> str:
+        """Return the ``utils.llm_cache`` key of the request for ``user_content``."""
+        return llm_cache.cache_key(
+            "chat.completions", self.model, self.prompt, user_content, "json_object"
+        )
+
     def call(self, user_content: str, *, max_retries: int = 2) -> Dict[str, Any]:
-        """Send ``user_content`` to the model and parse the JSON reply."""
-        messages = [
-            {"role": "system", "content": self.prompt},
-            {"role": "user", "content": user_content},
-        ]
+        """Send ``user_content`` to the model and parse the JSON reply.
+
+        A reply to the same model, prompt and content is served from
+        ``utils.llm_cache`` without calling the API.
+        """
+        return llm_cache.cached(
+            self.cache_key(user_content),
+            lambda: self._call(user_content, max_retries),
+        )
+
+    def _call(self, user_content: str, max_retries: int) -> llm_cache.Reply:
+        request = self._request(user_content)
+        tokens = self.request_tokens(user_content)
+        self._check_context(tokens)
         delay = 1.0
         client = get_client()
         for attempt in range(max_retries + 1):
             start_time = time.time()
+            slot = GOVERNOR.request(self.model, tokens)
             try:
-                response = client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    response_format={"type": "json_object"},
-                )
+                with slot:
+                    response = slot.call(client.chat.completions, **request)
+                return self._parse(response, time.time() - start_time)
             except AuthError as exc:  # pragma: no cover - auth errors
                 duration = time.time() - start_time
-                logger.error(
-                    "Authentication failed after %.2fs: %s",
-                    duration,
-                    exc,
-                )
+                logger.error("Authentication failed after %.2fs: %s", duration, exc)
                 raise
-            except RateLimitError as exc:  # pragma: no cover - rate limit
-                duration = time.time() - start_time
-                logger.warning(
-                    "Rate limit hit on attempt %s after %.2fs: %s",
-                    attempt + 1,
-                    duration,
-                    exc,
-                )
-                if attempt >= max_retries:
+            except Exception as exc:
+                self._log_failure(exc, attempt, time.time() - start_time)
+                # A request too long for the model fails the same way again.
+                if attempt >= max_retries or is_context_overflow(exc):
                     raise
-                time.sleep(delay)
+                slot.backoff(delay)
                 delay *= 2
-                continue
-            except Exception as exc:  # pragma: no cover - network errors
-                duration = time.time() - start_time
-                logger.error(
-                    "OpenAI request failed on attempt %s after %.2fs (%s)",
-                    attempt + 1,
-                    duration,
-                    format_exception(exc),
-                )
-                if attempt >= max_retries:
-                    raise
-                time.sleep(delay)
-                delay *= 2
-                continue
-
-            duration = time.time() - start_time
-            self.last_usage = response.usage
-            logger.info("API Call Duration: %.2fs", duration)
-            if self.last_usage:
-                logger.info(
-                    "Tokens used: prompt=%s completion=%s total=%s",
-                    _usage_get(self.last_usage, "prompt_tokens"),
-                    _usage_get(self.last_usage, "completion_tokens"),
-                    _usage_get(self.last_usage, "total_tokens"),
-                )
-            content = response.choices[0].message.content
+        # Should never reach here
+        raise RuntimeError("Failed to obtain JSON from OpenAI")
+
+    async def acall(self, user_content: str, *, max_retries: int = 2) -> Dict[str, Any]:
+        """Async variant of :meth:`call` using ``AsyncOpenAI``.
+
+        Retries wait with ``asyncio.sleep`` so other requests keep running.
+        Both variants share the response cache and are admitted by the
+        process-wide ``utils.rate_limit`` governor.
+        """
+        return await llm_cache.acached(
+            self.cache_key(user_content),
+            lambda: self._acall(user_content, max_retries),
+        )
+
+    async def _acall(self, user_content: str, max_retries: int) -> llm_cache.Reply:
+        request = self._request(user_content)
+        tokens = self.request_tokens(user_content)
+        self._check_context(tokens)
+        delay = 1.0
+        client = get_async_client()
+        for attempt in range(max_retries + 1):
+            start_time = time.time()
+            slot = GOVERNOR.request(self.model, tokens)
             try:
-                result = orjson.loads(content)
-            except orjson.JSONDecodeError as exc:
-                logger.error(
-                    "JSON decode error on attempt %s (%s)",
-                    attempt + 1,
-                    format_exception(exc),
-                )
-                if attempt >= max_retries:
+                async with slot:
+                    response = await slot.acall(client.chat.completions, **request)
+                return self._parse(response, time.time() - start_time)
+            except AuthError as exc:  # pragma: no cover - auth errors
+                duration = time.time() - start_time
+                logger.error("Authentication failed after %.2fs: %s", duration, exc)
+                raise
+            except Exception as exc:
+                self._log_failure(exc, attempt, time.time() - start_time)
+                if attempt >= max_retries or is_context_overflow(exc):
                     raise
-                time.sleep(delay)
+                await slot.abackoff(delay)
                 delay *= 2
-            else:
-                logger.info("OpenAI call succeeded")
-                return result
         # Should never reach here
         raise RuntimeError("Failed to obtain JSON from OpenAI")
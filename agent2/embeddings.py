@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-from typing import List
+from collections import deque
+from typing import Deque, Iterable, Iterator, List, Tuple
 import time
 
 import openai
 from openai import OpenAI
 
 from utils.logger import get_logger, format_exception
+from utils.rate_limit import GOVERNOR
 from utils.secrets import get_openai_api_key
+from utils.tokens import count_tokens
+
+EMBED_MODEL = "text-embedding-3-small"
 
 _client: OpenAI | None = None
 
@@ -32,40 +37,80 @@ except AttributeError:  # pragma: no cover - fallback
 logger = get_logger(__name__)
 
 
-def chunk_text(text: str, chunk_size: int = 512, overlap: int = 64) -> List[str]:
-    """Split text into overlapping chunks of approximately ``chunk_size`` tokens."""
+def chunk_text(
+    text: str,
+    chunk_size: int = 512,
+    overlap: int = 64,
+    *,
+    model: str = EMBED_MODEL,
+) -> List[str]:
+    """Split text into overlapping chunks of at most ``chunk_size`` tokens.
+
+    Chunks break between words; tokens are counted with ``model``'s encoding
+    (see ``utils.tokens``). Only a single word longer than ``chunk_size``
+    yields a longer chunk.
+    """
+    return list(iter_chunks([text], chunk_size, overlap, model=model))
+
+
+def iter_chunks(
+    texts: Iterable[str],
+    chunk_size: int = 512,
+    overlap: int = 64,
+    *,
+    model: str = EMBED_MODEL,
+) -> Iterator[str]:
+    """Yield the chunks ``chunk_text`` returns for ``" ".join(texts)``.
+
+    Words are buffered only up to one chunk, so pages can be streamed in
+    without joining the whole document first.
+    """
     if chunk_size <= 0:
         raise ValueError("chunk_size must be positive")
     if overlap >= chunk_size or overlap < 0:
         raise ValueError("overlap must be non-negative and smaller than chunk_size")
-
-    tokens = text.split()
-    chunks: List[str] = []
     step = chunk_size - overlap
-    for start in range(0, len(tokens), step):
-        end = start + chunk_size
-        chunk = " ".join(tokens[start:end])
-        if chunk:
-            chunks.append(chunk)
-    return chunks
-
-
-def embed_chunks(
-    chunks: List[str], *, model: str = "text-embedding-3-small"
-) -> List[List[float]]:
+    window: Deque[Tuple[str, int]] = deque()
+    total = 0
+
+    def advance() -> None:
+        # Drop at least ``step`` tokens from the front of the window.
+        nonlocal total
+        dropped = 0
+        while window and dropped < step:
+            dropped += window.popleft()[1]
+        total -= dropped
+
+    for text in texts:
+        for word in text.split():
+            tokens = count_tokens(word, model)
+            if window and total + tokens > chunk_size:
+                yield " ".join(w for w, _ in window)
+                advance()
+            window.append((word, tokens))
+            total += tokens
+            if total >= chunk_size:
+                yield " ".join(w for w, _ in window)
+                advance()
+    while window:
+        yield " ".join(w for w, _ in window)
+        advance()
+
+
+def embed_chunks(chunks: List[str], *, model: str = EMBED_MODEL) -> List[List[float]]:
     """Generate embeddings for each text chunk using OpenAI's embeddings API."""
     if not chunks:
         return []
 
     client = get_client()
+    tokens = sum(count_tokens(c, model) for c in chunks)
     delay = 1.0
     for attempt in range(3):
         start_time = time.time()
+        slot = GOVERNOR.request(model, tokens)
         try:
-            response = client.embeddings.create(
-                model=model,
-                input=chunks,
-            )
+            with slot:
+                response = slot.call(client.embeddings, model=model, input=chunks)
         except AuthError as exc:  # pragma: no cover - auth errors
             duration = time.time() - start_time
             logger.error("Authentication failed after %.2fs: %s", duration, exc)
@@ -80,7 +125,7 @@ def embed_chunks(
             )
             if attempt >= 2:
                 raise
-            time.sleep(delay)
+            slot.backoff(delay)
             delay *= 2
             continue
         except Exception as exc:  # pragma: no cover - network errors
@@ -1,16 +1,30 @@
 from __future__ import annotations
 
+from hashlib import blake2b
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 
 import numpy as np
 import orjson
 import faiss
 
-from .embeddings import chunk_text, embed_chunks
+from extract.cleaning import CleanStats, iter_clean_pages
+from extract.pdf_to_text import complete_pages
+from extract.text_files import iter_pages
+from utils.disk_cache import DiskCache
+from utils.logger import get_logger
+
+from .embeddings import embed_chunks, iter_chunks
+
+logger = get_logger(__name__)
 
 _QUERY_CACHE: Dict[Tuple[str, str], Tuple[float, ...]] = {}
 
+# Chunk embeddings are cached here when set, keyed by model and chunk text,
+# so workspaces sharing a paper embed it once (see ``ingest.shared_store``).
+EMBEDDING_CACHE_PATH: Optional[Path] = None
+EMBEDDING_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
 
 def _cached_query_embedding(query: str, model: str) -> List[float]:
     """Return the embedding for ``query`` using ``model`` with caching."""
@@ -25,20 +39,67 @@ def clear_cache() -> None:
     _QUERY_CACHE.clear()
 
 
+def embedding_key(text: str, model: str) -> str:
+    """Return the embedding cache key for ``text`` embedded with ``model``."""
+    digest = blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=16)
+    return digest.hexdigest()
+
+
+def embed_with_cache(
+    texts: List[str],
+    *,
+    model: str,
+    batch_size: int = 100,
+    cache: DiskCache | None = None,
+) -> List[List[float]]:
+    """Embed ``texts`` in batches, reusing and filling ``cache`` if given."""
+    embeddings: List[Optional[List[float]]] = [None] * len(texts)
+    keys = [embedding_key(text, model) for text in texts]
+    if cache is not None:
+        for i, key in enumerate(keys):
+            value = cache.get(key)
+            if value is not None:
+                embeddings[i] = np.frombuffer(value, dtype="float32").tolist()
+    missing = [i for i, emb in enumerate(embeddings) if emb is None]
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start : start + batch_size]
+        for i, emb in zip(batch, embed_chunks([texts[i] for i in batch], model=model)):
+            embeddings[i] = emb
+            if cache is not None:
+                cache.set(keys[i], np.asarray(emb, dtype="float32").tobytes())
+    if cache is not None:
+        logger.info(
+            "Embeddings: %d cached, %d requested",
+            len(texts) - len(missing),
+            len(missing),
+        )
+    return embeddings  # type: ignore[return-value]
+
+
 def build_openai_index(
     text_json_paths: List[Path],
     index_path: Path,
     *,
     model: str = "text-embedding-3-small",
     batch_size: int = 100,
+    clean: bool = True,
 ) -> None:
-    """Build a FAISS index from text files using OpenAI embeddings."""
+    """Build a FAISS index from text files using OpenAI embeddings.
+
+    With ``clean`` running headers/footers and reference lists are removed
+    before chunking (see ``extract.cleaning``). Pages deferred by a lazy
+    extraction are parsed first. Chunk embeddings are reused from the cache
+    at ``EMBEDDING_CACHE_PATH`` when it is set.
+    """
     chunks: List[Dict[str, Any]] = []
     for path in text_json_paths:
-        data = orjson.loads(path.read_bytes())
-        pages = data.get("pages", [])
-        text = " ".join(p.get("text", "") for p in pages)
-        for idx, chunk in enumerate(chunk_text(text)):
+        complete_pages(path)
+        stats = CleanStats()
+        if clean:
+            texts = iter_clean_pages(path, stats)
+        else:
+            texts = (p.get("text", "") for p in iter_pages(path))
+        for idx, chunk in enumerate(iter_chunks(texts, model=model)):
             chunks.append(
                 {
                     "text": chunk,
@@ -46,14 +107,27 @@ def build_openai_index(
                     "doi": path.stem,
                 }
             )
+        if clean:
+            logger.info(
+                "Cleaned %s: removed %d chars (~%d tokens)",
+                path.name,
+                stats.chars,
+                stats.tokens,
+            )
 
     if not chunks:
         return
 
-    embeddings: List[List[float]] = []
-    for start in range(0, len(chunks), batch_size):
-        batch = [c["text"] for c in chunks[start : start + batch_size]]
-        embeddings.extend(embed_chunks(batch, model=model))
+    chunk_texts = [c["text"] for c in chunks]
+    if EMBEDDING_CACHE_PATH is None:
+        embeddings = embed_with_cache(chunk_texts, model=model, batch_size=batch_size)
+    else:
+        with DiskCache(
+            EMBEDDING_CACHE_PATH, max_bytes=EMBEDDING_CACHE_MAX_BYTES
+        ) as cache:
+            embeddings = embed_with_cache(
+                chunk_texts, model=model, batch_size=batch_size, cache=cache
+            )
 
     matrix = np.array(embeddings, dtype="float32")
     faiss.normalize_L2(matrix)
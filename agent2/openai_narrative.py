@@ -5,8 +5,11 @@ from typing import Dict, List
 import time
 import orjson
 
+from utils import llm_cache
 from utils.logger import get_logger, format_exception
+from utils.rate_limit import GOVERNOR
 from utils.secrets import get_openai_api_key
+from utils.tokens import count_chat_tokens
 
 # openai imported lazily for tests
 import openai
@@ -58,20 +61,31 @@ class OpenAINarrative:
     def generate(
         self, metadata: List[Dict], snippets: List[str], *, max_retries: int = 2
     ) -> str:
-        """Generate Markdown narrative integrating metadata and text snippets."""
+        """Generate Markdown narrative integrating metadata and text snippets.
+
+        A narrative for the same model, prompt and input is served from
+        ``utils.llm_cache`` without calling the API.
+        """
+        user = self._format_input(metadata, snippets)
+        key = llm_cache.cache_key("chat.completions", self.model, self.prompt, user)
+        return llm_cache.cached(key, lambda: self._generate(user, max_retries))
+
+    def _generate(self, user: str, max_retries: int) -> llm_cache.Reply:
         messages = [
             {"role": "system", "content": self.prompt},
-            {"role": "user", "content": self._format_input(metadata, snippets)},
+            {"role": "user", "content": user},
         ]
         client = get_client()
+        tokens = count_chat_tokens(messages, self.model)
         delay = 1.0
         for attempt in range(max_retries + 1):
             start_time = time.time()
+            slot = GOVERNOR.request(self.model, tokens)
             try:
-                response = client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                )
+                with slot:
+                    response = slot.call(
+                        client.chat.completions, model=self.model, messages=messages
+                    )
             except AuthError as exc:  # pragma: no cover - auth errors
                 duration = time.time() - start_time
                 logger.error(
@@ -90,7 +104,7 @@ class OpenAINarrative:
                 )
                 if attempt >= max_retries:
                     raise
-                time.sleep(delay)
+                slot.backoff(delay)
                 delay *= 2
                 continue
             except Exception as exc:  # pragma: no cover - network errors
@@ -119,5 +133,5 @@ class OpenAINarrative:
                 )
             content = response.choices[0].message.content
             logger.info("Narrative generation succeeded")
-            return content
+            return content, _usage_get(usage, "total_tokens")
         raise RuntimeError("Failed to obtain narrative from OpenAI")
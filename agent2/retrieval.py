@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from pathlib import Path
 import re
-from typing import List, Literal
-
-import orjson
+from typing import Iterator, List, Literal
 
+from extract.pdf_to_text import complete_pages
+from extract.text_files import find_text_file, iter_pages, list_text_files
 from utils.logger import get_logger
 from .openai_index import query_index, build_openai_index
 
@@ -27,17 +27,25 @@ def _safe_name(doi: str) -> str:
     return doi.replace("/", "_").replace(":", "_")
 
 
-def load_pages(doi: str) -> List[dict]:
-    path = TEXT_DIR / f"{_safe_name(doi)}.json"
-    if not path.exists():
+def iter_doc_pages(doi: str) -> Iterator[dict]:
+    """Yield the pages of the text file for ``doi`` one at a time.
+
+    Pages deferred by a lazy extraction are parsed first.
+    """
+    path = find_text_file(TEXT_DIR, _safe_name(doi))
+    if path is None:
         logger.warning("Text file missing for DOI %s", doi)
-        return []
-    data = orjson.loads(path.read_bytes())
-    return data.get("pages", [])
+        return
+    complete_pages(path)
+    yield from iter_pages(path)
+
+
+def load_pages(doi: str) -> List[dict]:
+    return list(iter_doc_pages(doi))
 
 
 def _keyword_snippets(doi: str, keyword: str, *, window: int = 40) -> List[str]:
-    pages = load_pages(doi)
+    pages = iter_doc_pages(doi)
     pattern = re.compile(re.escape(keyword), re.IGNORECASE)
     results: List[str] = []
     for page in pages:
@@ -72,7 +80,7 @@ def get_snippets(
 
     if method == "faiss":
         if not INDEX_PATH.exists():
-            paths = sorted(TEXT_DIR.glob("*.json"))
+            paths = list_text_files(TEXT_DIR)
             if paths:
                 logger.info("Building embedding index with %s files", len(paths))
                 build_openai_index(
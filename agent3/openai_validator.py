@@ -6,8 +6,11 @@ import time
 import openai
 from openai import OpenAI
 
+from utils import llm_cache
 from utils.logger import get_logger, format_exception
+from utils.rate_limit import GOVERNOR
 from utils.secrets import get_openai_api_key
+from utils.tokens import count_tokens
 
 PROMPT_PATH = Path(__file__).resolve().parents[1] / "prompts" / "agent3_system.txt"
 
@@ -16,6 +19,7 @@ logger = get_logger(__name__)
 _client: OpenAI | None = None
 _assistant_id: str | None = None
 _assistant_model: str | None = None
+_assistant_prompt: str = ""
 
 try:  # OpenAI SDK v1.x
     AuthError = openai.AuthenticationError
@@ -34,7 +38,7 @@ def _get_client() -> OpenAI:
 
 
 def _init_assistant(model: str) -> None:
-    global _assistant_id, _assistant_model
+    global _assistant_id, _assistant_model, _assistant_prompt
     if _assistant_id is None or _assistant_model != model:
         with PROMPT_PATH.open("r", encoding="utf-8") as f:
             prompt = f.read()
@@ -42,6 +46,7 @@ def _init_assistant(model: str) -> None:
         assistant = client.beta.assistants.create(instructions=prompt, model=model)
         _assistant_id = assistant.id
         _assistant_model = model
+        _assistant_prompt = prompt
 
 
 def _wait_for_run(client: OpenAI, thread_id: str, run_id: str) -> None:
@@ -67,19 +72,35 @@ def is_conflict(
     *,
     max_retries: int = 2,
 ) -> bool:
-    """Return ``True`` if the two values appear logically inconsistent."""
+    """Return ``True`` if the two values appear logically inconsistent.
+
+    Judgements are cached in ``utils.llm_cache`` by model, assistant
+    instructions and the compared values.
+    """
     _init_assistant(model)
-    client = _get_client()
     user = f"Field: {field_name}\nValue 1: {value1}\nValue 2: {value2}"
+    key = llm_cache.cache_key("assistants.runs", model, _assistant_prompt, user)
+    return llm_cache.cached(key, lambda: (_judge(user, model, max_retries), None))
+
+
+def _judge(user: str, model: str, max_retries: int) -> bool:
+    client = _get_client()
     delay = 1.0
     for attempt in range(max_retries + 1):
+        slot = GOVERNOR.request(model, count_tokens(user, model))
         try:
-            thread = client.beta.threads.create(
-                messages=[{"role": "user", "content": user}]
-            )
-            run = client.beta.threads.runs.create(
-                thread_id=thread.id, assistant_id=_assistant_id
-            )
+            # The slot covers the requests that start the run, not the polling
+            # until it completes, so slow runs do not occupy a concurrency slot.
+            with slot:
+                thread = slot.call(
+                    client.beta.threads,
+                    messages=[{"role": "user", "content": user}],
+                )
+                run = slot.call(
+                    client.beta.threads.runs,
+                    thread_id=thread.id,
+                    assistant_id=_assistant_id,
+                )
             _wait_for_run(client, thread.id, run.id)
             messages = client.beta.threads.messages.list(thread_id=thread.id)
             answer = messages.data[0].content[0].text.value.strip().lower()
@@ -104,6 +125,6 @@ def is_conflict(
             if answer.startswith("no"):
                 return False
             raise RuntimeError(f"Unexpected reply: {answer}")
-        time.sleep(delay)
+        slot.backoff(delay)
         delay *= 2
     raise RuntimeError("Failed to obtain conflict judgement")
@@ -4,6 +4,7 @@ import argparse
 from pathlib import Path
 
 from agent2.openai_index import build_openai_index
+from extract.text_files import list_text_files
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -24,7 +25,7 @@ def main(argv: list[str] | None = None) -> int:
     base = Path(args.base_dir)
     text_dir = base / "text"
     index_path = base / "index.faiss"
-    paths = list(text_dir.glob("*.json"))
+    paths = list_text_files(text_dir)
     build_openai_index(paths, index_path, model=args.model)
     return 0
 
@@ -4,6 +4,7 @@ import argparse
 from pathlib import Path
 
 from agent2.openai_index import build_openai_index
+from extract.text_files import list_text_files
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -28,7 +29,7 @@ def main(argv: list[str] | None = None) -> int:
 
     text_dir = Path(args.text_dir)
     index_path = Path(args.index)
-    paths = list(text_dir.glob("*.json"))
+    paths = list_text_files(text_dir)
     build_openai_index(paths, index_path, model=args.model)
     return 0
 
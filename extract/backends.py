@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import ClassVar, Dict, Iterator, Protocol, Sequence, runtime_checkable
+
+import pypdfium2 as pdfium
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTContainer, LTText, LTTextContainer
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+from extract.sources import PdfSource, open_pdf, pdfium_input
+
+# Named pdfminer layout settings as ``LAParams`` keyword arguments; ``None``
+# disables layout analysis. ``accurate`` is the historical behaviour, ``fast``
+# skips the hierarchical text box ordering pass and ``raw`` emits characters in
+# content stream order without any layout analysis.
+PROFILES: dict[str, dict | None] = {
+    "accurate": {},
+    "fast": {"boxes_flow": None},
+    "raw": None,
+}
+DEFAULT_PROFILE = "accurate"
+
+
+@runtime_checkable
+class TextBackend(Protocol):
+    """A PDF text extractor producing one string per page.
+
+    PDFs are given as paths or, for archive members, as
+    :class:`extract.sources.PdfBytes`.
+
+    ``iter_extract`` yields the text of the 0-based ``page_numbers`` in
+    ascending order, or of every page when ``page_numbers`` is ``None``, one
+    page at a time; ``extract`` returns the same texts as a list. ``config``
+    returns the settings that influence the output so extraction caches can
+    tell backends apart.
+    """
+
+    name: ClassVar[str]
+
+    def page_count(self, pdf_path: PdfSource) -> int: ...
+
+    def iter_extract(
+        self, pdf_path: PdfSource, page_numbers: Sequence[int] | None = None
+    ) -> Iterator[str]: ...
+
+    def extract(
+        self, pdf_path: PdfSource, page_numbers: Sequence[int] | None = None
+    ) -> list[str]: ...
+
+    def config(self) -> dict: ...
+
+
+def laparams_for(profile: str) -> LAParams | None:
+    """Return the ``LAParams`` for ``profile`` (``None`` disables layout)."""
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown extraction profile {profile!r}; "
+            f"choose from {', '.join(PROFILES)}"
+        )
+    kwargs = PROFILES[profile]
+    return None if kwargs is None else LAParams(**kwargs)
+
+
+def count_pages(pdf_path: PdfSource) -> int:
+    """Return the number of pages without running layout analysis."""
+    with open_pdf(pdf_path) as f:
+        doc = PDFDocument(PDFParser(f))
+        return sum(1 for _ in PDFPage.create_pages(doc))
+
+
+def _raw_text(container: LTContainer) -> str:
+    parts: list[str] = []
+    for element in container:
+        if isinstance(element, LTText):
+            parts.append(element.get_text())
+        elif isinstance(element, LTContainer):
+            parts.append(_raw_text(element))
+    return "".join(parts)
+
+
+@dataclass(frozen=True)
+class PdfminerBackend:
+    """pdfminer.six layout analysis, configured by a named profile."""
+
+    profile: str = DEFAULT_PROFILE
+    name: ClassVar[str] = "pdfminer"
+
+    def __post_init__(self) -> None:
+        laparams_for(self.profile)
+
+    def page_count(self, pdf_path: PdfSource) -> int:
+        return count_pages(pdf_path)
+
+    def iter_extract(
+        self, pdf_path: PdfSource, page_numbers: Sequence[int] | None = None
+    ) -> Iterator[str]:
+        laparams = laparams_for(self.profile)
+        with open_pdf(pdf_path) as f:
+            for page_layout in extract_pages(
+                f, page_numbers=page_numbers, laparams=laparams
+            ):
+                if laparams is None:
+                    yield _raw_text(page_layout).strip()
+                else:
+                    yield "".join(
+                        element.get_text()
+                        for element in page_layout
+                        if isinstance(element, LTTextContainer)
+                    ).strip()
+
+    def extract(
+        self, pdf_path: PdfSource, page_numbers: Sequence[int] | None = None
+    ) -> list[str]:
+        return list(self.iter_extract(pdf_path, page_numbers))
+
+    def config(self) -> dict:
+        laparams = laparams_for(self.profile)
+        return {
+            "profile": self.profile,
+            "laparams": None if laparams is None else vars(laparams),
+        }
+
+
+@dataclass(frozen=True)
+class PdfiumBackend:
+    """PDFium's text layer via ``pypdfium2``; far faster than pdfminer."""
+
+    name: ClassVar[str] = "pdfium"
+
+    def page_count(self, pdf_path: PdfSource) -> int:
+        pdf = pdfium.PdfDocument(pdfium_input(pdf_path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def iter_extract(
+        self, pdf_path: PdfSource, page_numbers: Sequence[int] | None = None
+    ) -> Iterator[str]:
+        pdf = pdfium.PdfDocument(pdfium_input(pdf_path))
+        try:
+            indexes = range(len(pdf)) if page_numbers is None else page_numbers
+            for index in indexes:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+                # PDFium marks soft hyphens at line breaks with U+FFFE.
+                yield text.replace("\ufffe", "").replace("\r\n", "\n").strip()
+        finally:
+            pdf.close()
+
+    def extract(
+        self, pdf_path: PdfSource, page_numbers: Sequence[int] | None = None
+    ) -> list[str]:
+        return list(self.iter_extract(pdf_path, page_numbers))
+
+    def config(self) -> dict:
+        return {"pdfium": pdfium.PDFIUM_INFO.build}
+
+
+BACKENDS: Dict[str, type] = {
+    PdfminerBackend.name: PdfminerBackend,
+    PdfiumBackend.name: PdfiumBackend,
+}
+DEFAULT_BACKEND = PdfminerBackend.name
+
+
+def get_backend(name: str = DEFAULT_BACKEND, *, profile: str = DEFAULT_PROFILE):
+    """Return the backend registered as ``name``.
+
+    ``profile`` only applies to the pdfminer backend.
+    """
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown extraction backend {name!r}; choose from {', '.join(BACKENDS)}"
+        )
+    if name == PdfminerBackend.name:
+        return PdfminerBackend(profile)
+    return BACKENDS[name]()
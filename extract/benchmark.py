@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+try:  # resource is not available on Windows
+    import resource  # type: ignore
+except ImportError:  # pragma: no cover - platform specific
+    resource = None  # type: ignore
+
+try:  # fallback for memory metrics on Windows
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None  # type: ignore
+
+import orjson
+from rapidfuzz.fuzz import ratio
+
+from extract.pdf_to_text import BACKENDS, DEFAULT_BACKEND, PROFILES, extract_text
+
+REFERENCE_BACKEND = DEFAULT_BACKEND
+REFERENCE_PROFILE = "accurate"
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput, memory and fidelity of one backend/profile over a corpus.
+
+    ``profile`` is ``None`` for backends without layout profiles.
+    """
+
+    backend: str
+    profile: Optional[str]
+    documents: int
+    pages: int
+    seconds: float
+    pages_per_sec: float
+    peak_rss_mb: float
+    similarity: float
+
+
+def _normalise(pages: List[str]) -> str:
+    return " ".join(" ".join(pages).split())
+
+
+def _peak_rss_kb() -> int:
+    """Return this process's peak RSS in kilobytes (current RSS without resource)."""
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if psutil is not None:
+        return int(psutil.Process().memory_info().rss / 1024)
+    return 0
+
+
+def _run_variant(
+    pdf_paths: Sequence[Path], backend: str, profile: Optional[str]
+) -> Tuple[List[str], float, int, int]:
+    """Extract ``pdf_paths`` and return texts, seconds, pages and peak RSS.
+
+    Fallback backends are disabled so each run measures a single backend.
+    """
+    texts: List[str] = []
+    pages = 0
+    seconds = 0.0
+    for path in pdf_paths:
+        start = time.perf_counter()
+        page_texts = extract_text(
+            path,
+            backend=backend,
+            profile=profile or REFERENCE_PROFILE,
+            fallback=False,
+        )
+        seconds += time.perf_counter() - start
+        pages += len(page_texts)
+        texts.append(_normalise(page_texts))
+    return texts, seconds, pages, _peak_rss_kb()
+
+
+def variants(
+    backends: Sequence[str], profiles: Sequence[str]
+) -> List[Tuple[str, Optional[str]]]:
+    """Return the ``(backend, profile)`` pairs to run; profiles are pdfminer only."""
+    pairs: List[Tuple[str, Optional[str]]] = []
+    for backend in backends:
+        if backend == "pdfminer":
+            pairs.extend((backend, profile) for profile in profiles)
+        else:
+            pairs.append((backend, None))
+    return pairs
+
+
+def benchmark(
+    pdf_paths: Sequence[Path],
+    backends: Sequence[str] = tuple(BACKENDS),
+    profiles: Sequence[str] = tuple(PROFILES),
+) -> List[BenchmarkResult]:
+    """Run each backend/profile over ``pdf_paths`` in a fresh process.
+
+    A new spawned process per variant keeps peak RSS figures independent of
+    earlier runs. ``similarity`` is the mean rapidfuzz ``ratio`` (0-100)
+    between a variant's whitespace-normalised text and that of pdfminer with
+    the ``accurate`` profile, per document.
+    """
+    reference = (REFERENCE_BACKEND, REFERENCE_PROFILE)
+    wanted = variants(backends, profiles)
+    order = [reference] + [v for v in wanted if v != reference]
+    ctx = multiprocessing.get_context("spawn")
+    reference_texts: List[str] = []
+    results: List[BenchmarkResult] = []
+    for backend, profile in order:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            texts, seconds, pages, peak_kb = pool.submit(
+                _run_variant, list(pdf_paths), backend, profile
+            ).result()
+        if (backend, profile) == reference:
+            reference_texts = texts
+        scores = [
+            ratio(ref, text) if ref else 100.0
+            for ref, text in zip(reference_texts, texts)
+        ]
+        if (backend, profile) in wanted:
+            results.append(
+                BenchmarkResult(
+                    backend=backend,
+                    profile=profile,
+                    documents=len(pdf_paths),
+                    pages=pages,
+                    seconds=seconds,
+                    pages_per_sec=pages / seconds if seconds else 0.0,
+                    peak_rss_mb=peak_kb / 1024,
+                    similarity=sum(scores) / len(scores) if scores else 100.0,
+                )
+            )
+    return results
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    lines = [
+        f"{'backend':<10} {'profile':<10} {'pages':>6} {'seconds':>8} "
+        f"{'pages/s':>8} {'peakMB':>7} {'sim%':>6}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.backend:<10} {r.profile or '-':<10} {r.pages:>6} "
+            f"{r.seconds:>8.2f} {r.pages_per_sec:>8.2f} {r.peak_rss_mb:>7.1f} "
+            f"{r.similarity:>6.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare extraction backends and profiles on a directory of PDFs"
+    )
+    parser.add_argument(
+        "--pdf-dir",
+        default="data/Rapamycin/pdfs",
+        help="Directory of PDFs (default: data/Rapamycin/pdfs)",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=sorted(BACKENDS),
+        default=list(BACKENDS),
+        help=f"Backends to run (reference: {REFERENCE_BACKEND})",
+    )
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=sorted(PROFILES),
+        default=list(PROFILES),
+        help=f"pdfminer profiles to run (reference: {REFERENCE_PROFILE})",
+    )
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    pdf_paths = sorted(Path(args.pdf_dir).glob("*.pdf"))
+    if not pdf_paths:
+        print(f"No PDFs found in {args.pdf_dir}")
+        return 1
+    results = benchmark(pdf_paths, args.backends, args.profiles)
+    print(format_results(results))
+    if args.json:
+        Path(args.json).write_bytes(
+            orjson.dumps([asdict(r) for r in results], option=orjson.OPT_INDENT_2)
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
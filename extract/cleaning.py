@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import argparse
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from extract.sections import HEADING_RE, wanted_spans
+from extract.text_files import iter_pages, list_text_files, read_sections
+
+# Rough OpenAI tokenizer ratio for English prose, used for reporting only.
+CHARS_PER_TOKEN = 4
+
+# A line counts as a running header or footer when it occurs on at least
+# ``REPEAT_MIN_PAGES`` pages and on ``REPEAT_FRACTION`` of all pages. Numbers
+# of up to four digits are ignored when comparing lines, so "Page 3 of 12"
+# matches "Page 4 of 12" while long identifiers in tables stay distinct.
+# Only the first and last ``EDGE_LINES`` non-blank lines of a page are
+# candidates, and lines without letters (table cells, values) never are,
+# except for a bare page number that advances with the page.
+REPEAT_MIN_PAGES = 3
+REPEAT_FRACTION = 0.5
+EDGE_LINES = 3
+
+_DIGITS_RE = re.compile(r"(?<!\d)\d{1,4}(?!\d)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def estimate_tokens(chars: int) -> int:
+    """Return the approximate number of tokens in ``chars`` characters."""
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+@dataclass
+class CleanStats:
+    """Characters removed from one paper by :func:`clean_pages`."""
+
+    boilerplate_chars: int = 0
+    reference_chars: int = 0
+
+    @property
+    def chars(self) -> int:
+        return self.boilerplate_chars + self.reference_chars
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.chars)
+
+
+def _line_key(line: str) -> str:
+    return _DIGITS_RE.sub("#", _SPACE_RE.sub(" ", line.strip().lower()))
+
+
+def _edge_lines(lines: Sequence[str]) -> Set[int]:
+    """Return the indexes of the first and last non-blank lines of a page."""
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    return set(filled[:EDGE_LINES]) | set(filled[-EDGE_LINES:])
+
+
+def _has_letters(key: str) -> bool:
+    return any(c.isalpha() for c in key)
+
+
+def _page_number(line: str) -> Optional[int]:
+    line = line.strip()
+    return int(line) if line.isdigit() and len(line) <= 4 else None
+
+
+@dataclass
+class CleanPlan:
+    """What :func:`plan_cleaning` found to remove from a paper's pages.
+
+    ``repeated`` holds the keys of running header/footer lines and
+    ``page_offset`` the ``number - page index`` of bare page numbers.
+    """
+
+    repeated: Set[str]
+    page_offset: Optional[int]
+    pages: int
+
+
+def plan_cleaning(pages: Iterable[str]) -> CleanPlan:
+    """Find running headers/footers and page numbers in one pass over ``pages``.
+
+    Only the edge lines of each page are looked at, so pages can be streamed
+    from disk without being held in memory.
+    """
+    keys: Counter[str] = Counter()
+    offsets: Counter[int] = Counter()
+    count = 0
+    for index, text in enumerate(pages):
+        lines = text.split("\n")
+        edges = [lines[i] for i in _edge_lines(lines)]
+        keys.update({k for k in map(_line_key, edges) if _has_letters(k)})
+        numbers = {_page_number(line) for line in edges} - {None}
+        offsets.update(n - index for n in numbers)
+        count += 1
+    needed = max(REPEAT_MIN_PAGES, count * REPEAT_FRACTION)
+    offset = None
+    if offsets:
+        common, hits = offsets.most_common(1)[0]
+        offset = common if hits >= needed else None
+    repeated = {key for key, hits in keys.items() if hits >= needed}
+    return CleanPlan(repeated, offset, count)
+
+
+def repeated_lines(pages: Sequence[str]) -> Set[str]:
+    """Return the keys of header/footer lines repeated on most pages."""
+    return plan_cleaning(pages).repeated
+
+
+def page_number_offset(pages: Sequence[str]) -> Optional[int]:
+    """Return ``number - page index`` of bare page numbers, if pages have them.
+
+    A bare number at the top or bottom of a page is a page number when, on
+    most pages, it differs from the page index by the same offset.
+    """
+    return plan_cleaning(pages).page_offset
+
+
+def _joined_length(lines: Sequence[Tuple[int, str]]) -> int:
+    return sum(len(line) + 1 for _, line in lines) - 1 if lines else 0
+
+
+class _PageCleaner:
+    """Apply a :class:`CleanPlan` to pages fed in order.
+
+    A reference list starts at a references heading in the second half of
+    the document and runs until the next non-reference heading (declarations
+    or supplementary material are kept) or the end of the text. Repeated
+    lines are kept on the first page, where the journal banner and DOI are
+    part of the front matter Agent 1 reads.
+    """
+
+    def __init__(self, plan: CleanPlan, stats: CleanStats) -> None:
+        self.plan = plan
+        self.stats = stats
+        self.inside_references = False
+
+    def _is_boilerplate(self, index: int, line: str) -> bool:
+        if _line_key(line) in self.plan.repeated:
+            return True
+        offset = self.plan.page_offset
+        return offset is not None and _page_number(line) == index + offset
+
+    def lines(self, index: int, text: str) -> List[Tuple[int, str]]:
+        """Return the kept lines of page ``index`` with their offsets in it."""
+        lines = text.split("\n")
+        edges = _edge_lines(lines) if index else set()
+        numbered: List[Tuple[int, str]] = []
+        offset = 0
+        for i, line in enumerate(lines):
+            if i not in edges or not self._is_boilerplate(index, line):
+                numbered.append((offset, line))
+            offset += len(line) + 1
+        body = _joined_length(numbered)
+        self.stats.boilerplate_chars += len(text) - body
+        kept: List[Tuple[int, str]] = []
+        for offset, line in numbered:
+            match = HEADING_RE.match(line)
+            if match is not None:
+                is_references = match.lastgroup == "references"
+                if is_references and index >= self.plan.pages / 2:
+                    self.inside_references = True
+                elif not is_references:
+                    self.inside_references = False
+            if not self.inside_references:
+                kept.append((offset, line))
+        self.stats.reference_chars += body - _joined_length(kept)
+        return kept
+
+    def page(self, index: int, text: str) -> str:
+        cleaned = "\n".join(line for _, line in self.lines(index, text))
+        if self.inside_references:
+            stripped = cleaned.rstrip()
+            self.stats.reference_chars += len(cleaned) - len(stripped)
+            cleaned = stripped
+        return cleaned
+
+
+def clean_pages(pages: Sequence[str]) -> Tuple[List[str], CleanStats]:
+    """Return ``pages`` without running headers/footers and reference lists."""
+    stats = CleanStats()
+    cleaner = _PageCleaner(plan_cleaning(pages), stats)
+    return [cleaner.page(i, text) for i, text in enumerate(pages)], stats
+
+
+def _page_texts(path: Path) -> Iterator[str]:
+    return (page.get("text", "") for page in iter_pages(path))
+
+
+def iter_clean_pages(path: Path, stats: CleanStats | None = None) -> Iterator[str]:
+    """Yield the cleaned pages of a text file one at a time.
+
+    The file is read twice, first to plan the cleaning and then to apply it,
+    so only one page is held in memory. ``stats`` receives the removed
+    characters as pages are yielded.
+    """
+    cleaner = _PageCleaner(plan_cleaning(_page_texts(path)), stats or CleanStats())
+    for index, text in enumerate(_page_texts(path)):
+        yield cleaner.page(index, text)
+
+
+def read_clean_text(
+    path: Path, sections: Sequence[str] | None = None
+) -> Tuple[str, CleanStats]:
+    """Return the cleaned text of a text file joined with newlines.
+
+    ``sections`` works as in :func:`extract.text_files.read_text` and uses
+    the section spans stored at extraction time: cleaning only removes whole
+    lines, so each kept line is assigned to a section by its original offset.
+    """
+    stats = CleanStats()
+    spans = None if sections is None else wanted_spans(read_sections(path), sections)
+    if spans is None:
+        return "\n".join(iter_clean_pages(path, stats)), stats
+    cleaner = _PageCleaner(plan_cleaning(_page_texts(path)), stats)
+    parts: List[List[str]] = [[] for _ in spans]
+    span = 0
+    base = 0
+    for index, text in enumerate(_page_texts(path)):
+        for offset, line in cleaner.lines(index, text):
+            position = base + offset
+            while span < len(spans) and position >= spans[span]["end"]:
+                span += 1
+            if span < len(spans) and position >= spans[span]["start"]:
+                parts[span].append(line)
+        base += len(text) + 1
+    return "\n".join("\n".join(lines).strip() for lines in parts), stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Report the boilerplate and reference text removed per paper"
+    )
+    parser.add_argument("text_dir", help="Directory of extracted text files")
+    args = parser.parse_args(argv)
+
+    total = removed = 0
+    print(f"{'file':<40} {'chars':>8} {'removed':>8} {'~tokens':>8} {'%':>5}")
+    for path in list_text_files(Path(args.text_dir)):
+        chars = sum(len(text) + 1 for text in _page_texts(path)) - 1
+        stats = CleanStats()
+        for _ in iter_clean_pages(path, stats):
+            pass
+        total += chars
+        removed += stats.chars
+        share = 100 * stats.chars / chars if chars else 0.0
+        print(
+            f"{path.stem[:40]:<40} {chars:>8} {stats.chars:>8} "
+            f"{stats.tokens:>8} {share:>5.1f}"
+        )
+    share = 100 * removed / total if total else 0.0
+    print(
+        f"{'total':<40} {total:>8} {removed:>8} "
+        f"{estimate_tokens(removed):>8} {share:>5.1f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Dict
+
+import orjson
+
+MANIFEST_NAME = "extraction_manifest.json"
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """Return a short stable hash of an extractor configuration."""
+    raw = orjson.dumps(config, option=orjson.OPT_SORT_KEYS)
+    return md5(raw, usedforsecurity=False).hexdigest()[:16]
+
+
+class ExtractionManifest:
+    """Map ``(pdf checksum, extractor config)`` to a text JSON artifact.
+
+    The manifest lives next to the workspace's ``text/`` directory. A lookup
+    only succeeds while the recorded artifact still exists, so deleting a text
+    file forces it to be extracted again.
+    """
+
+    def __init__(self, path: Path, text_dir: Path) -> None:
+        self.path = Path(path)
+        self.text_dir = Path(text_dir)
+        self.entries: Dict[str, Dict[str, str]] = {}
+        if self.path.exists():
+            try:
+                self.entries = orjson.loads(self.path.read_bytes()).get("entries", {})
+            except orjson.JSONDecodeError:
+                self.entries = {}
+
+    @staticmethod
+    def _key(checksum: str, fingerprint: str) -> str:
+        return f"{checksum}:{fingerprint}"
+
+    def lookup(self, checksum: str, fingerprint: str) -> Path | None:
+        entry = self.entries.get(self._key(checksum, fingerprint))
+        if entry is None:
+            return None
+        artifact = self.text_dir / entry["artifact"]
+        return artifact if artifact.exists() else None
+
+    def record(
+        self, checksum: str, fingerprint: str, artifact: Path, source: str
+    ) -> None:
+        self.entries[self._key(checksum, fingerprint)] = {
+            "artifact": Path(artifact).name,
+            "source": source,
+            "extracted_at": datetime.utcnow().isoformat(),
+        }
+
+    def relocate(self, old_name: str, new_name: str) -> None:
+        """Point entries for ``old_name`` at ``new_name`` after a rename."""
+        for entry in self.entries.values():
+            if entry["artifact"] == old_name:
+                entry["artifact"] = new_name
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(
+            orjson.dumps({"entries": self.entries}, option=orjson.OPT_INDENT_2)
+        )
+        os.replace(tmp, self.path)
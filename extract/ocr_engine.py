@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import subprocess
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import mean, quantiles
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List
+
+import pytesseract
+from PIL import Image
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Tesseract ends every page with a form feed when given a list of images.
+PAGE_SEPARATOR = "\f"
+
+
+@dataclass
+class OCRStats:
+    """Per-page OCR latencies collected by :class:`TesseractEngine`."""
+
+    latencies: List[float] = field(default_factory=list)
+    batches: int = 0
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def record_batch(self, pages: int, duration: float) -> None:
+        with self._lock:
+            self.batches += 1
+            self.latencies.extend([duration / pages] * pages)
+
+    def summary(self) -> Dict[str, float]:
+        """Return page count, mean, p50, p95 and max latency in seconds."""
+        with self._lock:
+            values = list(self.latencies)
+        if not values:
+            return {"pages": 0, "batches": 0}
+        if len(values) > 1:
+            cuts = quantiles(values, n=20, method="inclusive")
+            p50, p95 = cuts[9], cuts[18]
+        else:
+            p50 = p95 = values[0]
+        return {
+            "pages": len(values),
+            "batches": self.batches,
+            "mean": mean(values),
+            "p50": p50,
+            "p95": p95,
+            "max": max(values),
+        }
+
+
+class TesseractEngine:
+    """Pool of tesseract workers that recognise pages in batches.
+
+    Starting tesseract and loading its language model usually costs more than
+    recognising a single page, so pages are grouped into batches of
+    ``batch_size`` and each batch is sent to one tesseract invocation as an
+    image list. Up to ``workers`` invocations run at once. The engine can be
+    reused across documents; its :attr:`stats` accumulate for the lifetime of
+    the engine.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 1,
+        batch_size: int = 8,
+        lang: str = "eng",
+        dpi: int | None = None,
+        cmd: str | None = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.lang = lang
+        self.dpi = dpi
+        self.cmd = cmd or pytesseract.pytesseract.tesseract_cmd
+        self.stats = OCRStats()
+        self._pool: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> "TesseractEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            summary = self.stats.summary()
+            if summary["pages"]:
+                logger.info(
+                    "OCR: %s pages in %s batches, %.2fs/page mean, "
+                    "p95 %.2fs, max %.2fs",
+                    summary["pages"],
+                    summary["batches"],
+                    summary["mean"],
+                    summary["p95"],
+                    summary["max"],
+                )
+
+    def _args(self, source: Path) -> List[str]:
+        args = [self.cmd, str(source), "stdout", "-l", self.lang]
+        if self.dpi:
+            args += ["--dpi", str(self.dpi)]
+        return args
+
+    def _invoke(self, source: Path) -> str:
+        proc = subprocess.run(self._args(source), capture_output=True, check=False)
+        if proc.returncode != 0:
+            raise pytesseract.TesseractError(
+                proc.returncode, proc.stderr.decode("utf-8", "replace").strip()
+            )
+        return proc.stdout.decode("utf-8", "replace")
+
+    def _run_batch(self, images: List[Image.Image]) -> List[str]:
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="ocr-") as tmp:
+            tmp_dir = Path(tmp)
+            paths = []
+            for i, image in enumerate(images):
+                # PNM is uncompressed, so writing it is far cheaper than PNG.
+                path = tmp_dir / f"{i:04d}.pnm"
+                image.save(path, format="PPM")
+                paths.append(path)
+            if len(paths) == 1:
+                texts = [self._invoke(paths[0])]
+            else:
+                listing = tmp_dir / "pages.txt"
+                listing.write_text("\n".join(str(p) for p in paths) + "\n")
+                texts = self._invoke(listing).split(PAGE_SEPARATOR)[: len(paths)]
+                if len(texts) != len(paths):
+                    # Unexpected output layout; fall back to one call per page.
+                    texts = [self._invoke(p) for p in paths]
+        self.stats.record_batch(len(images), time.perf_counter() - start)
+        return [t.strip() for t in texts]
+
+    def recognize(self, images: Iterable[Image.Image]) -> Iterator[str]:
+        """Yield recognised text for ``images`` in input order.
+
+        Images are consumed lazily and at most ``2 * workers`` batches are in
+        flight, so callers can stream rendered pages without holding a whole
+        document in memory.
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="tesseract"
+            )
+        pending: deque[Future[List[str]]] = deque()
+        batch: List[Image.Image] = []
+        for image in images:
+            batch.append(image)
+            if len(batch) == self.batch_size:
+                pending.append(self._pool.submit(self._run_batch, batch))
+                batch = []
+                while len(pending) >= 2 * self.workers:
+                    yield from pending.popleft().result()
+        if batch:
+            pending.append(self._pool.submit(self._run_batch, batch))
+        while pending:
+            yield from pending.popleft().result()
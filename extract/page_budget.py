@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from typing import List
+
+from extract.backends import PdfiumBackend
+from extract.sources import PdfSource
+
+DEFAULT_FIRST_PAGES = 6
+
+# Methods headings and the sub-headings MR papers put under them. Like
+# ``extract.sections.HEADING_RE`` a match must start a line with a capital
+# letter, so prose mentioning "methods" does not pull in a page.
+METHODS_KEYWORDS = (
+    r"^[ \t]*(?:\d+(?:\.\d+)*\.?[ \t]+)?(?-i:(?=[A-Z]))"
+    r"(?:materials?\s+and\s+methods|methods?|methodology|study\s+design"
+    r"|data\s+sources?|statistical\s+analys[ie]s"
+    r"|(?:genetic\s+)?instrument(?:al)?\s+variables?\s+selection"
+    r"|(?:snps?|genetic\s+instruments?)\s+selection)\b"
+)
+
+
+@dataclass(frozen=True)
+class PageBudget:
+    """Pages a lazy extraction parses up front; the rest are deferred.
+
+    The first ``first`` pages are always parsed, plus any later page whose
+    PDFium text layer matches ``keywords``. PDFium reads a page in a few
+    milliseconds, so the scan costs little next to pdfminer layout analysis.
+    """
+
+    first: int = DEFAULT_FIRST_PAGES
+    keywords: str = METHODS_KEYWORDS
+
+    def config(self) -> dict:
+        return asdict(self)
+
+    def select(self, pdf_path: PdfSource) -> List[int]:
+        """Return the 0-based pages of ``pdf_path`` to parse now, in order."""
+        scanner = PdfiumBackend()
+        total = scanner.page_count(pdf_path)
+        head = list(range(min(self.first, total)))
+        rest = list(range(len(head), total))
+        if not rest:
+            return head
+        pattern = re.compile(self.keywords, re.IGNORECASE | re.MULTILINE)
+        texts = scanner.iter_extract(pdf_path, rest)
+        return head + [i for i, text in zip(rest, texts) if pattern.search(text)]
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from extract.sections import SectionTracker
+
+try:  # zstd block compression is optional
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore
+
+# A page corpus file holds the pages of one paper as UTF-8 text, each page
+# followed by "\n", so the whole document joined with newlines is a single
+# slice. Layout (all integers little-endian):
+#
+#   header   magic, version, codec, pages per block, extracted_at (POSIX time)
+#   data     the text, or compressed blocks of ``block_pages`` pages each
+#   tables   page_count + 1 text offsets, then n_blocks + 1 block offsets
+#            (block offsets only for compressed files)
+#   meta     JSON object with the section spans and other document-level
+#            fields (version 2 and later)
+#   trailer  page_count, n_blocks, offset of the tables, offset of the meta
+#
+# Offsets in the tables are relative to the start of the data section. With
+# ``codec="none"`` pages are returned as zero-copy slices of the mapped file.
+MAGIC = b"LTPC"
+VERSION = 2
+_HEADER = struct.Struct("<4sBBHd")
+_TRAILERS = {1: struct.Struct("<QQQ"), 2: struct.Struct("<QQQQ")}
+SEPARATOR = b"\n"
+
+CODECS: Dict[str, int] = {"none": 0, "zlib": 1, "zstd": 2}
+DEFAULT_BLOCK_PAGES = 16
+
+
+def _check_codec(codec: str) -> int:
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec!r}; choose from {', '.join(CODECS)}")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("zstd page corpora require the zstandard package")
+    return CODECS[codec]
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    if codec == CODECS["zlib"]:
+        return zlib.compress(data, 6)
+    return zstandard.ZstdCompressor(level=9).compress(data)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODECS["zlib"]:
+        return zlib.decompress(data)
+    if zstandard is None:
+        raise RuntimeError("zstd page corpora require the zstandard package")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+class CorpusWriter:
+    """Write pages to a page corpus file as they are produced.
+
+    Only the current compression block (or nothing, for ``codec="none"``) is
+    buffered. ``meta`` holds extra document-level fields stored next to the
+    section spans. Like :class:`extract.text_files.PageWriter` the file is written
+    to a temporary name and moved into place on a clean exit.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        codec: str = "none",
+        block_pages: int = DEFAULT_BLOCK_PAGES,
+        extracted_at: datetime | None = None,
+        meta: Dict[str, Any] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.codec = _check_codec(codec)
+        self.block_pages = max(1, min(block_pages, 0xFFFF))
+        self.extracted_at = extracted_at or datetime.utcnow()
+        self.meta = dict(meta or {})
+        self.pages = 0
+        self._sections = SectionTracker()
+        self._offsets: List[int] = [0]
+        self._blocks: List[int] = [0]
+        self._block = bytearray()
+        self._tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        self._file = None
+
+    def __enter__(self) -> "CorpusWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._tmp.open("wb")
+        self._file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                self.codec,
+                self.block_pages,
+                self.extracted_at.timestamp(),
+            )
+        )
+        return self
+
+    def write(self, text: str) -> int:
+        """Append the next page and return its 1-based page number."""
+        data = text.encode("utf-8") + SEPARATOR
+        self._sections.feed(text)
+        self.pages += 1
+        self._offsets.append(self._offsets[-1] + len(data))
+        if self.codec == CODECS["none"]:
+            self._file.write(data)
+        else:
+            self._block += data
+            if self.pages % self.block_pages == 0:
+                self._flush_block()
+        return self.pages
+
+    def _flush_block(self) -> None:
+        if not self._block:
+            return
+        packed = _compress(self.codec, bytes(self._block))
+        self._file.write(packed)
+        self._blocks.append(self._blocks[-1] + len(packed))
+        self._block.clear()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is not None:
+            self._file.close()
+            self._tmp.unlink(missing_ok=True)
+            return
+        blocks: List[int] = []
+        if self.codec != CODECS["none"]:
+            self._flush_block()
+            blocks = self._blocks
+        tables = self._file.tell() - _HEADER.size
+        self._file.write(struct.pack(f"<{len(self._offsets)}Q", *self._offsets))
+        self._file.write(struct.pack(f"<{len(blocks)}Q", *blocks))
+        meta = self._file.tell() - _HEADER.size
+        meta_blob = {"sections": self._sections.finish(), **self.meta}
+        self._file.write(orjson.dumps(meta_blob))
+        self._file.write(
+            _TRAILERS[VERSION].pack(self.pages, max(len(blocks) - 1, 0), tables, meta)
+        )
+        self._file.close()
+        os.replace(self._tmp, self.path)
+
+
+class PageCorpus:
+    """Memory-mapped reader for a page corpus file.
+
+    ``page_bytes`` returns a ``memoryview`` into the mapping for uncompressed
+    files (into the decompressed block otherwise); release such views before
+    calling :meth:`close`. ``text`` returns the whole document joined with
+    newlines from a single slice.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        try:
+            self._parse()
+        except BaseException:
+            self.close()
+            raise
+        self._cached: Tuple[int, bytes] | None = None
+
+    def _parse(self) -> None:
+        if len(self._mm) < _HEADER.size + _TRAILERS[1].size:
+            raise ValueError(f"{self.path} is not a page corpus file")
+        magic, version, codec, block_pages, stamp = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version not in _TRAILERS:
+            raise ValueError(f"{self.path} is not a page corpus file")
+        if codec not in CODECS.values():
+            raise ValueError(f"{self.path} uses an unknown codec ({codec})")
+        self.codec = codec
+        self.block_pages = block_pages
+        self.extracted_at = datetime.fromtimestamp(stamp)
+        trailer = _TRAILERS[version]
+        count, n_blocks, tables, *meta = trailer.unpack_from(
+            self._mm, len(self._mm) - trailer.size
+        )
+        self.meta: Dict[str, Any] = {}
+        if meta:
+            end = len(self._mm) - trailer.size
+            self.meta = orjson.loads(self._view[_HEADER.size + meta[0] : end])
+        start = _HEADER.size + tables
+        self._offsets = struct.unpack_from(f"<{count + 1}Q", self._mm, start)
+        self._blocks = (
+            struct.unpack_from(f"<{n_blocks + 1}Q", self._mm, start + 8 * (count + 1))
+            if codec != CODECS["none"]
+            else ()
+        )
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return
+        self._view.release()
+        self._mm.close()
+
+    def __enter__(self) -> "PageCorpus":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def sections(self) -> Optional[List[Dict[str, Any]]]:
+        """Stored section spans, or ``None`` for files written before them."""
+        return self.meta.get("sections")
+
+    @property
+    def codec_name(self) -> str:
+        return next(name for name, value in CODECS.items() if value == self.codec)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _block(self, index: int) -> bytes:
+        if self._cached is None or self._cached[0] != index:
+            start = _HEADER.size + self._blocks[index]
+            end = _HEADER.size + self._blocks[index + 1]
+            self._cached = (index, _decompress(self.codec, self._view[start:end]))
+        return self._cached[1]
+
+    def page_bytes(self, index: int) -> memoryview:
+        """Return the UTF-8 bytes of the 0-based page ``index``."""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start = self._offsets[index]
+        end = self._offsets[index + 1] - 1  # drop the page separator
+        if self.codec == CODECS["none"]:
+            return self._view[_HEADER.size + start : _HEADER.size + end]
+        block = index // self.block_pages
+        base = self._offsets[block * self.block_pages]
+        return memoryview(self._block(block))[start - base : end - base]
+
+    def page(self, index: int) -> str:
+        return str(self.page_bytes(index), "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self.page(index)
+
+    def iter_pages(self) -> Iterator[Dict[str, Any]]:
+        """Yield ``{"page", "text"}`` dicts like the JSON text formats."""
+        for index, text in enumerate(self):
+            yield {"page": index + 1, "text": text}
+
+    def text(self) -> str:
+        """Return all pages joined with newlines."""
+        if not len(self):
+            return ""
+        if self.codec == CODECS["none"]:
+            end = _HEADER.size + self._offsets[-1] - 1
+            return str(self._view[_HEADER.size : end], "utf-8")
+        blocks = (
+            _decompress(self.codec, self._view[_HEADER.size + a : _HEADER.size + b])
+            for a, b in zip(self._blocks, self._blocks[1:])
+        )
+        return str(b"".join(blocks)[:-1], "utf-8")
@@ -1,80 +1,641 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from hashlib import blake2b
+from itertools import count, repeat
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import orjson
+import pypdfium2 as pdfium
 import pytesseract
 from PIL import Image
-from pdfminer.high_level import extract_pages
-from pdfminer.layout import LAParams, LTTextContainer
 from pydantic import BaseModel
 
+from extract.backends import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    DEFAULT_PROFILE,
+    PROFILES,
+    TextBackend,
+    count_pages,  # noqa: F401  (re-exported)
+    get_backend,
+    laparams_for,  # noqa: F401  (re-exported)
+)
+from extract.ocr_engine import TesseractEngine
+from extract.page_budget import PageBudget
+from extract.sections import detect_sections
+from extract.sources import (
+    ArchiveMember,
+    PdfBytes,
+    PdfSource,
+    load_source,
+    origin_of,
+    pdfium_input,
+    source_exists,
+)
+from extract.text_files import (
+    JSON_SUFFIX,
+    TEXT_FORMATS,
+    TEXT_SUFFIXES,
+    has_deferred_pages,
+    open_page_writer,
+    read_meta,
+    replace_pages,
+    write_document,
+)
+from utils.disk_cache import DiskCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "text"
 
+# Documents with at least this many pages are parsed as page ranges in
+# separate processes when ``extract_text`` is given ``page_workers > 1``.
+SPLIT_PAGE_THRESHOLD = 100
+PAGES_PER_RANGE = 25
+
+# Resolution used when rasterizing pages without a text layer for OCR.
+OCR_DPI = 300
+OCR_LANG = "eng"
+
+# Recognised text is cached by rendered page image, so repeat runs and
+# duplicate PDFs do not OCR the same page twice.
+OCR_CACHE_PATH = Path(__file__).resolve().parents[1] / "data" / "ocr_cache.sqlite3"
+OCR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Backends asked, in order, for pages the primary backend returned blank
+# before those pages are sent to OCR.
+FALLBACKS: dict[str, tuple[str, ...]] = {
+    "pdfminer": ("pdfium",),
+    "pdfium": ("pdfminer",),
+}
+
+# Bump when a code change alters the extracted text for unchanged settings.
+EXTRACTOR_VERSION = "2"
+
+
+def extractor_config(
+    profile: str = DEFAULT_PROFILE,
+    backend: str = DEFAULT_BACKEND,
+    budget: PageBudget | None = None,
+) -> dict:
+    """Return the settings that determine the text written for a PDF.
+
+    The extraction manifest keys artifacts by this configuration, so changing
+    any value here invalidates previously extracted text.
+    """
+    primary = get_backend(backend, profile=profile)
+    config = {
+        "version": EXTRACTOR_VERSION,
+        "backend": backend,
+        **primary.config(),
+        "fallbacks": list(FALLBACKS.get(backend, ())),
+        "ocr": {"dpi": OCR_DPI, "lang": OCR_LANG},
+    }
+    if budget is not None:
+        config["budget"] = budget.config()
+    return config
+
 
 class Page(BaseModel):
     page: int
     text: str
 
 
+class Section(BaseModel):
+    name: str
+    start: int
+    end: int
+    page: int
+
+
+class LazyPages(BaseModel):
+    """Pages a lazy extraction left empty and how to parse them later."""
+
+    source: str
+    deferred: List[int]
+    profile: str
+    backend: str
+
+
 class PDFText(BaseModel):
     pages: List[Page]
     extracted_at: datetime
+    sections: List[Section] = []
+    lazy: Optional[LazyPages] = None
+
+
+def _extract_range(
+    pdf_path: PdfSource, page_numbers: list[int] | None, backend: TextBackend
+) -> list[str]:
+    return backend.extract(pdf_path, page_numbers)
 
 
-def extract_text(pdf_path: Path) -> list[str]:
-    laparams = LAParams()
-    texts: list[str] = []
-    for page_layout in extract_pages(str(pdf_path), laparams=laparams):
-        page_text = "".join(
-            element.get_text()
-            for element in page_layout
-            if isinstance(element, LTTextContainer)
-        ).strip()
-        texts.append(page_text)
+def _fallback_texts(
+    pdf_path: PdfSource, indexes: Sequence[int], fallbacks: Sequence[str]
+) -> List[str]:
+    """Return the first non-blank text for each page in ``indexes``.
+
+    Each backend in ``fallbacks`` is asked once, for all pages still blank.
+    """
+    texts = [""] * len(indexes)
+    for name in fallbacks:
+        blank = [i for i, text in enumerate(texts) if not text]
+        if not blank:
+            break
+        found = get_backend(name).extract(pdf_path, [indexes[i] for i in blank])
+        for i, text in zip(blank, found):
+            texts[i] = text
     return texts
 
 
-def ocr_text(pdf_path: Path, existing: list[str]) -> list[str]:
-    with Image.open(pdf_path) as img:
-        for i in range(img.n_frames):
-            img.seek(i)
-            text = pytesseract.image_to_string(img)
-            if i < len(existing):
-                existing[i] = text.strip()
-            else:
-                existing.append(text.strip())
-    return existing
-
-
-def pdf_to_text(path: str | Path) -> PDFText:
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    pdf_path = Path(path)
-    texts = extract_text(pdf_path)
-    blank_pages = sum(1 for t in texts if not t)
-    if texts and blank_pages / len(texts) > 0.5:
-        try:
-            pytesseract.get_tesseract_version()
-        except pytesseract.TesseractNotFoundError:
-            pass
+def iter_text(
+    pdf_path: PdfSource,
+    *,
+    page_workers: int = 1,
+    split_threshold: int = SPLIT_PAGE_THRESHOLD,
+    pages_per_range: int = PAGES_PER_RANGE,
+    profile: str = DEFAULT_PROFILE,
+    backend: str = DEFAULT_BACKEND,
+    fallback: bool = True,
+    page_numbers: Sequence[int] | None = None,
+) -> Iterator[str]:
+    """Yield the text of each page of ``pdf_path`` as soon as it is parsed.
+
+    Arguments are those of :func:`extract_text`. Without a page range split
+    only the current page is held in memory; with one, a range at a time.
+    """
+    primary = get_backend(backend, profile=profile)
+    fallbacks = FALLBACKS.get(backend, ()) if fallback else ()
+    indexes: Iterable[int] = count() if page_numbers is None else page_numbers
+    total = primary.page_count(pdf_path) if page_workers > 1 else 0
+    if page_numbers is not None:
+        texts: Iterable[str] = primary.iter_extract(pdf_path, page_numbers)
+    elif total < split_threshold or total <= pages_per_range:
+        texts = primary.iter_extract(pdf_path)
+    else:
+        texts = _iter_ranges(pdf_path, primary, total, page_workers, pages_per_range)
+    # Consecutive blank pages are sent to the fallbacks together, so a scanned
+    # PDF is opened once per fallback backend rather than once per page.
+    blank: List[int] = []
+    for index, text in zip(indexes, texts):
+        if not text and fallbacks:
+            blank.append(index)
+            continue
+        if blank:
+            yield from _fallback_texts(pdf_path, blank, fallbacks)
+            blank = []
+        yield text
+    yield from _fallback_texts(pdf_path, blank, fallbacks)
+
+
+def _iter_ranges(
+    pdf_path: PdfSource,
+    backend: TextBackend,
+    total: int,
+    page_workers: int,
+    pages_per_range: int,
+) -> Iterator[str]:
+    ranges = [
+        list(range(start, min(start + pages_per_range, total)))
+        for start in range(0, total, pages_per_range)
+    ]
+    with ProcessPoolExecutor(max_workers=min(page_workers, len(ranges))) as pool:
+        for chunk in pool.map(
+            _extract_range, repeat(pdf_path), ranges, repeat(backend)
+        ):
+            yield from chunk
+
+
+def extract_text(
+    pdf_path: PdfSource,
+    *,
+    page_workers: int = 1,
+    split_threshold: int = SPLIT_PAGE_THRESHOLD,
+    pages_per_range: int = PAGES_PER_RANGE,
+    profile: str = DEFAULT_PROFILE,
+    backend: str = DEFAULT_BACKEND,
+    fallback: bool = True,
+    page_numbers: Sequence[int] | None = None,
+) -> list[str]:
+    """Return the text of every page of ``pdf_path``.
+
+    ``backend`` names an entry of ``BACKENDS`` and ``profile`` an entry of
+    ``PROFILES`` (pdfminer only). When ``page_workers > 1`` and the document
+    has at least ``split_threshold`` pages, it is split into ranges of
+    ``pages_per_range`` pages that are parsed in parallel processes and
+    stitched back in order. Unless ``fallback`` is false, pages the backend
+    returns blank are retried with the backends listed in ``FALLBACKS``.
+    ``page_numbers`` restricts extraction to those 0-based pages, in order,
+    without page range splitting.
+    """
+    return list(
+        iter_text(
+            pdf_path,
+            page_workers=page_workers,
+            split_threshold=split_threshold,
+            pages_per_range=pages_per_range,
+            profile=profile,
+            backend=backend,
+            fallback=fallback,
+            page_numbers=page_numbers,
+        )
+    )
+
+
+def render_page(pdf_path: PdfSource, index: int, *, dpi: int = OCR_DPI) -> Image.Image:
+    """Rasterize page ``index`` (0-based) of ``pdf_path`` to a PIL image."""
+    return next(iter_rendered_pages(pdf_path, [index], dpi=dpi))
+
+
+def iter_rendered_pages(
+    pdf_path: PdfSource, indexes: Iterable[int], *, dpi: int = OCR_DPI
+) -> Iterator[Image.Image]:
+    """Yield grayscale renders of the 0-based ``indexes`` one page at a time."""
+    pdf = pdfium.PdfDocument(pdfium_input(pdf_path))
+    try:
+        for index in indexes:
+            page = pdf[index]
+            try:
+                yield page.render(scale=dpi / 72, grayscale=True).to_pil()
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+
+def open_ocr_cache() -> DiskCache:
+    """Open the OCR result cache at ``OCR_CACHE_PATH``."""
+    return DiskCache(OCR_CACHE_PATH, max_bytes=OCR_CACHE_MAX_BYTES).open()
+
+
+def ocr_cache_key(image: Image.Image, version: str, lang: str, dpi: int) -> str:
+    """Return the cache key for OCR of ``image`` with the given settings."""
+    digest = blake2b(digest_size=20)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    digest.update(image.tobytes())
+    return f"{digest.hexdigest()}:{version}:{lang}:{dpi}"
+
+
+def ocr_pages(
+    pdf_path: PdfSource,
+    indexes: list[int],
+    *,
+    workers: int = 1,
+    dpi: int = OCR_DPI,
+    engine: TesseractEngine | None = None,
+    cache: DiskCache | None = None,
+) -> dict[int, str]:
+    """Render and OCR the 0-based ``indexes`` of ``pdf_path``.
+
+    Rendered pages found in ``cache`` are answered from it; the rest are
+    streamed to ``engine`` and their text is stored in the cache. When no
+    engine is given a :class:`TesseractEngine` with ``workers`` tesseract
+    workers is used for this document only.
+    """
+    if not indexes:
+        return {}
+    if engine is None:
+        with TesseractEngine(workers=workers, dpi=dpi, lang=OCR_LANG) as own:
+            return ocr_pages(pdf_path, indexes, dpi=dpi, engine=own, cache=cache)
+
+    version = str(pytesseract.get_tesseract_version())
+    results: dict[int, str] = {}
+    misses: list[tuple[int, str]] = []
+
+    def uncached() -> Iterator[Image.Image]:
+        pages = iter_rendered_pages(pdf_path, indexes, dpi=dpi)
+        for index, image in zip(indexes, pages):
+            key = ocr_cache_key(image, version, engine.lang, dpi)
+            hit = cache.get(key) if cache is not None else None
+            if hit is not None:
+                results[index] = hit.decode("utf-8")
+                continue
+            misses.append((index, key))
+            yield image
+
+    # ``recognize`` pulls images lazily, so ``misses[i]`` is always recorded
+    # before the i-th result comes back.
+    for i, text in enumerate(engine.recognize(uncached())):
+        index, key = misses[i]
+        results[index] = text
+        if cache is not None:
+            cache.set(key, text.encode("utf-8"))
+    return {index: results[index] for index in indexes}
+
+
+def _ocr_blank_pages(
+    pdf_path: PdfSource,
+    blank: list[int],
+    *,
+    workers: int = 1,
+    engine: TesseractEngine | None = None,
+    cache: DiskCache | None = None,
+) -> dict[int, str]:
+    """OCR the 0-based ``blank`` pages if Tesseract is installed.
+
+    ``cache`` defaults to the cache at ``OCR_CACHE_PATH``. Returns an empty
+    mapping when there is nothing to do or Tesseract is missing.
+    """
+    if not blank:
+        return {}
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError:
+        return {}
+    own_cache = cache is None
+    cache = open_ocr_cache() if own_cache else cache
+    try:
+        return ocr_pages(pdf_path, blank, workers=workers, engine=engine, cache=cache)
+    finally:
+        if own_cache:
+            cache.close()
+
+
+def _pdfium_page_count(pdf_path: PdfSource) -> int:
+    pdf = pdfium.PdfDocument(pdfium_input(pdf_path))
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _page_plan(
+    pdf_path: PdfSource,
+    budget: PageBudget | None,
+    image_pages: Sequence[int],
+    profile: str,
+    backend: str,
+) -> Tuple[List[int], List[int], int, Optional[LazyPages]]:
+    """Plan a partial extraction of ``pdf_path``.
+
+    Returns the pages to parse now, the ``image_pages`` to send straight to
+    OCR, the page count and, with a ``budget``, the deferral record.
+    """
+    total = _pdfium_page_count(pdf_path)
+    selected = budget.select(pdf_path) if budget is not None else range(total)
+    images = set(image_pages)
+    wanted = [i for i in selected if i not in images]
+    ocr = [i for i in selected if i in images]
+    lazy = None
+    if budget is not None:
+        parsed = set(selected)
+        lazy = LazyPages(
+            source=origin_of(pdf_path),
+            deferred=[i + 1 for i in range(total) if i not in parsed],
+            profile=profile,
+            backend=backend,
+        )
+    return wanted, ocr, total, lazy
+
+
+def _fill_pages(
+    texts: Iterable[str], wanted: Sequence[int], ocr: Sequence[int], total: int
+) -> Iterator[Optional[str]]:
+    """Yield the page texts for a plan from :func:`_page_plan`.
+
+    ``wanted`` pages take the next of ``texts``, ``ocr`` pages are blank so
+    they are OCR'd, and deferred pages are ``None``.
+    """
+    parsed = iter(texts)
+    wanted_set = set(wanted)
+    ocr_set = set(ocr)
+    for index in range(total):
+        if index in wanted_set:
+            yield next(parsed)
         else:
-            texts = ocr_text(pdf_path, texts)
+            yield "" if index in ocr_set else None
+
+
+def _remove_other_formats(out_path: Path) -> None:
+    """Delete text files for the same PDF left behind in other formats."""
+    for suffix in TEXT_SUFFIXES:
+        if suffix != out_path.suffix:
+            out_path.with_suffix(suffix).unlink(missing_ok=True)
+
+
+def pdf_to_text(
+    path: str | Path | PdfBytes | ArchiveMember,
+    *,
+    out_dir: Path | None = None,
+    page_workers: int = 1,
+    ocr_engine: TesseractEngine | None = None,
+    ocr_cache: DiskCache | None = None,
+    profile: str = DEFAULT_PROFILE,
+    backend: str = DEFAULT_BACKEND,
+    budget: PageBudget | None = None,
+    image_pages: Sequence[int] = (),
+) -> PDFText:
+    """Extract ``path`` and write ``<stem>.json`` to ``out_dir``.
+
+    ``out_dir`` defaults to the module level ``DATA_DIR``. Passing it explicitly
+    keeps worker processes independent of that global. ``page_workers`` is the
+    number of processes used for per-page work inside this document: splitting
+    very large PDFs in :func:`extract_text` and OCR of blank pages. Pass a
+    shared ``ocr_engine`` to reuse one tesseract pool across documents. OCR
+    results are cached in ``ocr_cache`` or, by default, the cache at
+    ``OCR_CACHE_PATH``. ``backend`` selects the text extractor and ``profile``
+    the pdfminer layout settings. With a ``budget`` only the pages it selects
+    are parsed; the others are left empty and listed in ``PDFText.lazy`` until
+    :func:`complete_pages` parses them. ``image_pages`` (from
+    :func:`extract.triage.triage_pdf`) skip the text backend and go straight
+    to OCR. ``path`` may also be a PDF in memory or inside an archive (see
+    :mod:`extract.sources`); it is read without writing a temporary file.
+    """
+    out_dir = Path(out_dir) if out_dir is not None else DATA_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pdf_path = load_source(path)
+    lazy = None
+    if budget is None and not image_pages:
+        texts: list[Optional[str]] = extract_text(
+            pdf_path, page_workers=page_workers, profile=profile, backend=backend
+        )
+        if not texts:
+            texts = [""] * _pdfium_page_count(pdf_path)
+    else:
+        wanted, ocr, total, lazy = _page_plan(
+            pdf_path, budget, image_pages, profile, backend
+        )
+        parsed = extract_text(
+            pdf_path, profile=profile, backend=backend, page_numbers=wanted
+        )
+        texts = list(_fill_pages(parsed, wanted, ocr, total))
+    found = _ocr_blank_pages(
+        pdf_path,
+        [i for i, text in enumerate(texts) if text == ""],
+        workers=page_workers,
+        engine=ocr_engine,
+        cache=ocr_cache,
+    )
+    for i, text in found.items():
+        texts[i] = text
+    texts = [text or "" for text in texts]
     data = PDFText(
         pages=[Page(page=i + 1, text=txt) for i, txt in enumerate(texts)],
         extracted_at=datetime.utcnow(),
+        sections=detect_sections(texts),
+        lazy=lazy,
     )
-    out_path = DATA_DIR / f"{pdf_path.stem}.json"
-    out_path.write_bytes(orjson.dumps(data.model_dump()))
+    out_path = out_dir / f"{pdf_path.stem}{JSON_SUFFIX}"
+    write_document(out_path, data.model_dump())
+    _remove_other_formats(out_path)
     return data
 
 
+def pdf_to_pages(
+    path: str | Path | PdfBytes | ArchiveMember,
+    *,
+    out_dir: Path | None = None,
+    page_workers: int = 1,
+    ocr_engine: TesseractEngine | None = None,
+    ocr_cache: DiskCache | None = None,
+    profile: str = DEFAULT_PROFILE,
+    backend: str = DEFAULT_BACKEND,
+    text_format: str = "jsonl",
+    codec: str = "none",
+    budget: PageBudget | None = None,
+    image_pages: Sequence[int] = (),
+) -> Path:
+    """Stream ``path`` into ``<stem>.jsonl`` in ``out_dir`` and return its path.
+
+    Each page is written as soon as it is parsed, so memory use does not grow
+    with the document. Blank pages are OCR'd afterwards and patched into the
+    file. ``text_format="pages"`` writes a memory-mapped page corpus
+    (``<stem>.pages``) instead, block-compressed with ``codec``. Other
+    arguments are those of :func:`pdf_to_text`; read the result with
+    :func:`extract.text_files.iter_pages`. With a ``budget`` the deferred
+    pages are recorded in the file's ``lazy`` field.
+    """
+    if text_format not in ("jsonl", "pages"):
+        raise ValueError(f"Cannot stream pages as {text_format!r}")
+    out_dir = Path(out_dir) if out_dir is not None else DATA_DIR
+    pdf_path = load_source(path)
+    out_path = out_dir / f"{pdf_path.stem}{TEXT_FORMATS[text_format]}"
+    options: dict = {"codec": codec} if text_format == "pages" else {}
+    if budget is None and not image_pages:
+        texts: Iterable[Optional[str]] = iter_text(
+            pdf_path, page_workers=page_workers, profile=profile, backend=backend
+        )
+    else:
+        wanted, ocr, total, lazy = _page_plan(
+            pdf_path, budget, image_pages, profile, backend
+        )
+        if lazy is not None:
+            options["meta"] = {"lazy": lazy.model_dump()}
+        parsed = iter_text(
+            pdf_path, profile=profile, backend=backend, page_numbers=wanted
+        )
+        texts = _fill_pages(parsed, wanted, ocr, total)
+    blank: list[int] = []
+    with open_page_writer(out_path, **options) as writer:
+        for text in texts:
+            if text == "":
+                blank.append(writer.pages)
+            writer.write(text or "")
+        if not writer.pages:
+            for _ in range(_pdfium_page_count(pdf_path)):
+                blank.append(writer.pages)
+                writer.write("")
+    found = _ocr_blank_pages(
+        pdf_path, blank, workers=page_workers, engine=ocr_engine, cache=ocr_cache
+    )
+    if found:
+        replace_pages(out_path, {i + 1: text for i, text in found.items()})
+    _remove_other_formats(out_path)
+    return out_path
+
+
+def complete_pages(
+    path: str | Path,
+    *,
+    page_workers: int = 1,
+    ocr_engine: TesseractEngine | None = None,
+    ocr_cache: DiskCache | None = None,
+) -> bool:
+    """Parse the pages a lazy extraction deferred and patch them into ``path``.
+
+    Returns ``True`` when the file was completed. Files without deferred pages
+    are left alone, as are files whose source PDF has moved (with a warning);
+    checking for deferred pages does not parse the file (see
+    :func:`extract.text_files.has_deferred_pages`).
+    """
+    path = Path(path)
+    if not has_deferred_pages(path):
+        return False
+    meta = read_meta(path)
+    lazy = LazyPages(**meta["lazy"])
+    if not source_exists(lazy.source):
+        logger.warning(
+            "Cannot parse deferred pages of %s: %s is missing", path.name, lazy.source
+        )
+        return False
+    source = load_source(lazy.source)
+    indexes = [page - 1 for page in lazy.deferred]
+    texts = extract_text(
+        source, profile=lazy.profile, backend=lazy.backend, page_numbers=indexes
+    )
+    found = _ocr_blank_pages(
+        source,
+        [i for i, text in zip(indexes, texts) if not text],
+        workers=page_workers,
+        engine=ocr_engine,
+        cache=ocr_cache,
+    )
+    meta["lazy"] = None
+    replace_pages(
+        path,
+        {i + 1: found.get(i, text) for i, text in zip(indexes, texts)},
+        meta=meta,
+    )
+    return True
+
+
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Extract text from PDF")
     parser.add_argument("pdf", type=str)
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help=f"Extraction profile (default: {DEFAULT_PROFILE})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f"Text extraction backend (default: {DEFAULT_BACKEND})",
+    )
+    parser.add_argument(
+        "--text-format",
+        choices=sorted(TEXT_FORMATS),
+        default="json",
+        help="json: one document; jsonl or pages: written page by page",
+    )
+    parser.add_argument(
+        "--lazy-pages",
+        type=int,
+        metavar="N",
+        help="Parse only the first N pages and pages with methods headings; "
+        "the rest are parsed when retrieval or indexing needs them",
+    )
     args = parser.parse_args()
-    result = pdf_to_text(args.pdf)
-    print(orjson.dumps(result.model_dump()).decode())
+    budget = PageBudget(first=args.lazy_pages) if args.lazy_pages else None
+    if args.text_format != "json":
+        out = pdf_to_pages(
+            args.pdf,
+            profile=args.profile,
+            backend=args.backend,
+            text_format=args.text_format,
+            budget=budget,
+        )
+        print(out)
+    else:
+        result = pdf_to_text(
+            args.pdf, profile=args.profile, backend=args.backend, budget=budget
+        )
+        print(orjson.dumps(result.model_dump()).decode())
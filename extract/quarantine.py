@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import orjson
+
+QUARANTINE_NAME = "extraction_quarantine.json"
+
+
+class Quarantine:
+    """PDFs whose text extraction failed with every retry, keyed by checksum.
+
+    The file lives next to the extraction manifest and doubles as the failure
+    report: each entry lists the PDF name, when it was quarantined and the
+    error of every attempt. Quarantined PDFs are skipped by later runs until
+    they are released.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                self.entries = orjson.loads(self.path.read_bytes()).get("entries", {})
+            except orjson.JSONDecodeError:
+                self.entries = {}
+
+    def __contains__(self, checksum: str) -> bool:
+        return checksum in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, checksum: str, source: str, errors: Sequence[str]) -> None:
+        self.entries[checksum] = {
+            "source": source,
+            "errors": list(errors),
+            "quarantined_at": datetime.utcnow().isoformat(),
+        }
+
+    def release(self, sources: Sequence[str] | None = None) -> List[str]:
+        """Remove the entries for ``sources`` (all when ``None``); return them."""
+        released = [
+            checksum
+            for checksum, entry in self.entries.items()
+            if sources is None or entry["source"] in sources
+        ]
+        return [self.entries.pop(checksum)["source"] for checksum in released]
+
+    def report(self) -> str:
+        lines = []
+        for entry in sorted(self.entries.values(), key=lambda e: e["source"]):
+            lines.append(f"{entry['source']} ({entry['quarantined_at']})")
+            lines.extend(f"  - {error}" for error in entry["errors"])
+        return "\n".join(lines)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(
+            orjson.dumps({"entries": self.entries}, option=orjson.OPT_INDENT_2)
+        )
+        os.replace(tmp, self.path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="List or release PDFs quarantined by text extraction"
+    )
+    parser.add_argument(
+        "base_dir", nargs="?", default="data", help="Workspace directory"
+    )
+    parser.add_argument(
+        "--release",
+        nargs="*",
+        metavar="PDF",
+        help="Release the named PDFs (all when no name is given) so the next "
+        "run extracts them again",
+    )
+    args = parser.parse_args(argv)
+
+    quarantine = Quarantine(Path(args.base_dir) / QUARANTINE_NAME)
+    if args.release is not None:
+        released = quarantine.release(args.release or None)
+        quarantine.save()
+        print(f"Released {len(released)} PDF(s)")
+        return 0
+    if not quarantine.entries:
+        print("No quarantined PDFs")
+        return 0
+    print(quarantine.report())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Canonical section names in their usual order. ``front`` is the text before
+# the first recognised heading (title, authors, DOI and often the abstract).
+SECTION_NAMES = (
+    "front",
+    "abstract",
+    "introduction",
+    "methods",
+    "results",
+    "discussion",
+    "conclusion",
+    "declarations",
+    "references",
+    "supplementary",
+)
+
+_HEADINGS = {
+    "abstract": r"abstract|summary",
+    "introduction": r"introduction|background",
+    "methods": r"(?:(?:materials?|patients|subjects)\s+and\s+)?methods?"
+    r"|methodology|study\s+design",
+    "results": r"results?(?:\s+and\s+discussion)?",
+    "discussion": r"discussion",
+    "conclusion": r"conclusions?|concluding\s+remarks",
+    "declarations": r"acknowledge?ments?|funding|declarations"
+    r"|data\s+availability(?:\s+statement)?|conflicts?\s+of\s+interests?"
+    r"|competing\s+interests?|author\s+contributions",
+    "references": r"references|bibliography|literature\s+cited|works\s+cited",
+    "supplementary": r"supplementary(?:\s+(?:information|materials?|data))?"
+    r"(?:\s+\d+)?|appendix|supporting\s+information",
+}
+
+# A heading is a whole line, optionally numbered ("2.", "2.1", "II."), that
+# starts with a capital letter so table cells such as "method" are skipped.
+_ALTERNATIVES = "|".join(
+    f"(?P<{name}>{pattern})" for name, pattern in _HEADINGS.items()
+)
+HEADING_RE = re.compile(
+    r"^[ \t]*(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?[ \t]+)?(?-i:(?=[A-Z]))"
+    rf"(?:{_ALTERNATIVES})[ \t]*[:.]?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+class SectionTracker:
+    """Find section spans in a document fed to it one page at a time.
+
+    Offsets are character positions in the pages joined with ``"\\n"``, the
+    form returned by :func:`extract.text_files.read_text`. ``page`` is the
+    1-based page the section starts on. The ``front`` span always covers at
+    least the first page, where publishers print the DOI and journal details,
+    so sections starting on page 1 begin where page 2 does.
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self.page = 0
+        self.first_page_end = 0
+        self._headings: List[Dict[str, Any]] = []
+
+    def feed(self, text: str) -> None:
+        self.page += 1
+        for match in HEADING_RE.finditer(text):
+            name = match.lastgroup
+            if self._headings and self._headings[-1]["name"] == name:
+                continue
+            start = self.offset + match.start()
+            self._headings.append({"name": name, "start": start, "page": self.page})
+        self.offset += len(text) + 1
+        if self.page == 1:
+            self.first_page_end = self.offset
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Return all section spans (empty when no heading was found)."""
+        if not self._headings:
+            return []
+        end = max(self.offset - 1, 0)
+        front_end = min(max(self._headings[0]["start"], self.first_page_end), end)
+        spans = [{"name": "front", "start": 0, "end": front_end, "page": 1}]
+        for heading, following in zip(self._headings, self._headings[1:] + [None]):
+            start = max(heading["start"], front_end)
+            stop = following["start"] if following is not None else end
+            if stop > start:
+                spans.append({**heading, "start": start, "end": stop})
+        return spans
+
+
+def detect_sections(pages: Iterable[str]) -> List[Dict[str, Any]]:
+    """Return the section spans of the document made of ``pages``."""
+    tracker = SectionTracker()
+    for text in pages:
+        tracker.feed(text)
+    return tracker.finish()
+
+
+def wanted_spans(
+    spans: Sequence[Dict[str, Any]], names: Sequence[str] | None
+) -> Optional[List[Dict[str, Any]]]:
+    """Return the spans of the sections ``names`` plus ``front``.
+
+    ``None`` stands for the full text: it is returned when ``names`` is
+    ``None``, when no sections were detected or when none of the requested
+    sections was found, so a paper without recognisable headings is never
+    cut short.
+    """
+    if names is None or not spans:
+        return None
+    wanted = set(names) | {"front"}
+    if not any(span["name"] in wanted - {"front"} for span in spans):
+        return None
+    return [span for span in spans if span["name"] in wanted]
+
+
+def select_sections(
+    text: str, spans: Sequence[Dict[str, Any]], names: Sequence[str] | None
+) -> str:
+    """Return the parts of ``text`` in the sections ``names`` plus ``front``
+    (see :func:`wanted_spans`)."""
+    kept = wanted_spans(spans, names)
+    if kept is None:
+        return text
+    return "\n".join(text[span["start"] : span["end"]].strip() for span in kept)
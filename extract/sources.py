@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, List, Union
+
+# Archives ``ingest_pdfs`` reads PDFs from without unpacking them. Zip and
+# plain tar members are read with a seek. A compressed tar member can only be
+# reached by decompressing the archive from the start, once per member and
+# per pass, so those archives are recognised only to be rejected.
+ARCHIVE_SUFFIXES = (".zip", ".tar")
+COMPRESSED_TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# Separates the archive path from the member name in a source string, e.g.
+# ``exports/may.zip::batch1/paper.pdf``.
+MEMBER_SEP = "::"
+
+
+@dataclass(frozen=True)
+class PdfBytes:
+    """A PDF held in memory, with the file name and origin it was read from."""
+
+    name: str
+    data: bytes = field(repr=False)
+    origin: str
+
+    @property
+    def stem(self) -> str:
+        return Path(self.name).stem
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """A PDF inside a zip or tar archive, read on demand without unpacking.
+
+    ``name`` is the file name used for text files and logs: the member's base
+    name, or its whole path with ``/`` replaced by ``_`` when several members
+    share a base name.
+    """
+
+    archive: Path
+    member: str
+    size: int
+    name: str
+
+    @property
+    def stem(self) -> str:
+        return Path(self.name).stem
+
+    @property
+    def origin(self) -> str:
+        return f"{self.archive}{MEMBER_SEP}{self.member}"
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        """Open the member as a binary stream."""
+        if is_zip(self.archive):
+            with zipfile.ZipFile(self.archive) as zf, zf.open(self.member) as f:
+                yield f
+            return
+        with tarfile.open(self.archive) as tf:
+            f = tf.extractfile(self.member)
+            if f is None:
+                raise FileNotFoundError(self.origin)
+            with f:
+                yield f
+
+    def read(self) -> PdfBytes:
+        with self.open() as f:
+            return PdfBytes(name=self.name, data=f.read(), origin=self.origin)
+
+
+PdfSource = Union[Path, PdfBytes]
+
+
+def is_zip(path: Path) -> bool:
+    return Path(path).suffix.lower() == ".zip"
+
+
+def is_archive(path: str | Path) -> bool:
+    """Return ``True`` if ``path`` names a file with an archive suffix.
+
+    Compressed tars count, so :func:`list_archive` can reject them.
+    """
+    name = Path(path).name.lower()
+    suffixes = ARCHIVE_SUFFIXES + COMPRESSED_TAR_SUFFIXES
+    return Path(path).is_file() and name.endswith(suffixes)
+
+
+def list_archive(archive: Path) -> List[ArchiveMember]:
+    """Return the PDF members of ``archive`` in member name order.
+
+    Raises ``ValueError`` for compressed tars (see ``ARCHIVE_SUFFIXES``).
+    """
+    archive = Path(archive).resolve()
+    if archive.name.lower().endswith(COMPRESSED_TAR_SUFFIXES):
+        raise ValueError(
+            f"{archive.name} is a compressed tar, whose members can only be "
+            "read by decompressing it from the start each time; decompress it "
+            "to a plain .tar or repack it as a .zip"
+        )
+    if is_zip(archive):
+        with zipfile.ZipFile(archive) as zf:
+            entries = [
+                (i.filename, i.file_size) for i in zf.infolist() if not i.is_dir()
+            ]
+    else:
+        with tarfile.open(archive) as tf:
+            entries = [(m.name, m.size) for m in tf.getmembers() if m.isfile()]
+    entries = sorted(e for e in entries if e[0].lower().endswith(".pdf"))
+    base_names = Counter(PurePosixPath(member).name for member, _ in entries)
+    members = []
+    for member, size in entries:
+        name = PurePosixPath(member).name
+        if base_names[name] > 1:
+            name = member.replace("/", "_")
+        members.append(ArchiveMember(archive, member, size, name))
+    return members
+
+
+def _member_from_origin(origin: str) -> ArchiveMember:
+    archive, member = origin.split(MEMBER_SEP, 1)
+    return ArchiveMember(Path(archive), member, 0, PurePosixPath(member).name)
+
+
+def source_exists(origin: str) -> bool:
+    """Return ``True`` if the PDF recorded as ``origin`` can still be read."""
+    if MEMBER_SEP not in origin:
+        return Path(origin).exists()
+    member = _member_from_origin(origin)
+    if not member.archive.exists():
+        return False
+    try:
+        with member.open():
+            return True
+    except KeyError:
+        return False
+
+
+def load_source(source: str | Path | PdfBytes | ArchiveMember) -> PdfSource:
+    """Return ``source`` as a path or, for archive members, the PDF's bytes."""
+    if isinstance(source, PdfBytes):
+        return source
+    if isinstance(source, ArchiveMember):
+        return source.read()
+    if isinstance(source, str) and MEMBER_SEP in source:
+        return _member_from_origin(source).read()
+    return Path(source)
+
+
+def origin_of(source: PdfSource) -> str:
+    """Return the string :func:`load_source` reads ``source`` again from."""
+    if isinstance(source, PdfBytes):
+        return source.origin
+    return str(Path(source).resolve())
+
+
+def open_pdf(source: PdfSource) -> BinaryIO:
+    """Open ``source`` as a binary file object."""
+    if isinstance(source, PdfBytes):
+        return BytesIO(source.data)
+    return Path(source).open("rb")
+
+
+def pdfium_input(source: PdfSource) -> Union[str, bytes]:
+    """Return ``source`` in a form ``pypdfium2.PdfDocument`` accepts."""
+    return source.data if isinstance(source, PdfBytes) else str(source)
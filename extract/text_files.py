@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import mmap
+import os
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import orjson
+
+from extract.manifest import MANIFEST_NAME, ExtractionManifest
+from extract.page_corpus import CODECS, CorpusWriter, PageCorpus
+from extract.sections import SectionTracker, detect_sections, select_sections
+
+# ``<stem>.json`` holds a whole ``PDFText`` document; ``<stem>.jsonl`` starts
+# with a header line followed by one ``{"page": n, "text": ...}`` line per
+# page and ends with a ``{"sections": [...], ...}`` line of document-level
+# fields; ``<stem>.pages`` is a memory-mapped page corpus (see
+# ``extract/page_corpus.py``). All formats store the section spans found by
+# ``extract.sections`` and any other fields the extractor records, such as
+# the pages a lazy extraction deferred.
+JSON_SUFFIX = ".json"
+JSONL_SUFFIX = ".jsonl"
+PAGES_SUFFIX = ".pages"
+TEXT_FORMATS: Dict[str, str] = {
+    "json": JSON_SUFFIX,
+    "jsonl": JSONL_SUFFIX,
+    "pages": PAGES_SUFFIX,
+}
+TEXT_SUFFIXES = tuple(TEXT_FORMATS.values())
+
+# Document-level fields recomputed whenever a text file is rewritten.
+_DERIVED_FIELDS = ("sections", "extracted_at")
+
+
+def _carried_fields(meta: Mapping[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in meta.items() if k not in _DERIVED_FIELDS}
+
+
+def write_document(path: Path, document: Any) -> None:
+    """Write ``document`` as JSON to ``path`` through a temporary file.
+
+    Like the streamed writers this replaces ``path`` with a new file instead
+    of rewriting it in place, so copies hardlinked from the shared store (see
+    ``ingest.shared_store``) are never modified.
+    """
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(orjson.dumps(document))
+    os.replace(tmp, path)
+
+
+def list_text_files(text_dir: Path) -> List[Path]:
+    """Return the extracted text files in ``text_dir`` in name order."""
+    text_dir = Path(text_dir)
+    if not text_dir.exists():
+        return []
+    return sorted(p for p in text_dir.iterdir() if p.suffix in TEXT_SUFFIXES)
+
+
+def find_text_file(text_dir: Path, stem: str) -> Optional[Path]:
+    """Return the text file for ``stem`` in either format, if one exists."""
+    for suffix in TEXT_SUFFIXES:
+        path = Path(text_dir) / f"{stem}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def iter_pages(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the ``{"page", "text"}`` dicts of a text file in page order.
+
+    JSON Lines files are read one line at a time and page corpora are memory
+    mapped, so only the current page is held in memory. Whole-document JSON
+    files are loaded in one go.
+    """
+    path = Path(path)
+    if path.suffix == PAGES_SUFFIX:
+        with PageCorpus(path) as corpus:
+            yield from corpus.iter_pages()
+        return
+    if path.suffix != JSONL_SUFFIX:
+        yield from orjson.loads(path.read_bytes()).get("pages", [])
+        return
+    with path.open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            if "page" in record:
+                yield record
+
+
+def read_meta(path: Path) -> Dict[str, Any]:
+    """Return the document-level fields of a text file (all but the pages)."""
+    path = Path(path)
+    if path.suffix == PAGES_SUFFIX:
+        with PageCorpus(path) as corpus:
+            return dict(corpus.meta)
+    if path.suffix != JSONL_SUFFIX:
+        document = orjson.loads(path.read_bytes())
+        document.pop("pages", None)
+        return document
+    # Document-level fields live in the header and trailer lines only, so the
+    # pages in between are never read.
+    meta: Dict[str, Any] = {}
+    with path.open("rb") as f:
+        for line in (f.readline(), _last_line(f)):
+            if line.strip() and not line.startswith(b'{"page"'):
+                meta.update(orjson.loads(line))
+    return meta
+
+
+def _last_line(f: BinaryIO, block_size: int = 1 << 16) -> bytes:
+    """Return the last non-empty line of the binary file ``f``."""
+    end = f.seek(0, os.SEEK_END)
+    tail = b""
+    while end > 0:
+        start = max(0, end - block_size)
+        f.seek(start)
+        tail = f.read(end - start) + tail
+        end = start
+        body = tail.rstrip(b"\n")
+        cut = body.rfind(b"\n")
+        if cut != -1:
+            return body[cut + 1 :]
+    return tail.rstrip(b"\n")
+
+
+def has_deferred_pages(path: Path) -> bool:
+    """Return ``True`` if a lazy extraction left pages of ``path`` unparsed.
+
+    Unlike :func:`read_meta` this does not parse whole-document JSON files:
+    they are searched for a non-null ``lazy`` object instead. Quotes inside
+    JSON strings are escaped, so page text cannot match the key.
+    """
+    path = Path(path)
+    if path.suffix in (JSONL_SUFFIX, PAGES_SUFFIX):
+        return bool(read_meta(path).get("lazy"))
+    with path.open("rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return view.rfind(b'"lazy":{') != -1
+
+
+def read_sections(path: Path) -> List[Dict[str, Any]]:
+    """Return the section spans of a text file.
+
+    Spans stored at extraction time are used when present; older files are
+    segmented on the fly.
+    """
+    path = Path(path)
+    stored = read_meta(path).get("sections")
+    if stored is not None:
+        return stored
+    return detect_sections(page.get("text", "") for page in iter_pages(path))
+
+
+def read_text(path: Path, sections: Sequence[str] | None = None) -> str:
+    """Return all pages of a text file joined with newlines.
+
+    For page corpora this is a single decode of the mapped file. When
+    ``sections`` names sections (see ``extract.sections.SECTION_NAMES``), only
+    those and the front matter are returned.
+    """
+    path = Path(path)
+    if path.suffix == PAGES_SUFFIX:
+        with PageCorpus(path) as corpus:
+            text = corpus.text()
+    else:
+        text = "\n".join(page.get("text", "") for page in iter_pages(path))
+    if sections is None:
+        return text
+    return select_sections(text, read_sections(path), sections)
+
+
+class PageWriter:
+    """Write pages to a JSON Lines text file as they are produced.
+
+    Pages go to a temporary file that replaces ``path`` when the writer is
+    closed without an error, so readers never see a partial document.
+    ``meta`` holds extra document-level fields for the last line.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        extracted_at: datetime | None = None,
+        meta: Dict[str, Any] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.extracted_at = extracted_at or datetime.utcnow()
+        self.meta = dict(meta or {})
+        self.pages = 0
+        self._sections = SectionTracker()
+        self._tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        self._file = None
+
+    def __enter__(self) -> "PageWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._tmp.open("wb")
+        header = {"extracted_at": self.extracted_at.isoformat()}
+        self._file.write(orjson.dumps(header) + b"\n")
+        return self
+
+    def write(self, text: str) -> int:
+        """Append the next page and return its 1-based page number."""
+        self.pages += 1
+        self._sections.feed(text)
+        self._file.write(orjson.dumps({"page": self.pages, "text": text}) + b"\n")
+        return self.pages
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            trailer = {"sections": self._sections.finish(), **self.meta}
+            self._file.write(orjson.dumps(trailer) + b"\n")
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._tmp, self.path)
+        else:
+            self._tmp.unlink(missing_ok=True)
+
+
+def open_page_writer(path: Path, **options: Any) -> PageWriter | CorpusWriter:
+    """Return a page writer for the format implied by the suffix of ``path``.
+
+    ``options`` are passed on to :class:`CorpusWriter` (``codec``,
+    ``block_pages``, ``meta``) or :class:`PageWriter` (``meta``).
+    """
+    path = Path(path)
+    if path.suffix == PAGES_SUFFIX:
+        return CorpusWriter(path, **options)
+    if path.suffix == JSONL_SUFFIX:
+        return PageWriter(path, **options)
+    raise ValueError(f"Cannot stream pages to {path.name}")
+
+
+def replace_pages(
+    path: Path,
+    texts: Mapping[int, str],
+    *,
+    meta: Mapping[str, Any] | None = None,
+) -> None:
+    """Rewrite the text file ``path`` with new text for some pages.
+
+    ``texts`` maps 1-based page numbers to their replacement text. Streamed
+    formats are copied one page at a time, so memory use does not depend on
+    the document size. Section spans are recomputed; other document-level
+    fields are kept unless ``meta`` replaces them.
+    """
+    path = Path(path)
+    meta = _carried_fields(read_meta(path) if meta is None else meta)
+    if path.suffix not in (JSONL_SUFFIX, PAGES_SUFFIX):
+        pages = [
+            {**page, "text": texts.get(page["page"], page["text"])}
+            for page in iter_pages(path)
+        ]
+        document = {
+            "pages": pages,
+            "extracted_at": datetime.utcnow(),
+            **meta,
+            "sections": detect_sections(page["text"] for page in pages),
+        }
+        write_document(path, document)
+        return
+    options: Dict[str, Any] = {"meta": meta}
+    if path.suffix == PAGES_SUFFIX:
+        with PageCorpus(path) as corpus:
+            options["codec"] = corpus.codec_name
+            options["block_pages"] = corpus.block_pages
+    with open_page_writer(path, **options) as writer:
+        for record in iter_pages(path):
+            writer.write(texts.get(record["page"], record["text"]))
+
+
+def convert_text_file(path: Path, text_format: str, **options: Any) -> Path:
+    """Rewrite ``path`` in ``text_format`` next to it and remove the original."""
+    path = Path(path)
+    target = path.with_suffix(TEXT_FORMATS[text_format])
+    if target == path:
+        return path
+    meta = _carried_fields(read_meta(path))
+    if text_format == "json":
+        pages = list(iter_pages(path))
+        document = {
+            "pages": pages,
+            "extracted_at": datetime.utcnow(),
+            **meta,
+            "sections": detect_sections(page.get("text", "") for page in pages),
+        }
+        write_document(target, document)
+    else:
+        with open_page_writer(target, meta=meta, **options) as writer:
+            for record in iter_pages(path):
+                writer.write(record.get("text", ""))
+    path.unlink()
+    return target
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert extracted text files to another format"
+    )
+    parser.add_argument("text_dir", help="Directory of extracted text files")
+    parser.add_argument("--to", choices=sorted(TEXT_FORMATS), default="pages")
+    parser.add_argument(
+        "--codec",
+        choices=sorted(CODECS),
+        default="none",
+        help="Block compression for page corpora (default: none)",
+    )
+    args = parser.parse_args(argv)
+
+    text_dir = Path(args.text_dir)
+    manifest = ExtractionManifest(text_dir.parent / MANIFEST_NAME, text_dir)
+    options = {"codec": args.codec} if args.to == "pages" else {}
+    before = after = 0
+    for path in list_text_files(text_dir):
+        before += path.stat().st_size
+        target = convert_text_file(path, args.to, **options)
+        after += target.stat().st_size
+        manifest.relocate(path.name, target.name)
+    if manifest.path.exists():
+        manifest.save()
+    print(f"{before} bytes -> {after} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
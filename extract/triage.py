@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Literal, Sequence
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+from extract.backends import DEFAULT_BACKEND, DEFAULT_PROFILE
+from extract.sources import ArchiveMember, PdfSource, load_source, pdfium_input
+
+Kind = Literal["text", "scanned", "mixed"]
+KINDS: tuple[str, ...] = ("text", "scanned", "mixed")
+
+# Single-process seconds per page, used to order and size the extraction
+# queues. The text rates come from ``python -m extract.benchmark`` on the
+# Rapamycin corpus; the OCR rate is a typical Tesseract time for a 300 dpi
+# page and only needs to be right to within a factor of two.
+TEXT_SECONDS_PER_PAGE: Dict[str, float] = {
+    "accurate": 0.20,
+    "fast": 0.14,
+    "raw": 0.21,
+    "pdfium": 0.007,
+}
+OCR_SECONDS_PER_PAGE = 3.0
+
+
+@dataclass(frozen=True)
+class Triage:
+    """What a PDF needs before parsing: its page count and pages without text.
+
+    ``image_pages`` are the 0-based pages with no text layer but at least one
+    image; they can only be read by OCR. Pages with neither count as text.
+    """
+
+    pages: int
+    image_pages: List[int] = field(default_factory=list)
+
+    @property
+    def kind(self) -> Kind:
+        if not self.image_pages:
+            return "text"
+        if len(self.image_pages) == self.pages:
+            return "scanned"
+        return "mixed"
+
+    @property
+    def needs_ocr(self) -> bool:
+        return bool(self.image_pages)
+
+    def estimate_seconds(
+        self, profile: str = DEFAULT_PROFILE, backend: str = DEFAULT_BACKEND
+    ) -> float:
+        """Return the expected single-process extraction time in seconds."""
+        rate = TEXT_SECONDS_PER_PAGE[profile if backend == "pdfminer" else backend]
+        ocr = len(self.image_pages)
+        return (self.pages - ocr) * rate + ocr * OCR_SECONDS_PER_PAGE
+
+
+def _has_images(page: pdfium.PdfPage) -> bool:
+    for _ in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,)):
+        return True
+    return False
+
+
+def triage_pdf(pdf_path: PdfSource | ArchiveMember) -> Triage:
+    """Classify the pages of ``pdf_path`` from PDFium's text layer.
+
+    Only the character count of each page and, for pages without text, the
+    presence of an image object are inspected. That takes a few milliseconds
+    per page, against hundreds for pdfminer layout analysis.
+    """
+    pdf = pdfium.PdfDocument(pdfium_input(load_source(pdf_path)))
+    try:
+        image_pages = []
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                if textpage.count_chars() == 0 and _has_images(page):
+                    image_pages.append(index)
+            finally:
+                textpage.close()
+                page.close()
+        return Triage(pages=len(pdf), image_pages=image_pages)
+    finally:
+        pdf.close()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Classify PDFs as text, scanned or mixed before extraction"
+    )
+    parser.add_argument("pdf_dir", help="Directory of PDFs")
+    args = parser.parse_args(argv)
+
+    counts = dict.fromkeys(KINDS, 0)
+    total = 0.0
+    print(f"{'kind':8} {'pages':>5} {'ocr':>4} {'est. s':>7}  pdf")
+    for pdf_path in sorted(Path(args.pdf_dir).glob("*.pdf")):
+        triage = triage_pdf(pdf_path)
+        seconds = triage.estimate_seconds()
+        counts[triage.kind] += 1
+        total += seconds
+        print(
+            f"{triage.kind:8} {triage.pages:5d} {len(triage.image_pages):4d} "
+            f"{seconds:7.1f}  {pdf_path.name}"
+        )
+    summary = ", ".join(f"{n} {kind}" for kind, n in counts.items())
+    print(f"{summary}; estimated {total:.0f}s single-process")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:  # RSS polling; without it only the timeout is enforced
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None  # type: ignore
+
+from utils.logger import format_exception
+
+# Per-PDF limits for extraction workers. A malformed PDF can keep pdfminer
+# busy for many minutes or grow it to several GB; past either limit the
+# worker is killed and the PDF retried with a cheaper configuration.
+DEFAULT_TIMEOUT = 600.0
+DEFAULT_MAX_RSS_MB = 4096.0
+POLL_INTERVAL = 0.2
+
+
+@dataclass(frozen=True)
+class WorkerLimits:
+    """Wall-clock seconds and resident memory allowed per job (``None``: off)."""
+
+    timeout: Optional[float] = DEFAULT_TIMEOUT
+    max_rss_mb: Optional[float] = DEFAULT_MAX_RSS_MB
+
+
+@dataclass
+class JobOutcome:
+    """Result of one job: ``value`` when ``error`` is ``None``."""
+
+    value: Any = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Running:
+    process: multiprocessing.process.BaseProcess
+    conn: Connection
+    started: float
+
+
+def retry_configs(profile: str, backend: str) -> List[Tuple[str, str]]:
+    """Return the ``(profile, backend)`` pairs to try for a PDF, in order.
+
+    After the requested configuration comes pdfminer's ``fast`` profile, which
+    skips the costly text box ordering, then PDFium, which is far faster and
+    more tolerant of broken files than pdfminer.
+    """
+    configs = [(profile, backend)]
+    if backend == "pdfminer" and profile != "fast":
+        configs.append(("fast", "pdfminer"))
+    if backend != "pdfium":
+        configs.append((profile, "pdfium"))
+    return configs
+
+
+def _child(conn: Connection, func: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+    if hasattr(os, "setpgrp"):
+        # Own process group, so a kill also reaches page workers and OCR.
+        os.setpgrp()
+    try:
+        conn.send((None, func(*args)))
+    except BaseException as exc:
+        conn.send((format_exception(exc), None))
+    finally:
+        conn.close()
+
+
+def _rss_mb(pid: int) -> float:
+    """Return the resident memory of ``pid`` and its children in MB."""
+    if psutil is None:
+        return 0.0
+    try:
+        proc = psutil.Process(pid)
+        procs = [proc, *proc.children(recursive=True)]
+        total = 0
+        for p in procs:
+            try:
+                total += p.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+        return total / (1024 * 1024)
+    except psutil.NoSuchProcess:
+        return 0.0
+
+
+def _kill(process: multiprocessing.process.BaseProcess) -> None:
+    if process.is_alive():
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:  # pragma: no cover - Windows
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            process.kill()
+    process.join()
+
+
+def _check(job: _Running, limits: WorkerLimits, now: float) -> Optional[JobOutcome]:
+    """Return the outcome of ``job`` if it finished or broke a limit."""
+    if job.conn.poll():
+        try:
+            error, value = job.conn.recv()
+        except EOFError:
+            job.process.join()
+            return JobOutcome(error=f"worker exited with code {job.process.exitcode}")
+        job.process.join()
+        return JobOutcome(value=value, error=error)
+    if not job.process.is_alive():
+        job.process.join()
+        return JobOutcome(error=f"worker exited with code {job.process.exitcode}")
+    elapsed = now - job.started
+    if limits.timeout is not None and elapsed > limits.timeout:
+        _kill(job.process)
+        return JobOutcome(error=f"timed out after {limits.timeout:.0f}s")
+    if limits.max_rss_mb is not None:
+        rss = _rss_mb(job.process.pid)
+        if rss > limits.max_rss_mb:
+            _kill(job.process)
+            return JobOutcome(
+                error=f"used {rss:.0f} MB, over the {limits.max_rss_mb:.0f} MB cap"
+            )
+    return None
+
+
+def run_isolated(
+    calls: Sequence[Tuple[Callable[..., Any], Tuple[Any, ...]]],
+    *,
+    workers: int = 1,
+    limits: WorkerLimits = WorkerLimits(),
+) -> List[JobOutcome]:
+    """Run each ``(func, args)`` in its own process, ``workers`` at a time.
+
+    A job that raises, dies, runs past ``limits.timeout`` or whose process
+    tree exceeds ``limits.max_rss_mb`` gets an outcome with ``error`` set;
+    the other jobs are unaffected. Outcomes are returned in input order.
+    """
+    ctx = multiprocessing.get_context()
+    outcomes: List[Optional[JobOutcome]] = [None] * len(calls)
+    queue = list(enumerate(calls))[::-1]
+    running: Dict[int, _Running] = {}
+    try:
+        while queue or running:
+            while queue and len(running) < max(1, workers):
+                index, (func, args) = queue.pop()
+                recv, send = ctx.Pipe(duplex=False)
+                process = ctx.Process(target=_child, args=(send, func, args))
+                process.start()
+                send.close()
+                running[index] = _Running(process, recv, time.monotonic())
+            waitables: List[Any] = [job.conn for job in running.values()]
+            waitables += [job.process.sentinel for job in running.values()]
+            wait(waitables, timeout=POLL_INTERVAL)
+            now = time.monotonic()
+            for index, job in list(running.items()):
+                outcome = _check(job, limits, now)
+                if outcome is None:
+                    continue
+                outcome.seconds = now - job.started
+                job.conn.close()
+                outcomes[index] = outcome
+                del running[index]
+    finally:
+        for job in running.values():
+            _kill(job.process)
+            job.conn.close()
+    return [outcome for outcome in outcomes if outcome is not None]
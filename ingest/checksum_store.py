@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import Iterable, Iterator, Optional, Tuple
+
+import orjson
+
+from ingest.hashing import FileDigest, Fingerprint
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checksums (
+    md5 TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    filepath TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    md5 TEXT NOT NULL,
+    fast TEXT
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def store_path_for(log_path: Path) -> Path:
+    """Return the SQLite index path that accompanies ``log_path``."""
+    return Path(log_path).with_suffix(".sqlite3")
+
+
+class ChecksumStore:
+    """Indexed set of ingested checksums backed by ``ingestion_log.jsonl``.
+
+    The JSONL log stays the source of truth. On :meth:`open` any log lines
+    added since the last session are imported into a SQLite table (WAL mode),
+    so each lookup afterwards is a primary-key query instead of a full log
+    scan. Several processes may hold a session at once; :meth:`claim` is an
+    atomic insert, so only one of them wins a given checksum.
+    """
+
+    def __init__(
+        self, log_path: Path, db_path: Path | None = None, *, timeout: float = 30.0
+    ) -> None:
+        self.log_path = Path(log_path)
+        self.db_path = Path(db_path) if db_path else store_path_for(self.log_path)
+        self.timeout = timeout
+        self._conn: sqlite3.Connection | None = None
+
+    def open(self) -> "ChecksumStore":
+        if self._conn is not None:
+            return self
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+        self._sync_log()
+        return self
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "ChecksumStore":
+        return self.open()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError("ChecksumStore is not open")
+        return self._conn
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT value FROM store_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+
+    def _sync_log(self) -> None:
+        """Import log lines appended since the last recorded offset."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            offset = int(self._get_meta("log_offset") or 0)
+            size = self.log_path.stat().st_size if self.log_path.exists() else 0
+            if size < offset:
+                # The log was wiped or rewritten; rebuild the index from it.
+                conn.execute("DELETE FROM checksums")
+                offset = 0
+            if size > offset:
+                with self.log_path.open("rb") as f:
+                    f.seek(offset)
+                    chunk = f.read(size - offset)
+                # Only consume complete lines; a concurrent writer may be
+                # midway through appending the last one.
+                end = chunk.rfind(b"\n") + 1
+                rows = []
+                for line in chunk[:end].splitlines():
+                    try:
+                        entry = orjson.loads(line)
+                        rows.append(
+                            (
+                                entry["md5"],
+                                entry.get("filename", ""),
+                                entry.get("filepath", ""),
+                                str(entry.get("timestamp", "")),
+                            )
+                        )
+                    except (orjson.JSONDecodeError, KeyError, TypeError):
+                        continue
+                conn.executemany(
+                    "INSERT OR IGNORE INTO checksums "
+                    "(md5, filename, filepath, timestamp) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                offset += end
+            self._set_meta("log_offset", str(offset))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def __contains__(self, checksum: object) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM checksums WHERE md5 = ?", (checksum,)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM checksums").fetchone()[0]
+
+    def claim(
+        self, checksum: str, filename: str, filepath: str, timestamp: str
+    ) -> bool:
+        """Record ``checksum`` and return ``True`` if it was not present yet."""
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO checksums (md5, filename, filepath, timestamp) "
+            "VALUES (?, ?, ?, ?)",
+            (checksum, filename, filepath, timestamp),
+        )
+        return cur.rowcount == 1
+
+    @contextmanager
+    def claiming(
+        self, checksum: str, filename: str, filepath: str, timestamp: str
+    ) -> Iterator[bool]:
+        """Like :meth:`claim`, committed only when the ``with`` block succeeds.
+
+        The claim is rolled back if the block raises and is never committed if
+        the process dies inside it, so a checksum cannot be marked ingested
+        without the log entry the block writes.
+        """
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.claim(checksum, filename, filepath, timestamp)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def cached_digest(self, path: Path, fp: Fingerprint) -> FileDigest | None:
+        """Return the recorded digest of ``path`` if its fingerprint matches."""
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, inode, md5, fast FROM fingerprints "
+            "WHERE path = ?",
+            (str(Path(path).resolve()),),
+        ).fetchone()
+        if row is None or tuple(row[:3]) != tuple(fp):
+            return None
+        return FileDigest(md5=row[3], fast=row[4])
+
+    def remember_digests(
+        self, items: Iterable[Tuple[Path, Fingerprint, FileDigest]]
+    ) -> None:
+        """Store fingerprints so unchanged files are not hashed again."""
+        rows = [
+            (str(Path(path).resolve()), *fp, digest.md5, digest.fast)
+            for path, fp, digest in items
+        ]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO fingerprints "
+            "(path, size, mtime_ns, inode, md5, fast) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from datetime import datetime
-from hashlib import md5
 from pathlib import Path
 from typing import Optional
 
 import orjson
 from pydantic import BaseModel
 
+from extract.sources import ArchiveMember
+from ingest.checksum_store import ChecksumStore
+from ingest.hashing import digest_file, hash_files
+
 LOG_PATH = Path(__file__).resolve().parents[1] / "ingestion_log.jsonl"
 
 
@@ -16,14 +19,12 @@ class LogEntry(BaseModel):
     filepath: str
     md5: str
     timestamp: datetime
+    # Member name inside ``filepath`` when the PDF was read from an archive.
+    member: Optional[str] = None
 
 
 def compute_md5(path: Path) -> str:
-    hash_md5 = md5()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+    return digest_file(path).md5
 
 
 def load_existing_checksums() -> set[str]:
@@ -45,19 +46,51 @@ def append_log(entry: LogEntry) -> None:
         f.write(orjson.dumps(entry.model_dump()) + b"\n")
 
 
-def ingest_pdf(path: str | Path) -> Optional[LogEntry]:
-    pdf_path = Path(path)
-    checksum = compute_md5(pdf_path)
-    existing = load_existing_checksums()
-    if checksum in existing:
-        return None
+def open_store() -> ChecksumStore:
+    """Open a checksum session for the current ``LOG_PATH``.
+
+    Use it as a context manager and pass it to :func:`ingest_pdf` so a whole
+    directory is checked against one indexed session.
+    """
+    return ChecksumStore(LOG_PATH).open()
+
+
+def ingest_pdf(
+    path: str | Path | ArchiveMember,
+    *,
+    store: ChecksumStore | None = None,
+    checksum: str | None = None,
+) -> Optional[LogEntry]:
+    """Log ``path`` unless its checksum was ingested before.
+
+    ``checksum`` may be supplied when the caller already hashed the file, e.g.
+    via :func:`ingest.hashing.hash_files` over a whole directory. For an
+    archive member the entry's ``filepath`` is the archive and ``member`` the
+    name of the PDF inside it.
+    """
+    if store is None:
+        with open_store() as session:
+            return ingest_pdf(path, store=session, checksum=checksum)
+    pdf_path = path if isinstance(path, ArchiveMember) else Path(path)
+    if checksum is None:
+        checksum = hash_files([pdf_path], store=store)[pdf_path].md5
+    if isinstance(pdf_path, ArchiveMember):
+        filepath, member = str(pdf_path.archive), pdf_path.member
+    else:
+        filepath, member = str(pdf_path.resolve()), None
     entry = LogEntry(
         filename=pdf_path.name,
-        filepath=str(pdf_path.resolve()),
+        filepath=filepath,
         md5=checksum,
         timestamp=datetime.utcnow(),
+        member=member,
     )
-    append_log(entry)
+    with store.claiming(
+        entry.md5, entry.filename, entry.filepath, entry.timestamp.isoformat()
+    ) as claimed:
+        if not claimed:
+            return None
+        append_log(entry)
     return entry
 
 
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, ContextManager, Dict, Iterable, Tuple
+
+from extract.sources import ArchiveMember
+
+try:  # optional, much faster than md5 for dedup-only hashing
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ingest.checksum_store import ChecksumStore
+
+# hashlib releases the GIL for large updates, so big reads keep threads busy.
+HASH_BUFFER_SIZE = 1 << 20
+
+Fingerprint = Tuple[int, int, int]
+HashSource = Path | ArchiveMember
+
+
+@dataclass(frozen=True)
+class FileDigest:
+    """Checksums of one file.
+
+    ``fast`` is an optional dedup hash prefixed with its algorithm name, e.g.
+    ``"xxh3_128:..."`` (or ``"blake2b:..."`` when ``xxhash`` is missing).
+    """
+
+    md5: str
+    fast: str | None = None
+
+
+def fingerprint(path: HashSource) -> Fingerprint:
+    """Return ``(size, mtime_ns, inode)`` for ``path``.
+
+    An archive member takes its own size and the archive's mtime and inode,
+    so rewriting the archive invalidates all of its members.
+    """
+    if isinstance(path, ArchiveMember):
+        st = path.archive.stat()
+        return path.size, st.st_mtime_ns, st.st_ino
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def _store_key(path: HashSource) -> Path:
+    return Path(path.origin) if isinstance(path, ArchiveMember) else path
+
+
+def _open(path: HashSource) -> ContextManager[BinaryIO]:
+    return path.open() if isinstance(path, ArchiveMember) else Path(path).open("rb")
+
+
+def _fast_hasher():
+    if xxhash is not None:
+        return "xxh3_128", xxhash.xxh3_128()
+    return "blake2b", hashlib.blake2b(digest_size=16)
+
+
+def digest_file(path: HashSource, *, fast: bool = False) -> FileDigest:
+    """Hash ``path`` in one pass, optionally computing the fast hash too.
+
+    Archive members are hashed as they are decompressed, without a temporary
+    file.
+    """
+    with _open(path) as f:
+        if not fast:
+            return FileDigest(md5=hashlib.file_digest(f, "md5").hexdigest())
+        md5 = hashlib.md5(usedforsecurity=False)
+        name, other = _fast_hasher()
+        buf = bytearray(HASH_BUFFER_SIZE)
+        view = memoryview(buf)
+        while size := f.readinto(buf):
+            md5.update(view[:size])
+            other.update(view[:size])
+    return FileDigest(md5=md5.hexdigest(), fast=f"{name}:{other.hexdigest()}")
+
+
+def hash_files(
+    paths: Iterable[HashSource],
+    *,
+    store: "ChecksumStore | None" = None,
+    fast: bool = False,
+    workers: int | None = None,
+) -> Dict[HashSource, FileDigest]:
+    """Return digests for ``paths``, skipping files whose stat is unchanged.
+
+    When ``store`` is given, a file whose ``(path, size, mtime, inode)`` matches
+    a cached fingerprint reuses the recorded digest. The remaining files are
+    hashed in a thread pool and their fingerprints written back to the store.
+    ``paths`` may include :class:`extract.sources.ArchiveMember` items, cached
+    under their ``archive::member`` origin.
+    """
+    results: Dict[HashSource, FileDigest] = {}
+    pending: list[tuple[HashSource, Fingerprint]] = []
+    for path in paths:
+        if not isinstance(path, ArchiveMember):
+            path = Path(path)
+        fp = fingerprint(path)
+        cached = (
+            store.cached_digest(_store_key(path), fp) if store is not None else None
+        )
+        if cached is not None and (cached.fast or not fast):
+            results[path] = cached
+        else:
+            pending.append((path, fp))
+
+    if pending:
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            digests = list(
+                pool.map(lambda item: digest_file(item[0], fast=fast), pending)
+            )
+        for (path, _), digest in zip(pending, digests):
+            results[path] = digest
+        if store is not None:
+            store.remember_digests(
+                (_store_key(path), fp, digest)
+                for (path, fp), digest in zip(pending, digests)
+            )
+    return results
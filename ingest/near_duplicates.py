@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import argparse
+import re
+import sqlite3
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+from types import TracebackType
+from typing import Container, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+INDEX_NAME = "near_duplicates.sqlite3"
+
+# Text files of near-duplicates are moved here, out of sight of the stages
+# that list ``text/`` (Agent 1, batches, embeddings and retrieval).
+DUPLICATES_DIR = "duplicates"
+
+# MinHash over 3-word shingles of the cleaned text. The same paper laid out
+# by another publisher (simulated with PDFium against pdfminer text) scores
+# 0.66-0.81, distinct MR papers written from the same template at most 0.08.
+# With 64 bands of 2 rows a pair scoring 0.4 becomes an LSH candidate with
+# probability above 99.99%; candidates are kept when their estimated Jaccard
+# similarity reaches ``DEFAULT_THRESHOLD``.
+NUM_PERM = 128
+BANDS = 64
+SHINGLE_WORDS = 3
+DEFAULT_THRESHOLD = 0.4
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    md5 TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    bucket TEXT NOT NULL,
+    md5 TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, md5)
+);
+CREATE TABLE IF NOT EXISTS links (
+    md5 TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    duplicate_of TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    linked_at TEXT NOT NULL
+);
+"""
+
+
+class Match(NamedTuple):
+    md5: str
+    source: str
+    similarity: float
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> np.ndarray:
+    """Return the distinct hashed ``k``-word shingles of ``text``."""
+    words = _WORD_RE.findall(text.lower())
+    grams = {" ".join(words[i : i + k]) for i in range(max(len(words) - k + 1, 0))}
+    return np.fromiter(
+        (
+            int.from_bytes(blake2b(g.encode(), digest_size=4).digest(), "little")
+            for g in grams
+        ),
+        dtype=np.uint64,
+        count=len(grams),
+    )
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """Return the MinHash signature of ``text``, or ``None`` if it has no words."""
+    values = shingles(text) % _PRIME
+    if not len(values):
+        return None
+    return ((values[:, None] * _A + _B) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimate the Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+def _buckets(signature: np.ndarray) -> Iterator[tuple[int, str]]:
+    rows = len(signature) // BANDS
+    for band in range(BANDS):
+        chunk = signature[band * rows : (band + 1) * rows].tobytes()
+        yield band, blake2b(chunk, digest_size=8).hexdigest()
+
+
+class NearDuplicateIndex:
+    """LSH index of MinHash signatures of extracted papers, keyed by PDF md5.
+
+    Papers whose signature matches an earlier one are linked to it in the
+    ``links`` table, so later runs can skip them without extracting again.
+    """
+
+    def __init__(self, path: Path, *, threshold: float = DEFAULT_THRESHOLD) -> None:
+        self.path = Path(path)
+        self.threshold = threshold
+        self._conn: sqlite3.Connection | None = None
+
+    def open(self) -> "NearDuplicateIndex":
+        if self._conn is not None:
+            return self
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+        return self
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "NearDuplicateIndex":
+        return self.open()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError("NearDuplicateIndex is not open")
+        return self._conn
+
+    def __contains__(self, md5: object) -> bool:
+        """Return ``True`` if ``md5`` was checked: indexed or linked."""
+        row = self.conn.execute(
+            "SELECT 1 FROM signatures WHERE md5 = ? "
+            "UNION ALL SELECT 1 FROM links WHERE md5 = ?",
+            (md5, md5),
+        ).fetchone()
+        return row is not None
+
+    def duplicate_of(self, md5: str) -> Optional[str]:
+        """Return the source name ``md5`` was linked to, if it is a duplicate."""
+        row = self.conn.execute(
+            "SELECT duplicate_of FROM links WHERE md5 = ?", (md5,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def unlink(self, md5: str) -> None:
+        """Forget that ``md5`` was linked, so it is checked again."""
+        self.conn.execute("DELETE FROM links WHERE md5 = ?", (md5,))
+
+    def forget_source(self, source: str) -> None:
+        """Drop the signatures and links recorded for the file name ``source``.
+
+        A PDF replaced by a new version under the same name must not match
+        its own earlier version.
+        """
+        self.conn.execute(
+            "DELETE FROM bands WHERE md5 IN "
+            "(SELECT md5 FROM signatures WHERE source = ?)",
+            (source,),
+        )
+        self.conn.execute("DELETE FROM signatures WHERE source = ?", (source,))
+        self.conn.execute("DELETE FROM links WHERE source = ?", (source,))
+
+    def query(
+        self, signature: np.ndarray, originals: Container[str] | None = None
+    ) -> Optional[Match]:
+        """Return the most similar indexed paper at or above the threshold.
+
+        With ``originals`` only papers whose md5 is in it are considered.
+        """
+        candidates: set[str] = set()
+        for band, bucket in _buckets(signature):
+            rows = self.conn.execute(
+                "SELECT md5 FROM bands WHERE band = ? AND bucket = ?", (band, bucket)
+            )
+            candidates.update(row[0] for row in rows)
+        if originals is not None:
+            candidates = {md5 for md5 in candidates if md5 in originals}
+        best: Optional[Match] = None
+        for md5 in candidates:
+            source, blob = self.conn.execute(
+                "SELECT source, signature FROM signatures WHERE md5 = ?", (md5,)
+            ).fetchone()
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = Match(md5, source, score)
+        return best
+
+    def add(self, md5: str, source: str, signature: np.ndarray) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO signatures (md5, source, signature) "
+            "VALUES (?, ?, ?)",
+            (md5, source, signature.tobytes()),
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO bands (band, bucket, md5) VALUES (?, ?, ?)",
+            [(band, bucket, md5) for band, bucket in _buckets(signature)],
+        )
+
+    def link(self, md5: str, source: str, match: Match) -> None:
+        """Record ``md5`` (file ``source``) as a near-duplicate of ``match``."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO links "
+            "(md5, source, duplicate_of, similarity, linked_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                md5,
+                source,
+                match.source,
+                match.similarity,
+                datetime.utcnow().isoformat(),
+            ),
+        )
+
+    def check(
+        self,
+        md5: str,
+        source: str,
+        text: str,
+        originals: Container[str] | None = None,
+    ) -> Optional[Match]:
+        """Index the paper ``md5`` and return the earlier paper it duplicates.
+
+        A match is recorded as a link and the paper is not indexed, so only
+        originals can be matched later; with ``originals`` only papers whose
+        md5 is in it (for instance those with a live text file) can match.
+        Earlier versions of the file ``source`` are dropped first. Papers
+        already checked and texts without words return ``None``.
+        """
+        if md5 in self:
+            return None
+        signature = minhash(text)
+        if signature is None:
+            return None
+        self.forget_source(source)
+        match = self.query(signature, originals)
+        if match is None:
+            self.add(md5, source, signature)
+        else:
+            self.link(md5, source, match)
+        return match
+
+    def links(self) -> List[tuple[str, str, float]]:
+        """Return ``(source, duplicate_of, similarity)`` for every link."""
+        return self.conn.execute(
+            "SELECT source, duplicate_of, similarity FROM links ORDER BY source"
+        ).fetchall()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="List PDFs linked as near-duplicates of earlier papers"
+    )
+    parser.add_argument(
+        "base_dir", nargs="?", default="data", help="Workspace directory"
+    )
+    args = parser.parse_args(argv)
+
+    path = Path(args.base_dir) / INDEX_NAME
+    if not path.exists():
+        print("No near-duplicate index")
+        return 0
+    with NearDuplicateIndex(path) as index:
+        links = index.links()
+    if not links:
+        print("No near-duplicates")
+    for source, original, score in links:
+        print(f"{source}\n  ~ {original} ({score:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from extract.text_files import TEXT_SUFFIXES
+
+EMBEDDING_CACHE_NAME = "embeddings.sqlite3"
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Hardlink ``src`` to ``dst``, copying when the filesystem cannot link.
+
+    An existing ``dst`` is replaced.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+class SharedStore:
+    """Content-addressed PDFs and extracted text shared by drug workspaces.
+
+    Each paper lives under ``objects/<md5[:2]>/<md5>/``: the PDF as
+    ``paper.pdf`` and one text file per extractor configuration as
+    ``text/<fingerprint><suffix>``. Workspaces hold hardlinks to these files,
+    so a paper included by several drugs is stored and extracted once. Text
+    writers replace files instead of rewriting them (see
+    ``extract.text_files.write_document``), so a workspace changing its copy
+    never alters the store. Chunk embeddings are cached in
+    ``embeddings.sqlite3`` (see ``agent2.openai_index``).
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def paper_dir(self, checksum: str) -> Path:
+        return self.root / "objects" / checksum[:2] / checksum
+
+    @property
+    def embedding_cache_path(self) -> Path:
+        return self.root / EMBEDDING_CACHE_NAME
+
+    def add_pdf(self, checksum: str, pdf_path: Path) -> Path:
+        """Link ``pdf_path`` into the store unless it is there already."""
+        target = self.paper_dir(checksum) / "paper.pdf"
+        if not target.exists():
+            link_or_copy(Path(pdf_path), target)
+        return target
+
+    def lookup_text(self, checksum: str, fingerprint: str) -> Optional[Path]:
+        """Return the stored text file of ``checksum`` for ``fingerprint``."""
+        text_dir = self.paper_dir(checksum) / "text"
+        for suffix in TEXT_SUFFIXES:
+            path = text_dir / f"{fingerprint}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def publish_text(self, checksum: str, fingerprint: str, artifact: Path) -> Path:
+        """Link the workspace text file ``artifact`` into the store."""
+        artifact = Path(artifact)
+        target = self.paper_dir(checksum) / "text" / f"{fingerprint}{artifact.suffix}"
+        for suffix in TEXT_SUFFIXES:
+            if suffix != artifact.suffix:
+                target.with_suffix(suffix).unlink(missing_ok=True)
+        link_or_copy(artifact, target)
+        return target
+
+    def checkout_text(self, stored: Path, text_dir: Path, stem: str) -> Path:
+        """Link the stored text file into ``text_dir`` as ``<stem><suffix>``."""
+        target = Path(text_dir) / f"{stem}{stored.suffix}"
+        for suffix in TEXT_SUFFIXES:
+            if suffix != stored.suffix:
+                target.with_suffix(suffix).unlink(missing_ok=True)
+        link_or_copy(stored, target)
+        return target
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarise a shared PDF/text store")
+    parser.add_argument("root", help="Shared store directory")
+    args = parser.parse_args(argv)
+
+    store = SharedStore(Path(args.root))
+    papers = texts = linked = 0
+    size = saved = 0
+    for pdf in store.root.glob("objects/*/*/paper.pdf"):
+        papers += 1
+        for path in [pdf, *pdf.parent.glob("text/*")]:
+            st = path.stat()
+            texts += path != pdf
+            size += st.st_size
+            # Every link beyond the store's own is a workspace copy not stored.
+            if st.st_nlink > 1:
+                linked += 1
+                saved += (st.st_nlink - 2) * st.st_size
+    print(f"{papers} papers, {texts} text files, {size / 1e6:.1f} MB stored")
+    print(f"{linked} files linked into workspaces, {saved / 1e6:.1f} MB not duplicated")
+    if store.embedding_cache_path.exists():
+        print(
+            f"embedding cache: {store.embedding_cache_path.stat().st_size / 1e6:.1f} MB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
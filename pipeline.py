@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List, Literal
+from typing import Dict, List, Literal, Optional, Sequence
+import asyncio
+import os
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from types import SimpleNamespace
 
 try:  # resource is not available on Windows
@@ -20,14 +22,39 @@ from utils.logger import get_logger
 
 import orjson
 
-from ingest.collector import ingest_pdf
+from ingest.collector import ingest_pdf, open_store
+from ingest.hashing import hash_files
+from ingest.near_duplicates import (
+    DEFAULT_THRESHOLD as NEAR_DUPLICATE_THRESHOLD,
+    DUPLICATES_DIR,
+    INDEX_NAME as NEAR_DUPLICATES_NAME,
+    NearDuplicateIndex,
+)
+from ingest.shared_store import SharedStore
 import extract.pdf_to_text as pdf_to_text
-from agent1.metadata_extractor import MetadataExtractor
+from extract.manifest import MANIFEST_NAME, ExtractionManifest, config_fingerprint
+from extract.page_budget import PageBudget
+from extract.quarantine import QUARANTINE_NAME, Quarantine
+from extract.workers import (
+    DEFAULT_MAX_RSS_MB,
+    DEFAULT_TIMEOUT,
+    WorkerLimits,
+    retry_configs,
+    run_isolated,
+)
+from extract.sections import SECTION_NAMES
+from extract.sources import ArchiveMember, is_archive, list_archive
+from extract.triage import KINDS as TRIAGE_KINDS, Triage, triage_pdf
+from extract.cleaning import read_clean_text
+from extract.text_files import list_text_files, read_text
+from agent1.metadata_extractor import RECOMMENDED_SECTIONS, MetadataExtractor
 import agent1.metadata_extractor as meta_mod
+import utils.llm_cache as llm_cache_mod
+from utils.tokens import fits_context
+from schemas.metadata import PaperMetadata
 import aggregate
 from agent2.openai_narrative import OpenAINarrative
-from agent2 import retrieval
-
+from agent2 import openai_index, retrieval
 
 DEFAULT_TEXT_DIR = Path("data/text")
 TEXT_DIR = DEFAULT_TEXT_DIR
@@ -44,6 +71,10 @@ logger = get_logger("pipeline")
 # Maximum tokens allowed per OpenAI batch file
 BATCH_TOKEN_LIMIT = 40_000
 
+# Seconds allowed to triage one PDF; triage only reads the page objects, so
+# a PDF that takes longer is broken and left to the extraction retries.
+TRIAGE_TIMEOUT = 60.0
+
 
 def make_dirs(base_dir: Path) -> SimpleNamespace:
     """Return a namespace of all pipeline paths derived from ``base_dir``."""
@@ -58,6 +89,9 @@ def make_dirs(base_dir: Path) -> SimpleNamespace:
         master=base / "master.json",
         history=base / "master_history",
         snippets=base / "snippets.json",
+        manifest=base / MANIFEST_NAME,
+        quarantine=base / QUARANTINE_NAME,
+        near_duplicates=base / NEAR_DUPLICATES_NAME,
     )
 
 
@@ -67,6 +101,30 @@ class StepMetrics:
     memory_kb: int
 
 
+@dataclass
+class ExtractionStats:
+    """Extraction manifest hits and misses for one ingestion run.
+
+    ``failed`` names the PDFs that failed every retry in this run (they are
+    quarantined), ``errors`` their per-attempt errors, ``degraded`` the PDFs
+    only a cheaper retry could extract and ``quarantined`` the PDFs skipped
+    because an earlier run quarantined them. ``triage`` holds the page count
+    and pages without a text layer of each PDF extracted, and
+    ``near_duplicates`` maps PDFs linked as near-duplicates to the PDF they
+    duplicate. ``shared`` counts the hits served from the shared store.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    shared: int = 0
+    failed: List[str] = field(default_factory=list)
+    errors: Dict[str, List[str]] = field(default_factory=dict)
+    degraded: List[str] = field(default_factory=list)
+    quarantined: List[str] = field(default_factory=list)
+    triage: Dict[str, Triage] = field(default_factory=dict)
+    near_duplicates: Dict[str, str] = field(default_factory=dict)
+
+
 def get_memory_kb() -> int:
     """Return the current RSS in kilobytes."""
     if resource is not None:
@@ -76,30 +134,456 @@ def get_memory_kb() -> int:
     return 0
 
 
-def ingest_pdfs(pdf_dir: str, dirs: SimpleNamespace) -> List[Path]:
-    """Ingest all PDFs in *pdf_dir* and extract their text."""
+def _extract_one(
+    pdf_path: Path | ArchiveMember,
+    out_dir: Path,
+    page_jobs: int = 1,
+    profile: str = pdf_to_text.DEFAULT_PROFILE,
+    backend: str = pdf_to_text.DEFAULT_BACKEND,
+    text_format: str = "json",
+    budget: PageBudget | None = None,
+    image_pages: Sequence[int] = (),
+) -> Path:
+    """Worker entry point: extract ``pdf_path`` and return the text file path.
+
+    An archive member is read into the worker's memory, not unpacked to disk.
+    """
+    if text_format != "json":
+        return pdf_to_text.pdf_to_pages(
+            pdf_path,
+            out_dir=out_dir,
+            page_workers=page_jobs,
+            profile=profile,
+            backend=backend,
+            text_format=text_format,
+            budget=budget,
+            image_pages=image_pages,
+        )
+    pdf_to_text.pdf_to_text(
+        pdf_path,
+        out_dir=out_dir,
+        page_workers=page_jobs,
+        profile=profile,
+        backend=backend,
+        budget=budget,
+        image_pages=image_pages,
+    )
+    return out_dir / f"{pdf_path.stem}.json"
+
+
+def _config_label(profile: str, backend: str) -> str:
+    return f"{backend}/{profile}" if backend == "pdfminer" else backend
+
+
+def _triage(
+    pdf_paths: Sequence[Path | ArchiveMember], workers: int, limits: WorkerLimits
+) -> List[Triage | None]:
+    """Triage ``pdf_paths`` in worker processes under ``limits``.
+
+    A malformed PDF can hang or blow up PDFium as well as pdfminer, so each
+    triage runs isolated with at most ``TRIAGE_TIMEOUT`` seconds. A PDF whose
+    triage fails is routed as a text PDF; its extraction worker reports the
+    error with retries and limits.
+    """
+    timeout = limits.timeout and min(limits.timeout, TRIAGE_TIMEOUT)
+    outcomes = run_isolated(
+        [(triage_pdf, (pdf_path,)) for pdf_path in pdf_paths],
+        workers=workers,
+        limits=WorkerLimits(timeout=timeout, max_rss_mb=limits.max_rss_mb),
+    )
+    for pdf_path, outcome in zip(pdf_paths, outcomes):
+        if not outcome.ok:
+            logger.warning("Triage failed for %s (%s)", pdf_path.name, outcome.error)
+    return [outcome.value if outcome.ok else None for outcome in outcomes]
+
+
+def _page_workers(page_jobs: int, jobs: int) -> int:
+    """Return ``page_jobs`` capped so ``jobs`` PDFs at a time fit the CPUs.
+
+    Each of the ``jobs`` extraction workers starts its own pool of page
+    workers, so uncapped the run would use ``jobs * page_jobs`` processes.
+    """
+    return max(1, min(page_jobs, (os.cpu_count() or 1) // max(1, jobs)))
+
+
+def _needs_ocr(triage: Triage | None) -> bool:
+    return triage is not None and triage.needs_ocr
+
+
+def _estimate(triage: Triage | None, profile: str, backend: str) -> float:
+    return 0.0 if triage is None else triage.estimate_seconds(profile, backend)
+
+
+def _log_triage(triages: Sequence[Triage | None], profile: str, backend: str) -> None:
+    found = [t for t in triages if t is not None]
+    if not found:
+        return
+    kinds = {kind: sum(t.kind == kind for t in found) for kind in TRIAGE_KINDS}
+    text = sum(_estimate(t, profile, backend) for t in found if not t.needs_ocr)
+    ocr = sum(_estimate(t, profile, backend) for t in found if t.needs_ocr)
+    logger.info(
+        "Triage: %s PDF(s), %d pages; estimated %.0fs text and %.0fs OCR work",
+        ", ".join(f"{n} {kind}" for kind, n in kinds.items()),
+        sum(t.pages for t in found),
+        text,
+        ocr,
+    )
+
+
+def extract_texts(
+    pdf_paths: Sequence[Path | ArchiveMember],
+    out_dir: Path,
+    *,
+    jobs: int = 1,
+    page_jobs: int = 1,
+    ocr_jobs: int = 1,
+    profile: str = pdf_to_text.DEFAULT_PROFILE,
+    backend: str = pdf_to_text.DEFAULT_BACKEND,
+    text_format: str = "json",
+    budget: PageBudget | None = None,
+    limits: WorkerLimits = WorkerLimits(),
+    stats: ExtractionStats | None = None,
+) -> List[Optional[Path]]:
+    """Extract text for ``pdf_paths`` into ``out_dir``.
+
+    A quick PDFium pass first triages each PDF (see ``extract.triage``) in a
+    worker process under ``limits`` and routes it to one of two queues,
+    longest estimated job first. PDFs with a full text layer are extracted
+    ``jobs`` at a time; scanned and mixed PDFs
+    ``ocr_jobs`` at a time, each OCR'ing pages with ``max(page_jobs, jobs //
+    ocr_jobs)`` Tesseract processes, and their image-only pages skip the text
+    backend. Per-PDF page processes are capped at the CPU count divided by the
+    PDFs extracted at a time, so nested pools do not oversubscribe the CPUs.
+
+    Each PDF is extracted in its own worker process, and the worker is killed
+    when it exceeds ``limits``. A PDF whose worker fails, times out or runs
+    out of memory is retried with the cheaper configurations of
+    ``extract.workers.retry_configs``; when every attempt fails it is logged
+    and yields ``None`` without affecting the others. Results are returned in
+    input order. ``page_jobs`` additionally splits very large PDFs into page
+    ranges parsed by that many processes, ``profile`` names the extraction
+    profile and ``backend`` the text extraction backend. ``text_format`` is
+    ``json`` for one document per PDF, or ``jsonl``/``pages`` to write each
+    PDF page by page (see ``extract.text_files``). With a ``budget`` only the
+    pages it selects are parsed now (see ``extract.page_budget``). ``stats``
+    receives the triage results, the degraded PDFs and the errors of those
+    that failed.
+    """
+    stats = stats if stats is not None else ExtractionStats()
+    triages = _triage(pdf_paths, max(jobs, ocr_jobs), limits)
+    for pdf_path, triage in zip(pdf_paths, triages):
+        if triage is not None:
+            stats.triage[pdf_path.name] = triage
+    _log_triage(triages, profile, backend)
+
+    ocr_jobs = max(1, ocr_jobs)
+    ocr_page_jobs = _page_workers(max(page_jobs, jobs // ocr_jobs), ocr_jobs)
+    text_page_jobs = _page_workers(page_jobs, jobs)
+    if text_page_jobs < page_jobs:
+        logger.info(
+            "Capping page processes per PDF at %d for %d jobs on %d CPUs",
+            text_page_jobs,
+            jobs,
+            os.cpu_count() or 1,
+        )
+    results: List[Optional[Path]] = [None] * len(pdf_paths)
+    errors: Dict[int, List[str]] = {i: [] for i in range(len(pdf_paths))}
+    todo = list(range(len(pdf_paths)))
+    for attempt, (try_profile, try_backend) in enumerate(
+        retry_configs(profile, backend)
+    ):
+        if not todo:
+            break
+        label = _config_label(try_profile, try_backend)
+        ordered = sorted(
+            todo,
+            key=lambda i: _estimate(triages[i], try_profile, try_backend),
+            reverse=True,
+        )
+        ocr_queue = [i for i in ordered if _needs_ocr(triages[i])]
+        text_queue = [i for i in ordered if i not in ocr_queue]
+        queues = [
+            (text_queue, jobs, text_page_jobs),
+            (ocr_queue, ocr_jobs, ocr_page_jobs),
+        ]
+        failed = []
+        for queue, workers, queue_page_jobs in queues:
+            calls = [
+                (
+                    _extract_one,
+                    (
+                        pdf_paths[i],
+                        out_dir,
+                        queue_page_jobs,
+                        try_profile,
+                        try_backend,
+                        text_format,
+                        budget,
+                        triages[i].image_pages if triages[i] is not None else (),
+                    ),
+                )
+                for i in queue
+            ]
+            outcomes = run_isolated(calls, workers=workers, limits=limits)
+            for i, outcome in zip(queue, outcomes):
+                name = pdf_paths[i].name
+                if outcome.ok:
+                    results[i] = outcome.value
+                    if attempt:
+                        stats.degraded.append(name)
+                        logger.warning("Extracted %s with the %s fallback", name, label)
+                    continue
+                errors[i].append(f"{label}: {outcome.error}")
+                logger.error(
+                    "Text extraction failed for %s with %s (%s)",
+                    name,
+                    label,
+                    outcome.error,
+                )
+                failed.append(i)
+        todo = sorted(failed)
+    for i in todo:
+        stats.errors[pdf_paths[i].name] = errors[i]
+    return results
+
+
+def _move_duplicate(artifact: Path) -> None:
+    """Move a near-duplicate's text file into the ``duplicates`` subfolder."""
+    target = artifact.parent / DUPLICATES_DIR / artifact.name
+    target.parent.mkdir(exist_ok=True)
+    artifact.replace(target)
+
+
+def _pdf_sources(pdf_dir: str | Path) -> List[Path | ArchiveMember]:
+    """Return the PDFs in the directory or zip/tar archive ``pdf_dir``."""
+    if is_archive(pdf_dir):
+        return list(list_archive(Path(pdf_dir)))
+    return sorted(Path(pdf_dir).glob("*.pdf"))
+
+
+def ingest_pdfs(
+    pdf_dir: str,
+    dirs: SimpleNamespace,
+    *,
+    jobs: int = 1,
+    page_jobs: int = 1,
+    ocr_jobs: int = 1,
+    profile: str = pdf_to_text.DEFAULT_PROFILE,
+    backend: str = pdf_to_text.DEFAULT_BACKEND,
+    text_format: str = "json",
+    budget: PageBudget | None = None,
+    limits: WorkerLimits = WorkerLimits(),
+    near_duplicate_threshold: float | None = NEAR_DUPLICATE_THRESHOLD,
+    shared: SharedStore | None = None,
+    stats: ExtractionStats | None = None,
+) -> List[Path | ArchiveMember]:
+    """Ingest all PDFs in *pdf_dir* and extract their text.
+
+    *pdf_dir* may also be a zip or tar archive (see ``extract.sources``). Its
+    members are hashed and extracted straight from the archive without
+    temporary files, and their log entries record the member name.
+
+    ``jobs`` sets the number of extraction worker processes for PDFs with a
+    text layer, ``ocr_jobs`` that for scanned and mixed PDFs and ``page_jobs``
+    the number of processes used to split a single very large PDF. PDFs whose
+    checksum and extractor configuration match an entry in the workspace's
+    extraction manifest are not extracted again; ``stats`` receives the hit
+    and miss counts. PDFs that fail every retry within ``limits`` are added
+    to the workspace quarantine and skipped by later runs.
+
+    The cleaned text of each paper is checked against the workspace's MinHash
+    index (see ``ingest.near_duplicates``). A paper whose estimated Jaccard
+    similarity to an earlier one reaches ``near_duplicate_threshold`` is
+    linked to it, its text file is moved to ``text/duplicates/`` so later
+    stages skip it, and later runs do not extract it again. Only papers of
+    the current run with a text file can be originals, and a PDF replaced
+    under the same name is compared without its earlier version; a linked
+    paper whose original left *pdf_dir* is extracted again. ``None`` or ``0``
+    disables the check.
+
+    With a ``shared`` store, PDFs and extracted text are linked into it, and
+    a PDF another workspace already extracted with the same configuration
+    gets a hardlink to that text instead of a new extraction. PDFs read from
+    an archive are not copied into the store; their text still is.
+    """
+    stats = stats if stats is not None else ExtractionStats()
     paths = []
-    for pdf_path in sorted(Path(pdf_dir).glob("*.pdf")):
-        entry = ingest_pdf(pdf_path)
-        if entry is not None:
-            paths.append(pdf_path)
-        pdf_to_text.DATA_DIR = dirs.text
-        pdf_to_text.pdf_to_text(pdf_path)
+    pdf_paths = _pdf_sources(pdf_dir)
+    with open_store() as store:
+        digests = hash_files(pdf_paths, store=store)
+        for pdf_path in pdf_paths:
+            checksum = digests[pdf_path].md5
+            entry = ingest_pdf(pdf_path, store=store, checksum=checksum)
+            if entry is not None:
+                paths.append(pdf_path)
+
+    manifest = ExtractionManifest(dirs.manifest, dirs.text)
+    fingerprint = config_fingerprint(
+        pdf_to_text.extractor_config(profile, backend, budget)
+    )
+    cached = {p: manifest.lookup(digests[p].md5, fingerprint) for p in pdf_paths}
+    todo = [p for p in pdf_paths if cached[p] is None]
+    quarantine = Quarantine(dirs.quarantine)
+    skipped = [p.name for p in todo if digests[p].md5 in quarantine]
+    if skipped:
+        stats.quarantined.extend(skipped)
+        logger.warning(
+            "Skipping %d quarantined PDF(s); see %s", len(skipped), quarantine.path
+        )
+        todo = [p for p in todo if digests[p].md5 not in quarantine]
+    index = None
+    if near_duplicate_threshold:
+        index = NearDuplicateIndex(
+            dirs.near_duplicates, threshold=near_duplicate_threshold
+        )
+        names = {p.name for p in pdf_paths}
+        with index:
+            for pdf_path in list(todo):
+                original = index.duplicate_of(digests[pdf_path].md5)
+                if original is None:
+                    continue
+                if original not in names:
+                    # The original left ``pdf_dir``; extract this one again.
+                    index.unlink(digests[pdf_path].md5)
+                    continue
+                stats.near_duplicates[pdf_path.name] = original
+                todo.remove(pdf_path)
+    if shared is not None:
+        for pdf_path in pdf_paths:
+            if isinstance(pdf_path, Path):
+                shared.add_pdf(digests[pdf_path].md5, pdf_path)
+        for pdf_path in list(todo):
+            stored = shared.lookup_text(digests[pdf_path].md5, fingerprint)
+            if stored is None:
+                continue
+            artifact = shared.checkout_text(stored, dirs.text, pdf_path.stem)
+            manifest.record(digests[pdf_path].md5, fingerprint, artifact, pdf_path.name)
+            cached[pdf_path] = artifact
+            stats.shared += 1
+            todo.remove(pdf_path)
+    stats.hits += sum(a is not None for a in cached.values())
+    stats.misses += len(todo)
+    results = extract_texts(
+        todo,
+        dirs.text,
+        jobs=jobs,
+        page_jobs=page_jobs,
+        ocr_jobs=ocr_jobs,
+        profile=profile,
+        backend=backend,
+        text_format=text_format,
+        budget=budget,
+        limits=limits,
+        stats=stats,
+    )
+    extracted = dict(zip(todo, results))
+    for pdf_path, artifact in extracted.items():
+        if artifact is None:
+            stats.failed.append(pdf_path.name)
+            quarantine.add(
+                digests[pdf_path].md5,
+                pdf_path.name,
+                stats.errors.get(pdf_path.name, []),
+            )
+    if index is not None:
+        # Cached papers come first so earlier runs keep their originals; papers
+        # extracted before the index existed are indexed here too.
+        artifacts = [*cached.items(), *extracted.items()]
+        # Only papers of this run with a text file can be originals, so a
+        # removed or replaced PDF never sends a paper to ``duplicates``.
+        live = {digests[p].md5 for p, a in artifacts if a is not None and a.exists()}
+        with index:
+            for pdf_path, artifact in artifacts:
+                # Indexed papers were checked by an earlier run; skip reading
+                # and cleaning their text again.
+                if artifact is None or digests[pdf_path].md5 in index:
+                    continue
+                if not artifact.exists():
+                    continue
+                text, _ = read_clean_text(artifact)
+                match = index.check(
+                    digests[pdf_path].md5, pdf_path.name, text, originals=live
+                )
+                if match is None:
+                    continue
+                logger.warning(
+                    "%s is a near-duplicate of %s (%.0f%% similar); skipping it",
+                    pdf_path.name,
+                    match.source,
+                    100 * match.similarity,
+                )
+                stats.near_duplicates[pdf_path.name] = match.source
+                _move_duplicate(artifact)
+                extracted.pop(pdf_path, None)
+    degraded = set(stats.degraded)
+    for pdf_path, artifact in extracted.items():
+        # Text from a cheaper fallback is used for this run only, so later
+        # runs try the requested configuration again and it is never shared.
+        if artifact is not None and pdf_path.name not in degraded:
+            manifest.record(digests[pdf_path].md5, fingerprint, artifact, pdf_path.name)
+            if shared is not None:
+                shared.publish_text(digests[pdf_path].md5, fingerprint, artifact)
+    manifest.save()
+    if stats.failed:
+        quarantine.save()
     return paths
 
 
 def extract_metadata_from_text(
-    drug_name: str, *, agent1_model: str | None = None
+    drug_name: str,
+    *,
+    agent1_model: str | None = None,
+    sections: Sequence[str] | None = None,
+    concurrency: int = 1,
+    window_tokens: int | None = None,
 ) -> List[Path]:
-    """Run Agent 1 on all text files in ``TEXT_DIR`` using ``drug_name``."""
+    """Run Agent 1 on all text files in ``TEXT_DIR`` using ``drug_name``.
+
+    Only the front matter and ``sections`` of each paper are sent; ``None``
+    sends the full text. With ``concurrency`` above 1 the papers go through
+    ``MetadataExtractor.aextract_many`` with that many requests in flight, and
+    each is recorded as soon as it completes. Papers longer than
+    ``window_tokens`` (or than fits the model's context window) are extracted
+    in windows and merged.
+    """
     extractor = (
-        MetadataExtractor(model=agent1_model) if agent1_model else MetadataExtractor()
+        MetadataExtractor(
+            model=agent1_model, sections=sections, window_tokens=window_tokens
+        )
+        if agent1_model
+        else MetadataExtractor(sections=sections, window_tokens=window_tokens)
     )
+    manifest = ExtractionManifest(TEXT_DIR.parent / MANIFEST_NAME, TEXT_DIR)
     results = []
-    for text_path in sorted(TEXT_DIR.glob("*.json")):
-        meta = extractor.extract(text_path, drug_name)
-        if meta is not None:
-            results.append(text_path)
+
+    def record(text_path: Path, meta: PaperMetadata | None) -> None:
+        if meta is None:
+            return
+        results.append(text_path)
+        # Agent 1 renames text files after their DOI; keep the manifest
+        # pointing at the renamed artifact.
+        name = meta_mod.MetadataExtractor._safe_name(meta.doi, text_path.stem)
+        renamed = text_path.with_name(f"{name}{text_path.suffix}")
+        if renamed.exists() and not text_path.exists():
+            manifest.relocate(text_path.name, renamed.name)
+
+    async def extract_concurrently(text_paths: List[Path]) -> None:
+        done = 0
+        async for text_path, meta in extractor.aextract_many(
+            text_paths, drug_name, concurrency=concurrency
+        ):
+            done += 1
+            logger.info("Agent 1: %d/%d papers done", done, len(text_paths))
+            record(text_path, meta)
+
+    text_paths = list_text_files(TEXT_DIR)
+    if concurrency > 1 and text_paths:
+        asyncio.run(extract_concurrently(text_paths))
+    else:
+        for text_path in text_paths:
+            record(text_path, extractor.extract(text_path, drug_name))
+    if manifest.path.exists():
+        manifest.save()
     return results
 
 
@@ -109,15 +593,23 @@ def write_agent1_batch(
     *,
     agent1_model: str | None = None,
     token_limit: int = BATCH_TOKEN_LIMIT,
+    sections: Sequence[str] | None = None,
+    clean: bool = True,
 ) -> List[Path]:
     """Write OpenAI batch files for all Agent 1 requests.
 
     Files are named ``<drug>_batch_<n>.jsonl`` and each file is kept below
-    ``token_limit`` tokens. The function returns the list of written files.
+    ``token_limit`` tokens, counted with the model's encoding (see
+    ``utils.tokens``). Requests hold the front matter and ``sections`` of
+    each paper (the full text when ``None``), without running headers/footers
+    and reference lists when ``clean`` is set. The function returns the list
+    of written files.
     """
 
     extractor = (
-        MetadataExtractor(model=agent1_model) if agent1_model else MetadataExtractor()
+        MetadataExtractor(model=agent1_model, sections=sections)
+        if agent1_model
+        else MetadataExtractor(sections=sections)
     )
     prompt = extractor.client.prompt
     model = extractor.client.model
@@ -131,13 +623,25 @@ def write_agent1_batch(
     batch_files = [batch_path]
     token_count = 0
 
-    def entry_tokens(text: str) -> int:
-        return len(prompt.split()) + len(text.split()) + 10
-
-    for text_path in sorted(TEXT_DIR.glob("*.json")):
-        data = orjson.loads(text_path.read_bytes())
-        text = extractor._join_pages(data.get("pages", []))
-        tokens = entry_tokens(text)
+    for text_path in list_text_files(TEXT_DIR):
+        if clean:
+            text, stats = read_clean_text(text_path, sections)
+            logger.info(
+                "Cleaned %s: removed %d chars (~%d tokens)",
+                text_path.name,
+                stats.chars,
+                stats.tokens,
+            )
+        else:
+            text = read_text(text_path, sections)
+        tokens = extractor.client.request_tokens(text)
+        if not fits_context(tokens, model):
+            logger.warning(
+                "%s needs %d tokens, more than the context window of %s allows",
+                text_path.name,
+                tokens,
+                model,
+            )
         if token_count and token_count + tokens > token_limit:
             f.close()
             batch_idx += 1
@@ -224,8 +728,46 @@ def run_pipeline(
     embed_model: str | None = None,
     retrieval_method: Literal["faiss", "text"] = "faiss",
     batch: bool = False,
+    jobs: int = 1,
+    page_jobs: int = 1,
+    ocr_jobs: int = 1,
+    profile: str = pdf_to_text.DEFAULT_PROFILE,
+    backend: str = pdf_to_text.DEFAULT_BACKEND,
+    text_format: str = "json",
+    sections: Sequence[str] | None = None,
+    lazy_pages: int | None = None,
+    extract_timeout: float | None = DEFAULT_TIMEOUT,
+    extract_max_rss_mb: float | None = DEFAULT_MAX_RSS_MB,
+    near_duplicate_threshold: float | None = NEAR_DUPLICATE_THRESHOLD,
+    shared_store: Path | None = None,
+    concurrency: int = 1,
+    llm_cache: bool = True,
+    window_tokens: int | None = None,
 ) -> None:
-    """Execute the full data processing pipeline."""
+    """Execute the full data processing pipeline.
+
+    ``jobs`` is the number of processes used for PDF text extraction,
+    ``ocr_jobs`` the number of scanned or mixed PDFs extracted at once,
+    ``page_jobs`` the number used to split very large PDFs by page range and
+    ``profile`` the extraction profile (see ``extract.pdf_to_text.PROFILES``)
+    and ``backend`` the text extraction backend (see
+    ``extract.pdf_to_text.BACKENDS``). ``text_format`` selects the
+    extracted text format: ``json``, or ``jsonl``/``pages`` to stream pages to
+    disk so huge PDFs are never held in memory whole. ``sections`` lists the
+    paper sections sent to Agent 1 (see ``extract.sections.SECTION_NAMES``);
+    ``None`` sends the full text. ``lazy_pages`` parses only the first that
+    many pages and pages with methods headings at ingestion; the rest are
+    parsed when retrieval or indexing reads the paper. ``extract_timeout``
+    (seconds) and ``extract_max_rss_mb`` bound each PDF's extraction worker;
+    ``None`` or ``0`` disables a limit. Papers at least
+    ``near_duplicate_threshold`` similar to an earlier paper are skipped by
+    every later stage (``None`` or ``0`` keeps them). ``shared_store`` names
+    a store of PDFs, extracted text and embeddings shared with other drug
+    workspaces (see ``ingest.shared_store``). ``pdf_dir`` may be a zip or tar
+    archive of PDFs instead of a directory. ``concurrency`` is the number of
+    Agent 1 requests kept in flight at once and ``window_tokens`` the
+    largest window of a long paper sent in one request.
+    """
     dirs = make_dirs(base_dir)
     global TEXT_DIR, OUTPUT_DIR, SNIPPETS_PATH
     # Adjust helper module paths if they do not already point inside ``base_dir``.
@@ -240,8 +782,34 @@ def run_pipeline(
     if not aggregate.META_DIR.resolve().is_relative_to(dirs.base):
         aggregate.set_base_dir(dirs.base)
     retrieval.set_base_dir(dirs.base)
+    llm_cache_mod.ENABLED = llm_cache
+    shared = SharedStore(shared_store) if shared_store else None
+    if shared is not None:
+        openai_index.EMBEDDING_CACHE_PATH = shared.embedding_cache_path
     metrics: Dict[str, StepMetrics] = {}
-    timed_step(lambda: ingest_pdfs(pdf_dir, dirs), "Ingestion", metrics)
+    extraction = ExtractionStats()
+    timed_step(
+        lambda: ingest_pdfs(
+            pdf_dir,
+            dirs,
+            jobs=jobs,
+            page_jobs=page_jobs,
+            ocr_jobs=ocr_jobs,
+            profile=profile,
+            backend=backend,
+            text_format=text_format,
+            budget=PageBudget(first=lazy_pages) if lazy_pages else None,
+            limits=WorkerLimits(
+                timeout=extract_timeout or None,
+                max_rss_mb=extract_max_rss_mb or None,
+            ),
+            near_duplicate_threshold=near_duplicate_threshold,
+            shared=shared,
+            stats=extraction,
+        ),
+        "Ingestion",
+        metrics,
+    )
     if batch:
         batch_files: List[Path] = []
         timed_step(
@@ -250,6 +818,7 @@ def run_pipeline(
                     drug_name,
                     dirs.base,
                     agent1_model=agent1_model,
+                    sections=sections,
                 )
             ),
             "Prepare Batch",
@@ -261,7 +830,13 @@ def run_pipeline(
         logger.info("Batch mode enabled - skipping API calls and downstream steps")
         return
     timed_step(
-        lambda: extract_metadata_from_text(drug_name, agent1_model=agent1_model),
+        lambda: extract_metadata_from_text(
+            drug_name,
+            agent1_model=agent1_model,
+            sections=sections,
+            concurrency=concurrency,
+            window_tokens=window_tokens,
+        ),
         "Metadata Extraction",
         metrics,
     )
@@ -281,13 +856,41 @@ def run_pipeline(
         metrics.items(), key=lambda x: x[1].duration, reverse=True
     ):
         logger.info("%-20s %.2fs %+d KB", name, data.duration, data.memory_kb)
+    logger.info(
+        "Extraction cache: %d hits (%d from the shared store), %d misses, %d failed",
+        extraction.hits,
+        extraction.shared,
+        extraction.misses,
+        len(extraction.failed),
+    )
+    if llm_cache:
+        logger.info("LLM response cache: %s", llm_cache_mod.STATS.summary())
+    if extraction.degraded:
+        logger.warning(
+            "Extracted with a cheaper fallback: %s", ", ".join(extraction.degraded)
+        )
+    if extraction.failed or extraction.quarantined:
+        logger.warning(
+            "Quarantined PDFs: %s (report: %s)",
+            ", ".join(extraction.failed + extraction.quarantined),
+            dirs.quarantine,
+        )
+    for name, original in extraction.near_duplicates.items():
+        logger.warning("Skipped %s as a near-duplicate of %s", name, original)
 
 
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Run the full pipeline")
-    parser.add_argument("--pdf-dir", required=True, help="Directory with PDFs")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pdf-dir", help="Directory with PDFs")
+    source.add_argument(
+        "--pdf-archive",
+        dest="pdf_dir",
+        metavar="FILE",
+        help="Zip or uncompressed tar archive of PDFs, read without unpacking",
+    )
     parser.add_argument("--drug", required=True, help="Drug name for snippets")
     parser.add_argument(
         "--base-dir",
@@ -308,6 +911,114 @@ if __name__ == "__main__":
         action="store_true",
         help="Write an OpenAI batch file of Agent 1 requests and exit",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for PDF text extraction (default: 1)",
+    )
+    parser.add_argument(
+        "--page-jobs",
+        type=int,
+        default=1,
+        help="Processes used to split PDFs with 100+ pages by page range, "
+        "at most the CPU count divided by --jobs (default: 1)",
+    )
+    parser.add_argument(
+        "--ocr-jobs",
+        type=int,
+        default=1,
+        help="Scanned or mixed PDFs extracted at once; each uses its share of "
+        "--jobs for OCR (default: 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(pdf_to_text.PROFILES),
+        default=pdf_to_text.DEFAULT_PROFILE,
+        help="Text extraction profile (default: accurate)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(pdf_to_text.BACKENDS),
+        default=pdf_to_text.DEFAULT_BACKEND,
+        help="Text extraction backend (default: pdfminer)",
+    )
+    parser.add_argument(
+        "--text-format",
+        choices=sorted(pdf_to_text.TEXT_FORMATS),
+        default="json",
+        help="Extracted text format: json, jsonl or a memory-mapped pages "
+        "corpus; jsonl and pages are written page by page (default: json)",
+    )
+    parser.add_argument(
+        "--sections",
+        nargs="+",
+        choices=[*SECTION_NAMES, "all"],
+        default=["all"],
+        help="Paper sections sent to Agent 1 besides the front matter, e.g. "
+        f"{' '.join(RECOMMENDED_SECTIONS)}, or 'all' for the full text "
+        "(default: all)",
+    )
+    parser.add_argument(
+        "--lazy-pages",
+        type=int,
+        metavar="N",
+        help="Parse only the first N pages of each PDF plus pages with methods "
+        "headings; the rest are parsed when retrieval or indexing needs them",
+    )
+    parser.add_argument(
+        "--extract-timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        metavar="SECONDS",
+        help="Kill and retry a PDF's extraction worker after this long; 0 "
+        f"disables (default: {DEFAULT_TIMEOUT:.0f})",
+    )
+    parser.add_argument(
+        "--extract-max-rss",
+        type=float,
+        default=DEFAULT_MAX_RSS_MB,
+        metavar="MB",
+        help="Kill and retry a PDF's extraction worker above this resident "
+        f"memory; 0 disables (default: {DEFAULT_MAX_RSS_MB:.0f})",
+    )
+    parser.add_argument(
+        "--near-duplicate-threshold",
+        type=float,
+        default=NEAR_DUPLICATE_THRESHOLD,
+        metavar="J",
+        help="Skip papers whose text has at least this estimated Jaccard "
+        "similarity to an earlier paper; 0 disables "
+        f"(default: {NEAR_DUPLICATE_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--shared-store",
+        type=Path,
+        metavar="DIR",
+        help="Store of PDFs, extracted text and embeddings shared by drug "
+        "workspaces, e.g. data/shared",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Agent 1 metadata requests sent at once (default: 1)",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        dest="llm_cache",
+        action="store_false",
+        help="Call the API for every model request instead of reusing cached "
+        "replies",
+    )
+    parser.add_argument(
+        "--window-tokens",
+        type=int,
+        metavar="N",
+        help="Split papers longer than N tokens into windows extracted "
+        "concurrently (default: only papers exceeding the context window)",
+    )
     args = parser.parse_args()
 
     run_pipeline(
@@ -319,4 +1030,19 @@ if __name__ == "__main__":
         embed_model=args.embed_model,
         retrieval_method=args.retrieval,
         batch=args.batch,
+        jobs=args.jobs,
+        page_jobs=args.page_jobs,
+        ocr_jobs=args.ocr_jobs,
+        profile=args.profile,
+        backend=args.backend,
+        text_format=args.text_format,
+        sections=None if "all" in args.sections else args.sections,
+        lazy_pages=args.lazy_pages,
+        extract_timeout=args.extract_timeout,
+        extract_max_rss_mb=args.extract_max_rss,
+        near_duplicate_threshold=args.near_duplicate_threshold,
+        shared_store=args.shared_store,
+        concurrency=args.concurrency,
+        llm_cache=args.llm_cache,
+        window_tokens=args.window_tokens,
     )
@@ -5,12 +5,24 @@ import argparse
 from pathlib import Path
 
 import pipeline
+import extract.pdf_to_text as pdf_to_text
+from agent1.metadata_extractor import RECOMMENDED_SECTIONS
+from extract.sections import SECTION_NAMES
+from extract.workers import DEFAULT_MAX_RSS_MB, DEFAULT_TIMEOUT
+from ingest.near_duplicates import DEFAULT_THRESHOLD as NEAR_DUPLICATE_THRESHOLD
 
 
 def main(argv: list[str] | None = None) -> int:
     """Entry point for the pipeline CLI."""
     parser = argparse.ArgumentParser(description="Run MR literature pipeline.")
-    parser.add_argument("--pdf_dir", required=True, help="Directory containing PDFs")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pdf_dir", help="Directory containing PDFs")
+    source.add_argument(
+        "--pdf-archive",
+        dest="pdf_dir",
+        metavar="FILE",
+        help="Zip or uncompressed tar archive of PDFs, read without unpacking",
+    )
     parser.add_argument("--drug", required=True, help="Name of the drug for review")
     parser.add_argument(
         "--base_dir",
@@ -31,6 +43,114 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Write an OpenAI batch file of Agent 1 requests and exit",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for PDF text extraction (default: 1)",
+    )
+    parser.add_argument(
+        "--page-jobs",
+        type=int,
+        default=1,
+        help="Processes used to split PDFs with 100+ pages by page range, "
+        "at most the CPU count divided by --jobs (default: 1)",
+    )
+    parser.add_argument(
+        "--ocr-jobs",
+        type=int,
+        default=1,
+        help="Scanned or mixed PDFs extracted at once; each uses its share of "
+        "--jobs for OCR (default: 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(pdf_to_text.PROFILES),
+        default=pdf_to_text.DEFAULT_PROFILE,
+        help="Text extraction profile (default: accurate)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(pdf_to_text.BACKENDS),
+        default=pdf_to_text.DEFAULT_BACKEND,
+        help="Text extraction backend (default: pdfminer)",
+    )
+    parser.add_argument(
+        "--text-format",
+        choices=sorted(pdf_to_text.TEXT_FORMATS),
+        default="json",
+        help="Extracted text format: json, jsonl or a memory-mapped pages "
+        "corpus; jsonl and pages are written page by page (default: json)",
+    )
+    parser.add_argument(
+        "--sections",
+        nargs="+",
+        choices=[*SECTION_NAMES, "all"],
+        default=["all"],
+        help="Paper sections sent to Agent 1 besides the front matter, e.g. "
+        f"{' '.join(RECOMMENDED_SECTIONS)}, or 'all' for the full text "
+        "(default: all)",
+    )
+    parser.add_argument(
+        "--lazy-pages",
+        type=int,
+        metavar="N",
+        help="Parse only the first N pages of each PDF plus pages with methods "
+        "headings; the rest are parsed when retrieval or indexing needs them",
+    )
+    parser.add_argument(
+        "--extract-timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        metavar="SECONDS",
+        help="Kill and retry a PDF's extraction worker after this long; 0 "
+        f"disables (default: {DEFAULT_TIMEOUT:.0f})",
+    )
+    parser.add_argument(
+        "--extract-max-rss",
+        type=float,
+        default=DEFAULT_MAX_RSS_MB,
+        metavar="MB",
+        help="Kill and retry a PDF's extraction worker above this resident "
+        f"memory; 0 disables (default: {DEFAULT_MAX_RSS_MB:.0f})",
+    )
+    parser.add_argument(
+        "--near-duplicate-threshold",
+        type=float,
+        default=NEAR_DUPLICATE_THRESHOLD,
+        metavar="J",
+        help="Skip papers whose text has at least this estimated Jaccard "
+        "similarity to an earlier paper; 0 disables "
+        f"(default: {NEAR_DUPLICATE_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--shared-store",
+        type=Path,
+        metavar="DIR",
+        help="Store of PDFs, extracted text and embeddings shared by drug "
+        "workspaces, e.g. data/shared",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Agent 1 metadata requests sent at once (default: 1)",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        dest="llm_cache",
+        action="store_false",
+        help="Call the API for every model request instead of reusing cached "
+        "replies",
+    )
+    parser.add_argument(
+        "--window-tokens",
+        type=int,
+        metavar="N",
+        help="Split papers longer than N tokens into windows extracted "
+        "concurrently (default: only papers exceeding the context window)",
+    )
     args = parser.parse_args(argv)
     pipeline.run_pipeline(
         args.pdf_dir,
@@ -41,6 +161,21 @@ def main(argv: list[str] | None = None) -> int:
         embed_model=args.embed_model,
         retrieval_method=args.retrieval,
         batch=args.batch,
+        jobs=args.jobs,
+        page_jobs=args.page_jobs,
+        ocr_jobs=args.ocr_jobs,
+        profile=args.profile,
+        backend=args.backend,
+        text_format=args.text_format,
+        sections=None if "all" in args.sections else args.sections,
+        lazy_pages=args.lazy_pages,
+        extract_timeout=args.extract_timeout,
+        extract_max_rss_mb=args.extract_max_rss,
+        near_duplicate_threshold=args.near_duplicate_threshold,
+        shared_store=args.shared_store,
+        concurrency=args.concurrency,
+        llm_cache=args.llm_cache,
+        window_tokens=args.window_tokens,
     )
     return 0
 
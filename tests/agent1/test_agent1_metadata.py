@@ -89,3 +89,91 @@ def test_cli_end_to_end(monkeypatch, tmp_path):
     loaded = orjson.loads(out_file.read_bytes())
     PaperMetadata.model_validate(loaded)
     assert fake_client.calls == 1
+
+
+class FakeAsyncClient:
+    """Answers after ``delays[text]`` seconds and tracks requests in flight."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = 0
+        self.peak = 0
+
+    async def acall(self, text, *, max_retries=2):
+        import asyncio
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays[text])
+        finally:
+            self.in_flight -= 1
+        if text == "bad":
+            raise RuntimeError("boom")
+        return {"title": text}
+
+
+def test_aextract_many_streams_with_bounded_concurrency(monkeypatch, tmp_path):
+    import asyncio
+
+    from agent1.metadata_extractor import MetadataExtractor
+
+    monkeypatch.setattr("agent1.metadata_extractor.META_DIR", tmp_path / "meta")
+    client = FakeAsyncClient({"slow": 0.2, "bad": 0.05, "a": 0.01, "b": 0.01})
+    extractor = MetadataExtractor(client=client)
+
+    async def collect():
+        return [
+            (item, meta and meta.title)
+            async for item, meta in extractor.aextract_many(
+                ["slow", "bad", "a", "b"], "drug", concurrency=2
+            )
+        ]
+
+    results = asyncio.run(collect())
+    assert results[-1] == ("slow", "slow")
+    assert ("bad", None) in results
+    assert sorted(results[:3], key=str) == [("a", "a"), ("b", "b"), ("bad", None)]
+    assert client.peak == 2
+
+
+def test_aextract_many_bounds_window_requests(monkeypatch, tmp_path):
+    import asyncio
+    from collections import defaultdict
+
+    from agent1.metadata_extractor import MetadataExtractor
+
+    monkeypatch.setattr("agent1.metadata_extractor.META_DIR", tmp_path / "meta")
+    client = FakeAsyncClient(defaultdict(lambda: 0.02))
+    extractor = MetadataExtractor(client=client)
+    monkeypatch.setattr(extractor, "_windows", lambda text: [text + "1", text + "2"])
+
+    async def collect():
+        return [
+            item
+            async for item, _ in extractor.aextract_many(
+                ["a", "b", "c"], "drug", concurrency=2
+            )
+        ]
+
+    assert sorted(asyncio.run(collect())) == ["a", "b", "c"]
+    assert client.peak == 2
+
+
+def test_acall_uses_async_client(monkeypatch, tmp_path):
+    import asyncio
+    import types
+
+    from agent1 import openai_client
+
+    class Completions:
+        async def create(self, **kwargs):
+            message = types.SimpleNamespace(content='{"ok": 1}')
+            return types.SimpleNamespace(
+                choices=[types.SimpleNamespace(message=message)], usage=None
+            )
+
+    fake = types.SimpleNamespace(chat=types.SimpleNamespace(completions=Completions()))
+    monkeypatch.setattr(openai_client, "get_async_client", lambda: fake)
+    caller = openai_client.OpenAIJSONCaller(model="test")
+    assert asyncio.run(caller.acall("hello")) == {"ok": 1}
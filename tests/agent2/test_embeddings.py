@@ -66,14 +66,20 @@ def fake_openai_key(monkeypatch):
     monkeypatch.setattr(emb, "get_openai_api_key", lambda: "key")
 
 
-def test_chunk_text_basic():
+def test_chunk_text_basic(monkeypatch):
     from agent2.embeddings import chunk_text
+    from utils import tokens
 
+    # Pin the estimator so the counts do not depend on tiktoken being
+    # installed: "t0" ... "t99" are two tokens each, a letter and a number.
+    monkeypatch.setattr(tokens, "tiktoken", None)
+    tokens._encoding.cache_clear()
     text = " ".join(f"t{i}" for i in range(100))
-    chunks = chunk_text(text, chunk_size=10, overlap=2)
+    chunks = chunk_text(text, chunk_size=20, overlap=4)
     assert len(chunks) == 13
     assert chunks[0].split()[0] == "t0"
     assert chunks[1].split()[0] == "t8"
+    tokens._encoding.cache_clear()
 
 
 def test_embed_chunks_success(monkeypatch):
@@ -110,3 +116,22 @@ def test_embed_chunks_auth(monkeypatch):
     with pytest.raises(fake_openai.error.AuthenticationError):
         embed_chunks(["x"])
     assert len(fake_embed.calls) == 1
+
+
+def test_iter_chunks_matches_chunk_text():
+    from agent2.embeddings import chunk_text, iter_chunks
+
+    pages = [" ".join(f"p{p}w{i}" for i in range(p * 7)) for p in range(6)]
+    expected = chunk_text(" ".join(pages), chunk_size=10, overlap=3)
+    assert list(iter_chunks(pages, chunk_size=10, overlap=3)) == expected
+
+
+def test_chunks_stay_within_token_budget():
+    from agent2.embeddings import chunk_text
+    from utils.tokens import count_tokens
+
+    text = "Rapamycin (10 mg/kg) reduced mTORC1 signalling by 42.5%. " * 50
+    chunks = chunk_text(text, chunk_size=64, overlap=8)
+    assert len(chunks) > 1
+    assert all(count_tokens(c, "text-embedding-3-small") <= 64 for c in chunks)
+    assert " ".join(chunks[0].split()[:3]) == "Rapamycin (10 mg/kg)"
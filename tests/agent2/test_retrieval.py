@@ -156,3 +156,18 @@ def test_embedding_snippets_test_papers(tmp_path: Path, monkeypatch) -> None:
     result = retrieval.get_snippets(dois[0], "Sample", k=1, method="faiss")
     assert result
     assert "Sample" in result[0]
+
+
+def test_keyword_snippets_from_streamed_pages(tmp_path: Path, monkeypatch) -> None:
+    from extract.text_files import PageWriter
+
+    text_dir = tmp_path / "text"
+    with PageWriter(text_dir / "10.3_jsonl.jsonl") as writer:
+        writer.write("Nothing here.")
+        writer.write("Mendelian randomization on page two.")
+    monkeypatch.setattr(retrieval, "TEXT_DIR", text_dir)
+    monkeypatch.setattr(retrieval, "INDEX_PATH", tmp_path / "missing.faiss")
+
+    assert [p["page"] for p in retrieval.load_pages("10.3/jsonl")] == [1, 2]
+    result = retrieval.get_snippets("10.3/jsonl", "mendelian", method="text")
+    assert result and result[0].startswith("Page 2")
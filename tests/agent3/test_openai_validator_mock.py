@@ -23,6 +23,14 @@ def validator(monkeypatch, tmp_path):
         return types.SimpleNamespace(data=[msg])
 
     client.beta.threads.messages.list.side_effect = list_messages
+    # ``Slot.call`` goes through ``with_raw_response``; answer with the parsed
+    # result of the plain ``create`` mocks and no rate-limit headers.
+    for endpoint in (client.beta.threads, client.beta.threads.runs):
+        endpoint.with_raw_response.create.side_effect = (
+            lambda endpoint=endpoint, **kwargs: types.SimpleNamespace(
+                parse=lambda: endpoint.create(**kwargs), headers={}
+            )
+        )
 
     openai_patcher = mock.patch("openai.OpenAI", return_value=client)
     openai_patcher.start()
@@ -64,3 +72,25 @@ def test_is_conflict_retries(validator, monkeypatch):
 
     assert ov.is_conflict("A", "B", "title") is True
     assert call_count["n"] == 3
+
+
+def test_slot_is_released_while_the_run_is_polled(validator, monkeypatch):
+    ov, _create, responses = validator
+    client = ov._get_client()
+    client.beta.threads.runs.with_raw_response.create.side_effect = (
+        lambda **kwargs: types.SimpleNamespace(
+            parse=lambda: types.SimpleNamespace(id="run-1"),
+            headers={"x-ratelimit-limit-requests": "500"},
+        )
+    )
+    in_flight = []
+    monkeypatch.setattr(
+        ov,
+        "_wait_for_run",
+        lambda *a: in_flight.append(ov.GOVERNOR.stats()["gpt-4o"].in_flight),
+    )
+    responses.append("No")
+
+    assert ov.is_conflict("A", "B", "title") is False
+    assert in_flight == [0]
+    assert ov.GOVERNOR.stats()["gpt-4o"].rpm == 500
@@ -22,3 +22,49 @@ def no_network_calls(monkeypatch):
         raise RuntimeError("Network access blocked during tests")
 
     monkeypatch.setattr(socket.socket, "connect", guard)
+
+
+FAKE_TESSERACT = """#!{python}
+import sys
+from PIL import Image
+
+src = sys.argv[1]
+paths = open(src).read().splitlines() if src.endswith(".txt") else [src]
+with open(sys.argv[0] + ".calls", "a") as log:
+    log.write(str(len(paths)) + "\\n")
+for path in paths:
+    width, height = Image.open(path).size
+    sys.stdout.write(f"ocr {{width}}x{{height}}\\n\\f")
+"""
+
+
+@pytest.fixture(autouse=True)
+def isolated_ocr_cache(tmp_path, monkeypatch):
+    """Keep OCR cache writes out of the repository's data directory."""
+    monkeypatch.setattr(
+        "extract.pdf_to_text.OCR_CACHE_PATH", tmp_path / "ocr_cache.sqlite3"
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_llm_cache(tmp_path, monkeypatch):
+    """Call the (faked) API every time; tests opt in to the response cache."""
+    monkeypatch.setattr("utils.llm_cache.ENABLED", False)
+    monkeypatch.setattr(
+        "utils.llm_cache.LLM_CACHE_PATH", tmp_path / "llm_cache.sqlite3"
+    )
+
+
+@pytest.fixture
+def fake_tesseract(tmp_path, monkeypatch):
+    """Install a stand-in tesseract that echoes image sizes.
+
+    Each invocation appends the number of images it received to
+    ``<script>.calls`` so tests can check batching.
+    """
+    script = tmp_path / "fake-tesseract"
+    script.write_text(FAKE_TESSERACT.format(python=sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setattr("pytesseract.pytesseract.tesseract_cmd", str(script))
+    monkeypatch.setattr("pytesseract.get_tesseract_version", lambda: "5.0")
+    return script
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from pathlib import Path
+
+import orjson
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import pipeline
+from extract.page_budget import PageBudget
+from extract.pdf_to_text import complete_pages, pdf_to_text
+from extract.sources import is_archive, list_archive
+from extract.text_files import iter_pages
+from ingest.hashing import digest_file
+
+
+def create_pdf(path: Path, *pages: str) -> None:
+    c = canvas.Canvas(str(path), pagesize=letter)
+    for text in pages:
+        c.drawString(100, 750, text)
+        c.showPage()
+    c.save()
+
+
+def test_list_archive(tmp_path: Path) -> None:
+    create_pdf(tmp_path / "paper.pdf", "Hello")
+    with zipfile.ZipFile(tmp_path / "papers.zip", "w") as zf:
+        zf.write(tmp_path / "paper.pdf", "a/paper.pdf")
+        zf.write(tmp_path / "paper.pdf", "b/paper.pdf")
+        zf.write(tmp_path / "paper.pdf", "c/other.pdf")
+        zf.writestr("notes.txt", "not a pdf")
+    with tarfile.open(tmp_path / "papers.tar", "w") as tf:
+        tf.add(tmp_path / "paper.pdf", "x/paper.pdf")
+    with tarfile.open(tmp_path / "papers.tar.gz", "w:gz") as tf:
+        tf.add(tmp_path / "paper.pdf", "x/paper.pdf")
+
+    members = list_archive(tmp_path / "papers.zip")
+    assert [m.name for m in members] == ["a_paper.pdf", "b_paper.pdf", "other.pdf"]
+    assert is_archive(tmp_path / "papers.tar.gz")
+    with pytest.raises(ValueError, match="compressed tar"):
+        list_archive(tmp_path / "papers.tar.gz")
+    (member,) = list_archive(tmp_path / "papers.tar")
+    assert member.name == "paper.pdf"
+    assert member.read().data == (tmp_path / "paper.pdf").read_bytes()
+    assert digest_file(member) == digest_file(tmp_path / "paper.pdf")
+
+
+def test_ingest_streams_archive_members(monkeypatch, tmp_path: Path) -> None:
+    log_path = tmp_path / "log.jsonl"
+    monkeypatch.setattr("ingest.collector.LOG_PATH", log_path)
+    src = tmp_path / "src"
+    src.mkdir()
+    create_pdf(src / "one.pdf", "First paper")
+    create_pdf(src / "two.pdf", "Second paper")
+    archive = tmp_path / "papers.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.write(src / "one.pdf", "batch/one.pdf")
+        zf.write(src / "two.pdf", "batch/two.pdf")
+    dirs = pipeline.make_dirs(tmp_path / "ws")
+
+    first = pipeline.ExtractionStats()
+    ingested = pipeline.ingest_pdfs(str(archive), dirs, stats=first)
+    assert [p.name for p in ingested] == ["one.pdf", "two.pdf"]
+    assert first.misses == 2
+    assert [p["text"] for p in iter_pages(dirs.text / "one.json")] == ["First paper"]
+    assert not list((tmp_path / "ws").rglob("*.pdf"))
+
+    entries = [orjson.loads(line) for line in log_path.read_bytes().splitlines()]
+    assert [(e["filename"], e["member"]) for e in entries] == [
+        ("one.pdf", "batch/one.pdf"),
+        ("two.pdf", "batch/two.pdf"),
+    ]
+    assert entries[0]["filepath"] == str(archive.resolve())
+
+    second = pipeline.ExtractionStats()
+    assert pipeline.ingest_pdfs(str(archive), dirs, stats=second) == []
+    assert (second.hits, second.misses) == (2, 0)
+
+
+def test_lazy_pages_completed_from_archive(tmp_path: Path) -> None:
+    create_pdf(tmp_path / "paper.pdf", "Abstract", "Results")
+    with tarfile.open(tmp_path / "papers.tar", "w") as tf:
+        tf.add(tmp_path / "paper.pdf", "paper.pdf")
+    (tmp_path / "paper.pdf").unlink()
+    (member,) = list_archive(tmp_path / "papers.tar")
+
+    pdf_to_text(member, out_dir=tmp_path, budget=PageBudget(first=1))
+    out = tmp_path / "paper.json"
+    assert [p["text"] for p in iter_pages(out)] == ["Abstract", ""]
+    assert complete_pages(out)
+    assert [p["text"] for p in iter_pages(out)] == ["Abstract", "Results"]
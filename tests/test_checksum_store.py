@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
+import pytest
+
+from ingest.checksum_store import ChecksumStore, store_path_for
+from ingest.collector import ingest_pdf, open_store
+
+
+def write_log(path: Path, checksums: list[str]) -> None:
+    with path.open("ab") as f:
+        for md5 in checksums:
+            entry = {
+                "filename": f"{md5}.pdf",
+                "filepath": f"/x/{md5}.pdf",
+                "md5": md5,
+                "timestamp": "2025-01-01T00:00:00",
+            }
+            f.write(orjson.dumps(entry) + b"\n")
+
+
+def test_imports_existing_log_once(tmp_path: Path) -> None:
+    log = tmp_path / "log.jsonl"
+    write_log(log, ["a", "b"])
+    log.open("ab").write(b"not json\n")
+
+    with ChecksumStore(log) as store:
+        assert "a" in store and "b" in store
+        assert len(store) == 2
+
+    write_log(log, ["c"])
+    with ChecksumStore(log) as store:
+        assert "c" in store
+        assert len(store) == 3
+    assert store_path_for(log).exists()
+
+
+def test_partial_trailing_line_is_deferred(tmp_path: Path) -> None:
+    log = tmp_path / "log.jsonl"
+    write_log(log, ["a"])
+    with log.open("ab") as f:
+        f.write(b'{"md5": "b"')
+
+    with ChecksumStore(log) as store:
+        assert "b" not in store
+
+    with log.open("ab") as f:
+        f.write(b"}\n")
+    with ChecksumStore(log) as store:
+        assert "b" in store
+
+
+def test_rebuilds_after_log_wipe(tmp_path: Path) -> None:
+    log = tmp_path / "log.jsonl"
+    write_log(log, ["a", "b"])
+    with ChecksumStore(log) as store:
+        assert len(store) == 2
+
+    log.unlink()
+    with ChecksumStore(log) as store:
+        assert len(store) == 0
+
+
+def test_concurrent_claims_have_one_winner(tmp_path: Path) -> None:
+    log = tmp_path / "log.jsonl"
+
+    def claim(_):
+        with ChecksumStore(log) as store:
+            return store.claim("same", "f.pdf", "/f.pdf", "t")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(claim, range(8)))
+    assert results.count(True) == 1
+
+
+def test_ingest_pdf_with_shared_session(tmp_path: Path, monkeypatch) -> None:
+    log = tmp_path / "log.jsonl"
+    monkeypatch.setattr("ingest.collector.LOG_PATH", log)
+    pdfs = []
+    for i in range(3):
+        pdf = tmp_path / f"{i}.pdf"
+        pdf.write_bytes(f"%PDF-{i}".encode())
+        pdfs.append(pdf)
+    dup = tmp_path / "dup.pdf"
+    dup.write_bytes(b"%PDF-0")
+
+    with open_store() as store:
+        entries = [ingest_pdf(p, store=store) for p in [*pdfs, dup]]
+
+    assert [e is not None for e in entries] == [True, True, True, False]
+    assert len(log.read_text().splitlines()) == 3
+
+
+def test_failed_log_append_releases_claim(tmp_path: Path, monkeypatch) -> None:
+    log = tmp_path / "log.jsonl"
+    monkeypatch.setattr("ingest.collector.LOG_PATH", log)
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-a")
+
+    def broken(entry):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("ingest.collector.append_log", broken)
+    with open_store() as store:
+        with pytest.raises(OSError):
+            ingest_pdf(pdf, store=store)
+        assert len(store) == 0
+    monkeypatch.undo()
+    monkeypatch.setattr("ingest.collector.LOG_PATH", log)
+    assert ingest_pdf(pdf) is not None
+    assert len(log.read_text().splitlines()) == 1
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from extract.cleaning import clean_pages, read_clean_text, repeated_lines
+from extract.text_files import PageWriter
+
+
+def _paper() -> list[str]:
+    return [
+        "Mol Med (2023) 12:1-9\nA study of mTOR\ndoi:10.1/x\nAbstract\nWe studied it.",
+        "Mol Med (2023) 12:1-9\nMethods\nWe used GWAS data.\nPage 2 of 4",
+        "Mol Med (2023) 12:1-9\nResults\nThe effect was 0.3.\nPage 3 of 4",
+        "Mol Med (2023) 12:1-9\nReferences\n1. Smith J. Nature.\nPage 4 of 4",
+    ]
+
+
+def test_repeated_lines_ignore_page_numbers() -> None:
+    assert repeated_lines(_paper()) == {
+        "mol med (#) #:#-#",
+        "page # of #",
+    }
+
+
+def test_clean_pages_strips_headers_and_references() -> None:
+    pages, stats = clean_pages(_paper())
+    # The first page keeps its banner: it is part of the front matter.
+    assert pages[0] == _paper()[0]
+    assert pages[1] == "Methods\nWe used GWAS data."
+    assert pages[2] == "Results\nThe effect was 0.3."
+    assert pages[3] == ""
+    assert stats.boilerplate_chars > 0
+    assert stats.reference_chars == len("References\n1. Smith J. Nature.")
+    assert stats.tokens == -(-stats.chars // 4)
+
+
+def test_references_end_at_next_heading() -> None:
+    pages = [
+        "Intro",
+        "Methods\nGWAS.",
+        "References\n1. A.\nAcknowledgements\nThanks.",
+    ]
+    cleaned, stats = clean_pages(pages)
+    assert cleaned[2] == "Acknowledgements\nThanks."
+    assert stats.reference_chars == len("References\n1. A.\n")
+
+
+def test_early_references_heading_is_kept() -> None:
+    pages = ["References\nsee below", "Methods", "Results", "Discussion"]
+    cleaned, stats = clean_pages(pages)
+    assert cleaned == pages
+    assert stats.chars == 0
+
+
+def test_read_clean_text_selects_sections(tmp_path: Path) -> None:
+    path = tmp_path / "paper.jsonl"
+    with PageWriter(path) as writer:
+        for text in _paper():
+            writer.write(text)
+    text, stats = read_clean_text(path, ["methods"])
+    assert text == _paper()[0] + "\nMethods\nWe used GWAS data."
+    assert stats.chars > 0
+
+
+def test_numeric_table_cells_are_kept() -> None:
+    # A numeric column starts each page, with bare page numbers in the footer.
+    pages = [
+        "Title\nAbstract\nWe studied it.\n1",
+        "14\n9\n7\nTable 1 lists the SNPs per protein.\n2",
+        "9\n14\n7\nTable 2 lists the outcomes.\n3",
+        "7\n9\n15\nTable 3 lists the sensitivity analyses.\n4",
+    ]
+    cleaned, stats = clean_pages(pages)
+    assert cleaned[1] == "14\n9\n7\nTable 1 lists the SNPs per protein."
+    assert cleaned[2] == "9\n14\n7\nTable 2 lists the outcomes."
+    assert cleaned[3] == "7\n9\n15\nTable 3 lists the sensitivity analyses."
+    assert stats.boilerplate_chars == 3 * len("\n2")
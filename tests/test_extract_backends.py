@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from extract import backends
+from extract.manifest import config_fingerprint
+from extract.pdf_to_text import extract_text, extractor_config
+
+
+def create_pdf(path: Path, pages: int = 3) -> None:
+    c = canvas.Canvas(str(path), pagesize=letter)
+    for i in range(pages):
+        c.drawString(100, 750, f"Page {i + 1} text")
+        c.showPage()
+    c.save()
+
+
+@pytest.mark.parametrize("name", sorted(backends.BACKENDS))
+def test_backends_extract_every_page(tmp_path: Path, name: str) -> None:
+    pdf = tmp_path / "doc.pdf"
+    create_pdf(pdf)
+    backend = backends.get_backend(name)
+
+    assert isinstance(backend, backends.TextBackend)
+    assert backend.page_count(pdf) == 3
+    assert backend.extract(pdf) == ["Page 1 text", "Page 2 text", "Page 3 text"]
+    assert backend.extract(pdf, [0, 2]) == ["Page 1 text", "Page 3 text"]
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+        backends.get_backend("nope")
+
+
+def test_blank_pages_fall_back_to_other_backend(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pdf = tmp_path / "doc.pdf"
+    create_pdf(pdf)
+    original = backends.PdfminerBackend.iter_extract
+
+    def lossy(self, pdf_path, page_numbers=None):
+        for text in original(self, pdf_path, page_numbers):
+            yield "" if text == "Page 2 text" else text
+
+    monkeypatch.setattr(backends.PdfminerBackend, "iter_extract", lossy)
+
+    assert extract_text(pdf, fallback=False)[1] == ""
+    assert extract_text(pdf) == ["Page 1 text", "Page 2 text", "Page 3 text"]
+
+
+def test_blank_pages_fall_back_in_one_call(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pdf = tmp_path / "doc.pdf"
+    create_pdf(pdf, pages=4)
+    original = backends.PdfiumBackend.extract
+    calls = []
+
+    def blank(self, pdf_path, page_numbers=None):
+        yield from ["Page 1 text", "", "", "Page 4 text"]
+
+    def counted(self, pdf_path, page_numbers=None):
+        calls.append(page_numbers)
+        return original(self, pdf_path, page_numbers)
+
+    monkeypatch.setattr(backends.PdfminerBackend, "iter_extract", blank)
+    monkeypatch.setattr(backends.PdfiumBackend, "extract", counted)
+
+    assert extract_text(pdf) == [f"Page {i} text" for i in range(1, 5)]
+    assert calls == [[1, 2]]
+
+
+def test_backend_is_part_of_extractor_config() -> None:
+    pdfminer = config_fingerprint(extractor_config(backend="pdfminer"))
+    pdfium = config_fingerprint(extractor_config(backend="pdfium"))
+    assert pdfminer != pdfium
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import orjson
+import pytest
+
+from extract import benchmark
+from extract.pdf_to_text import extract_text
+
+SAMPLES = sorted(Path("tests/fixtures/sample_pdfs").glob("*.pdf"))
+
+
+def test_profiles_produce_text() -> None:
+    for profile in ("accurate", "fast", "raw"):
+        texts = extract_text(SAMPLES[0], profile=profile)
+        assert texts and any(texts)
+
+
+def test_unknown_profile() -> None:
+    with pytest.raises(ValueError):
+        extract_text(SAMPLES[0], profile="nope")
+
+
+def test_benchmark_reports_each_profile(tmp_path: Path) -> None:
+    out = tmp_path / "bench.json"
+    code = benchmark.main(
+        [
+            "--pdf-dir",
+            "tests/fixtures/sample_pdfs",
+            "--backends",
+            "pdfminer",
+            "--profiles",
+            "fast",
+            "accurate",
+            "--json",
+            str(out),
+        ]
+    )
+    assert code == 0
+    results = {r["profile"]: r for r in orjson.loads(out.read_bytes())}
+    assert set(results) == {"fast", "accurate"}
+    assert results["accurate"]["similarity"] == 100.0
+    assert results["fast"]["pages"] == results["accurate"]["pages"] > 0
+    assert results["fast"]["pages_per_sec"] > 0
+
+
+def test_benchmark_reports_each_backend(tmp_path: Path) -> None:
+    out = tmp_path / "bench.json"
+    code = benchmark.main(
+        [
+            "--pdf-dir",
+            "tests/fixtures/sample_pdfs",
+            "--backends",
+            "pdfium",
+            "--json",
+            str(out),
+        ]
+    )
+    assert code == 0
+    (result,) = orjson.loads(out.read_bytes())
+    assert result["backend"] == "pdfium"
+    assert result["profile"] is None
+    assert result["pages"] > 0
+    assert result["peak_rss_mb"] > 0
+    assert 0 < result["similarity"] <= 100
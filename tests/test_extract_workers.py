@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import pipeline
+from extract.quarantine import Quarantine, main as quarantine_main
+from extract.workers import WorkerLimits, retry_configs, run_isolated
+
+
+def double(x: int) -> int:
+    return 2 * x
+
+
+def sleep_forever() -> None:
+    time.sleep(60)
+
+
+def fail() -> None:
+    raise ValueError("bad xref table")
+
+
+def crash() -> None:
+    os._exit(3)
+
+
+def hog_memory() -> None:
+    block = bytearray(300 * 1024 * 1024)
+    block[::4096] = b"x" * len(block[::4096])
+    time.sleep(60)
+
+
+def test_run_isolated_returns_values_in_order() -> None:
+    outcomes = run_isolated([(double, (i,)) for i in range(5)], workers=3)
+    assert [o.value for o in outcomes] == [0, 2, 4, 6, 8]
+    assert all(o.ok for o in outcomes)
+
+
+def test_run_isolated_contains_failures() -> None:
+    limits = WorkerLimits(timeout=1, max_rss_mb=None)
+    outcomes = run_isolated(
+        [(sleep_forever, ()), (fail, ()), (crash, ()), (double, (4,))],
+        workers=4,
+        limits=limits,
+    )
+    assert outcomes[0].error == "timed out after 1s"
+    assert "bad xref table" in outcomes[1].error
+    assert outcomes[2].error == "worker exited with code 3"
+    assert outcomes[3].value == 8
+    assert outcomes[0].seconds < 5
+
+
+def test_run_isolated_enforces_memory_cap() -> None:
+    pytest.importorskip("psutil")
+    limits = WorkerLimits(timeout=30, max_rss_mb=200)
+    (outcome,) = run_isolated([(hog_memory, ())], limits=limits)
+    assert "over the 200 MB cap" in outcome.error
+
+
+def test_retry_configs() -> None:
+    assert retry_configs("accurate", "pdfminer") == [
+        ("accurate", "pdfminer"),
+        ("fast", "pdfminer"),
+        ("accurate", "pdfium"),
+    ]
+    assert retry_configs("fast", "pdfminer") == [
+        ("fast", "pdfminer"),
+        ("fast", "pdfium"),
+    ]
+    assert retry_configs("accurate", "pdfium") == [("accurate", "pdfium")]
+
+
+def test_extract_texts_retries_with_cheaper_config(monkeypatch, tmp_path) -> None:
+    def fake_extract(pdf_path, out_dir, page_jobs, profile, backend, *rest):
+        if profile == "accurate":
+            time.sleep(60)
+        out = out_dir / f"{pdf_path.stem}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(f'{{"backend": "{backend}/{profile}"}}')
+        return out
+
+    monkeypatch.setattr(pipeline, "_extract_one", fake_extract)
+    stats = pipeline.ExtractionStats()
+    results = pipeline.extract_texts(
+        [tmp_path / "slow.pdf"],
+        tmp_path / "text",
+        limits=WorkerLimits(timeout=0.5, max_rss_mb=None),
+        stats=stats,
+    )
+    assert results == [tmp_path / "text" / "slow.json"]
+    assert "pdfminer/fast" in results[0].read_text()
+    assert stats.degraded == ["slow.pdf"]
+
+
+def test_hanging_triage_is_killed(monkeypatch, tmp_path) -> None:
+    def fake_extract(pdf_path, out_dir, *rest):
+        out = out_dir / f"{pdf_path.stem}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text('{"pages": []}')
+        return out
+
+    monkeypatch.setattr(pipeline, "triage_pdf", lambda pdf_path: sleep_forever())
+    monkeypatch.setattr(pipeline, "TRIAGE_TIMEOUT", 0.5)
+    monkeypatch.setattr(pipeline, "_extract_one", fake_extract)
+    stats = pipeline.ExtractionStats()
+    start = time.monotonic()
+    results = pipeline.extract_texts(
+        [tmp_path / "hangs.pdf"], tmp_path / "text", stats=stats
+    )
+    assert time.monotonic() - start < 10
+    assert results == [tmp_path / "text" / "hangs.json"]
+    assert stats.triage == {}
+
+
+def test_degraded_text_is_not_recorded(monkeypatch, tmp_path) -> None:
+    def fake_extract(pdf_path, out_dir, page_jobs, profile, backend, *rest):
+        if profile == "accurate":
+            time.sleep(60)
+        out = out_dir / f"{pdf_path.stem}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text('{"pages": []}')
+        return out
+
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    (pdf_dir / "slow.pdf").write_bytes(b"%PDF-1.4 slow")
+    monkeypatch.setattr("ingest.collector.LOG_PATH", tmp_path / "log.jsonl")
+    monkeypatch.setattr(pipeline, "_extract_one", fake_extract)
+    dirs = pipeline.make_dirs(tmp_path)
+    limits = WorkerLimits(timeout=0.5, max_rss_mb=None)
+
+    for _ in range(2):
+        stats = pipeline.ExtractionStats()
+        pipeline.ingest_pdfs(
+            str(pdf_dir),
+            dirs,
+            limits=limits,
+            near_duplicate_threshold=None,
+            stats=stats,
+        )
+        assert (stats.hits, stats.misses) == (0, 1)
+        assert stats.degraded == ["slow.pdf"]
+
+
+def test_failed_pdfs_are_quarantined_and_skipped(monkeypatch, tmp_path) -> None:
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    (pdf_dir / "broken.pdf").write_bytes(b"not a pdf")
+    monkeypatch.setattr("ingest.collector.LOG_PATH", tmp_path / "log.jsonl")
+    dirs = pipeline.make_dirs(tmp_path)
+
+    first = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=first)
+    assert first.failed == ["broken.pdf"]
+    assert len(first.errors["broken.pdf"]) == 3
+
+    quarantine = Quarantine(dirs.quarantine)
+    assert len(quarantine) == 1
+    assert "broken.pdf" in quarantine.report()
+
+    second = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=second)
+    assert (second.misses, second.quarantined) == (0, ["broken.pdf"])
+
+    assert quarantine_main([str(tmp_path), "--release"]) == 0
+    assert len(Quarantine(dirs.quarantine)) == 0
+
+
+def test_quarantine_release_by_name(tmp_path: Path) -> None:
+    quarantine = Quarantine(tmp_path / "q.json")
+    quarantine.add("md5a", "a.pdf", ["timed out"])
+    quarantine.add("md5b", "b.pdf", ["exit code -9"])
+    assert quarantine.release(["a.pdf"]) == ["a.pdf"]
+    assert "md5b" in quarantine and "md5a" not in quarantine
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import ingest.hashing as hashing
+from ingest.checksum_store import ChecksumStore
+from ingest.hashing import digest_file, hash_files
+
+
+def test_digest_file_matches_md5(tmp_path: Path) -> None:
+    path = tmp_path / "a.pdf"
+    data = os.urandom(3 * hashing.HASH_BUFFER_SIZE + 17)
+    path.write_bytes(data)
+
+    digest = digest_file(path, fast=True)
+
+    assert digest.md5 == hashlib.md5(data).hexdigest()
+    assert digest.fast and ":" in digest.fast
+    assert digest_file(path).md5 == digest.md5
+    assert digest_file(path).fast is None
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path: Path, monkeypatch) -> None:
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"{i}.pdf"
+        path.write_bytes(f"pdf {i}".encode())
+        paths.append(path)
+
+    calls: list[Path] = []
+    real = hashing.digest_file
+
+    def counting(path, *, fast=False):
+        calls.append(path)
+        return real(path, fast=fast)
+
+    monkeypatch.setattr(hashing, "digest_file", counting)
+
+    with ChecksumStore(tmp_path / "log.jsonl") as store:
+        first = hash_files(paths, store=store)
+    assert len(calls) == 4
+
+    calls.clear()
+    paths[0].write_bytes(b"changed contents")
+    with ChecksumStore(tmp_path / "log.jsonl") as store:
+        second = hash_files(paths, store=store)
+
+    assert calls == [paths[0]]
+    assert second[paths[1]] == first[paths[1]]
+    assert second[paths[0]].md5 == hashlib.md5(b"changed contents").hexdigest()
+
+
+def test_fast_hash_requested_after_md5_only_cache(tmp_path: Path) -> None:
+    path = tmp_path / "a.pdf"
+    path.write_bytes(b"pdf")
+    with ChecksumStore(tmp_path / "log.jsonl") as store:
+        assert hash_files([path], store=store)[path].fast is None
+        assert hash_files([path], store=store, fast=True)[path].fast
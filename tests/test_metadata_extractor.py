@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import types
 from pathlib import Path
@@ -98,3 +99,95 @@ def test_extract_fail(tmp_path, monkeypatch):
     assert result is None
     assert client.calls == 2
     assert not list((tmp_path / "meta").glob("*.json"))
+
+
+def test_extract_streamed_text_file(tmp_path, monkeypatch):
+    from agent1.metadata_extractor import MetadataExtractor
+    from extract.text_files import PageWriter
+
+    text_path = tmp_path / "test.jsonl"
+    with PageWriter(text_path) as writer:
+        writer.write("first page")
+        writer.write("second page")
+    monkeypatch.setattr("agent1.metadata_extractor.META_DIR", tmp_path / "meta")
+    extractor = MetadataExtractor(client=FakeClient([valid_data()]))
+
+    assert extractor._load_text(text_path) == ("first page\nsecond page", text_path)
+    assert extractor.extract(text_path, "Drug") is not None
+    assert (tmp_path / "10.1_abc.jsonl").exists()
+    assert not text_path.exists()
+
+
+def test_load_text_sends_configured_sections(tmp_path, monkeypatch):
+    from agent1.metadata_extractor import RECOMMENDED_SECTIONS, MetadataExtractor
+
+    pages = [
+        "Title\ndoi:10.1/abc",
+        "Methods\nGWAS of 10k people.\nReferences\n1. Smith J.",
+    ]
+    text_path = tmp_path / "paper.json"
+    text_path.write_bytes(
+        orjson.dumps(
+            {"pages": [{"page": i + 1, "text": t} for i, t in enumerate(pages)]}
+        )
+    )
+    monkeypatch.setattr("agent1.metadata_extractor.META_DIR", tmp_path / "meta")
+
+    filtered = MetadataExtractor(client=FakeClient([]), sections=RECOMMENDED_SECTIONS)
+    text, _ = filtered._load_text(text_path)
+    assert text == "Title\ndoi:10.1/abc\nMethods\nGWAS of 10k people."
+    raw = MetadataExtractor(client=FakeClient([]), clean=False)
+    assert raw._load_text(text_path)[0] == "\n".join(pages)
+    cleaned = MetadataExtractor(client=FakeClient([]))
+    assert not cleaned._load_text(text_path)[0].endswith("Smith J.")
+
+
+def test_long_text_is_extracted_in_windows(tmp_path, monkeypatch):
+    from agent1.metadata_extractor import MetadataExtractor
+
+    monkeypatch.setattr("agent1.metadata_extractor.META_DIR", tmp_path / "meta")
+    front = "Title line\ndoi 10.1/abc"
+    methods = "\n".join(["UK Biobank GWAS summary statistics were used."] * 20)
+    results = "\n".join(["FinnGen replication with clumping at r2 0.001."] * 20)
+
+    class WindowClient:
+        def __init__(self):
+            self.texts = []
+
+        def call(self, text, *, max_retries=2):
+            self.texts.append(text)
+            data = valid_data() if "doi" in text else {}
+            if "UK Biobank" in text:
+                data.update(data_sources=["UK Biobank"], additional_QC="MAF > 0.01")
+            if "FinnGen" in text:
+                data.update(data_sources=["FinnGen", "uk biobank"], ld_r2="0.001")
+            return data
+
+        async def acall(self, text, *, max_retries=2):
+            return self.call(text)
+
+    client = WindowClient()
+    extractor = MetadataExtractor(client=client, window_tokens=200)
+    result = extractor.extract("\n".join([front, methods, results]), "Drug")
+
+    assert len(client.texts) > 1
+    assert client.texts[0].startswith(front)
+    assert result.doi == "10.1/abc"
+    assert result.data_sources == ["UK Biobank", "FinnGen"]
+    assert (result.ld_r2, result.additional_QC) == ("0.001", "MAF > 0.01")
+    assert result.targets == ["Drug"]
+    text = "\n".join([front, methods, results])
+    assert asyncio.run(extractor.aextract(text, "Drug")) == result
+
+
+def test_merge_metadata_is_order_deterministic():
+    from agent1.metadata_extractor import merge_metadata
+    from schemas.metadata import PaperMetadata
+
+    first = PaperMetadata(title="A", additional_QC="MAF filter")
+    second = PaperMetadata(title="B", omics_modalities=["pQTL"], additional_QC="F>10")
+    merged = merge_metadata([first, None, second])
+    assert merged.title == "A"
+    assert merged.omics_modalities == ["pQTL"]
+    assert merged.additional_QC == "MAF filter; F>10"
+    assert merge_metadata([None, None]) is None
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import pipeline
+from ingest.near_duplicates import NearDuplicateIndex, main, minhash, similarity
+
+VOCABULARY = [f"w{i}" for i in range(500)]
+
+
+def paper(seed: int, words: int = 400) -> list[str]:
+    rng = random.Random(seed)
+    return [rng.choice(VOCABULARY) for _ in range(words)]
+
+
+def create_pdf(path: Path, words: list[str]) -> None:
+    c = canvas.Canvas(str(path), pagesize=letter)
+    y = 750
+    for start in range(0, len(words), 12):
+        c.drawString(72, y, " ".join(words[start : start + 12]))
+        y -= 14
+        if y < 72:
+            c.showPage()
+            y = 750
+    c.save()
+
+
+def test_minhash_similarity() -> None:
+    original = paper(1)
+    edited = original[:40] + original[60:] + ["new", "closing", "words"]
+    a, b, c = (minhash(" ".join(w)) for w in (original, edited, paper(2)))
+    assert similarity(a, b) > 0.7
+    assert similarity(a, c) < 0.1
+    assert minhash("") is None
+
+
+def test_index_links_near_duplicates(tmp_path: Path) -> None:
+    text = " ".join(paper(1))
+    with NearDuplicateIndex(tmp_path / "nd.sqlite3") as index:
+        assert index.check("md5a", "a.pdf", text) is None
+        assert index.check("md5c", "c.pdf", " ".join(paper(2))) is None
+        match = index.check("md5b", "b.pdf", text.upper())
+        assert (match.md5, match.source, match.similarity) == ("md5a", "a.pdf", 1.0)
+        assert index.duplicate_of("md5b") == "a.pdf"
+        assert index.duplicate_of("md5c") is None
+        assert index.check("md5b", "b.pdf", text) is None
+        # Linked papers are not indexed, so they never become originals.
+        assert index.check("md5d", "d.pdf", text).md5 == "md5a"
+        # Only the given originals can match.
+        assert index.check("md5e", "e.pdf", text, originals={"md5c"}) is None
+    assert main([str(tmp_path)]) == 0
+
+
+def test_new_version_does_not_match_itself(tmp_path: Path) -> None:
+    text = " ".join(paper(1))
+    with NearDuplicateIndex(tmp_path / "nd.sqlite3") as index:
+        assert index.check("old", "a.pdf", text) is None
+        assert index.check("new", "a.pdf", text + " erratum") is None
+        assert "old" not in index
+        assert index.check("copy", "b.pdf", text).md5 == "new"
+
+
+def test_ingest_skips_near_duplicates(monkeypatch, tmp_path: Path) -> None:
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    original = paper(1)
+    create_pdf(pdf_dir / "a.pdf", original)
+    create_pdf(pdf_dir / "b.pdf", ["Preprint"] + original[:-20])
+    create_pdf(pdf_dir / "c.pdf", paper(2))
+    monkeypatch.setattr("ingest.collector.LOG_PATH", tmp_path / "log.jsonl")
+    dirs = pipeline.make_dirs(tmp_path)
+
+    first = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=first)
+    assert first.near_duplicates == {"b.pdf": "a.pdf"}
+    assert sorted(p.name for p in dirs.text.glob("*.json")) == ["a.json", "c.json"]
+    assert (dirs.text / "duplicates" / "b.json").exists()
+
+    # Papers indexed by the first run are not read and cleaned again.
+    read = []
+    real_read = pipeline.read_clean_text
+    monkeypatch.setattr(
+        pipeline, "read_clean_text", lambda p: read.append(p) or real_read(p)
+    )
+    second = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=second)
+    assert (second.hits, second.misses) == (2, 0)
+    assert second.near_duplicates == {"b.pdf": "a.pdf"}
+    assert read == []
+
+    third = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, near_duplicate_threshold=0, stats=third)
+    assert (third.misses, third.near_duplicates) == (1, {})
+
+
+def test_replaced_pdf_is_not_its_own_duplicate(monkeypatch, tmp_path: Path) -> None:
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    original = paper(1)
+    create_pdf(pdf_dir / "a.pdf", original)
+    monkeypatch.setattr("ingest.collector.LOG_PATH", tmp_path / "log.jsonl")
+    dirs = pipeline.make_dirs(tmp_path)
+    pipeline.ingest_pdfs(str(pdf_dir), dirs)
+
+    create_pdf(pdf_dir / "a.pdf", original[:-10] + ["erratum"])
+    stats = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=stats)
+    assert stats.misses == 1
+    assert stats.near_duplicates == {}
+    assert (dirs.text / "a.json").exists()
+    assert not (dirs.text / "duplicates").exists()
+
+
+def test_duplicate_of_removed_pdf_is_extracted(monkeypatch, tmp_path: Path) -> None:
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    original = paper(1)
+    create_pdf(pdf_dir / "a.pdf", original)
+    create_pdf(pdf_dir / "b.pdf", ["Preprint"] + original[:-20])
+    monkeypatch.setattr("ingest.collector.LOG_PATH", tmp_path / "log.jsonl")
+    dirs = pipeline.make_dirs(tmp_path)
+    pipeline.ingest_pdfs(str(pdf_dir), dirs)
+
+    (pdf_dir / "a.pdf").unlink()
+    stats = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=stats)
+    assert stats.near_duplicates == {}
+    assert (dirs.text / "b.json").exists()
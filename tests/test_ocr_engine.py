@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PIL import Image
+
+from extract.ocr_engine import TesseractEngine
+
+
+def images(count: int) -> list[Image.Image]:
+    return [Image.new("L", (10 + i, 20), "white") for i in range(count)]
+
+
+def test_batches_keep_order(fake_tesseract: Path) -> None:
+    with TesseractEngine(workers=2, batch_size=3) as engine:
+        texts = list(engine.recognize(iter(images(7))))
+
+    assert texts == [f"ocr {10 + i}x20" for i in range(7)]
+    calls = sorted(Path(f"{fake_tesseract}.calls").read_text().split())
+    assert calls == ["1", "3", "3"]
+
+
+def test_stats_report_per_page_latency(fake_tesseract: Path) -> None:
+    engine = TesseractEngine(batch_size=2)
+    list(engine.recognize(images(4)))
+    engine.close()
+
+    summary = engine.stats.summary()
+    assert summary["pages"] == 4
+    assert summary["batches"] == 2
+    assert 0 < summary["p50"] <= summary["p95"] <= summary["max"]
+
+
+def test_empty_input() -> None:
+    engine = TesseractEngine()
+    assert list(engine.recognize([])) == []
+    engine.close()
+    assert engine.stats.summary() == {"pages": 0, "batches": 0}
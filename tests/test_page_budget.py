@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from extract.page_budget import PageBudget
+from extract.pdf_to_text import complete_pages, pdf_to_pages, pdf_to_text
+from extract.text_files import iter_pages, read_meta
+
+
+def create_paper_pdf(path: Path, lines: list[str]) -> None:
+    c = canvas.Canvas(str(path), pagesize=letter)
+    for line in lines:
+        c.drawString(100, 750, line)
+        c.showPage()
+    c.save()
+
+
+PAGES = ["Title page", "Introduction", "Statistical analysis", "Results", "End"]
+
+
+def test_select_first_pages_and_methods_headings(tmp_path: Path) -> None:
+    pdf = tmp_path / "paper.pdf"
+    create_paper_pdf(pdf, PAGES)
+    assert PageBudget(first=2).select(pdf) == [0, 1, 2]
+    assert PageBudget(first=10).select(pdf) == [0, 1, 2, 3, 4]
+
+
+def test_prose_mentions_do_not_count(tmp_path: Path) -> None:
+    pdf = tmp_path / "paper.pdf"
+    create_paper_pdf(pdf, ["Title", "methods were compared"])
+    assert PageBudget(first=1).select(pdf) == [0]
+
+
+def test_lazy_json_defers_and_completes(tmp_path: Path) -> None:
+    pdf = tmp_path / "paper.pdf"
+    create_paper_pdf(pdf, PAGES)
+    result = pdf_to_text(pdf, out_dir=tmp_path / "text", budget=PageBudget(first=1))
+    assert [p.text for p in result.pages] == ["Title page", "", PAGES[2], "", ""]
+    assert result.lazy is not None and result.lazy.deferred == [2, 4, 5]
+
+    path = tmp_path / "text" / "paper.json"
+    assert complete_pages(path)
+    assert [p["text"] for p in iter_pages(path)] == PAGES
+    assert read_meta(path)["lazy"] is None
+    assert not complete_pages(path)
+
+
+@pytest.mark.parametrize("text_format", ["jsonl", "pages"])
+def test_lazy_streamed_formats(tmp_path: Path, text_format: str) -> None:
+    pdf = tmp_path / "paper.pdf"
+    create_paper_pdf(pdf, PAGES)
+    path = pdf_to_pages(
+        pdf, out_dir=tmp_path, text_format=text_format, budget=PageBudget(first=2)
+    )
+    assert read_meta(path)["lazy"]["deferred"] == [4, 5]
+    assert [p["text"] for p in iter_pages(path)][3:] == ["", ""]
+
+    assert complete_pages(path)
+    assert [p["text"] for p in iter_pages(path)] == PAGES
+    assert not read_meta(path)["lazy"]
+
+
+def test_missing_source_keeps_partial_text(tmp_path: Path) -> None:
+    pdf = tmp_path / "paper.pdf"
+    create_paper_pdf(pdf, PAGES)
+    pdf_to_text(pdf, out_dir=tmp_path / "text", budget=PageBudget(first=1))
+    pdf.unlink()
+    path = tmp_path / "text" / "paper.json"
+    assert not complete_pages(path)
+    assert read_meta(path)["lazy"]["deferred"] == [2, 4, 5]
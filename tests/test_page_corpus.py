@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+
+import pytest
+
+from extract import page_corpus
+from extract.page_corpus import CorpusWriter, PageCorpus
+
+PAGES = ["first page", "", "dritte Seite – ünïcode", "fourth\nwith newline", "5"]
+
+
+def write(path: Path, pages: list[str], **options) -> Path:
+    with CorpusWriter(path, **options) as writer:
+        for text in pages:
+            writer.write(text)
+    return path
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib"])
+def test_round_trip(tmp_path: Path, codec: str) -> None:
+    path = write(tmp_path / "doc.pages", PAGES, codec=codec, block_pages=2)
+    with PageCorpus(path) as corpus:
+        assert len(corpus) == len(PAGES)
+        assert list(corpus) == PAGES
+        assert corpus.page(3) == PAGES[3]
+        assert corpus.text() == "\n".join(PAGES)
+        assert corpus.codec_name == codec
+        assert [p["page"] for p in corpus.iter_pages()] == [1, 2, 3, 4, 5]
+
+
+def test_uncompressed_pages_are_views_of_the_mapping(tmp_path: Path) -> None:
+    path = write(tmp_path / "doc.pages", PAGES)
+    with PageCorpus(path) as corpus:
+        view = corpus.page_bytes(0)
+        assert isinstance(view.obj, mmap.mmap)
+        assert bytes(view) == b"first page"
+        view.release()
+
+
+def test_empty_corpus(tmp_path: Path) -> None:
+    path = write(tmp_path / "empty.pages", [], codec="zlib")
+    with PageCorpus(path) as corpus:
+        assert len(corpus) == 0
+        assert corpus.text() == ""
+        with pytest.raises(IndexError):
+            corpus.page(0)
+
+
+def test_partial_output_is_discarded(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError):
+        with CorpusWriter(tmp_path / "doc.pages") as writer:
+            writer.write("page")
+            raise RuntimeError("boom")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "doc.pages"
+    path.write_bytes(b"{" + b" " * 64 + b"}")
+    with pytest.raises(ValueError):
+        PageCorpus(path)
+
+
+def test_zstd_requires_zstandard(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(page_corpus, "zstandard", None)
+    with pytest.raises(RuntimeError):
+        CorpusWriter(tmp_path / "doc.pages", codec="zstd")
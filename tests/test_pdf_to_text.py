@@ -57,3 +57,100 @@ def test_no_tesseract(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
 
     result = pdf_to_text(pdf)
     assert len(result.pages) == 1
+
+
+def test_page_range_split_keeps_order(tmp_path: Path) -> None:
+    from extract.pdf_to_text import count_pages, extract_text
+
+    pdf = tmp_path / "long.pdf"
+    create_digital_pdf(pdf, pages=7)
+
+    assert count_pages(pdf) == 7
+    sequential = extract_text(pdf)
+    split = extract_text(pdf, page_workers=3, split_threshold=5, pages_per_range=2)
+    assert split == sequential
+    assert split[6] == "Page 7 text"
+
+
+def test_only_blank_pages_are_ocred(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fake_tesseract: Path
+) -> None:
+    monkeypatch.setattr("extract.pdf_to_text.DATA_DIR", tmp_path)
+
+    pdf = tmp_path / "mixed.pdf"
+    c = canvas.Canvas(str(pdf), pagesize=letter)
+    c.drawString(100, 750, "Digital page")
+    c.showPage()
+    c.showPage()
+    c.drawString(100, 750, "Another digital page")
+    c.showPage()
+    c.save()
+
+    result = pdf_to_text(pdf)
+
+    texts = [p.text for p in result.pages]
+    assert texts[0] == "Digital page"
+    assert texts[2] == "Another digital page"
+    # one letter-sized page rendered at 300 DPI
+    assert texts[1] in {f"ocr {w}x{h}" for w in (2550, 2551) for h in (3300, 3301)}
+
+
+def test_ocr_results_are_cached(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fake_tesseract: Path
+) -> None:
+    monkeypatch.setattr("extract.pdf_to_text.DATA_DIR", tmp_path)
+    first = tmp_path / "scan.pdf"
+    create_scanned_pdf(first)
+    duplicate = tmp_path / "copy.pdf"
+    duplicate.write_bytes(first.read_bytes())
+    calls = Path(f"{fake_tesseract}.calls")
+
+    a = pdf_to_text(first)
+    assert calls.read_text().split() == ["1"]
+
+    b = pdf_to_text(duplicate)
+    assert calls.read_text().split() == ["1"]
+    assert a.pages[0].text == b.pages[0].text
+
+    monkeypatch.setattr("pytesseract.get_tesseract_version", lambda: "6.0")
+    pdf_to_text(duplicate)
+    assert calls.read_text().split() == ["1", "1"]
+
+
+def test_streamed_pages_match_whole_document(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fake_tesseract: Path
+) -> None:
+    from extract.pdf_to_text import pdf_to_pages
+    from extract.text_files import iter_pages
+
+    monkeypatch.setattr("extract.pdf_to_text.DATA_DIR", tmp_path)
+    pdf = tmp_path / "mixed.pdf"
+    c = canvas.Canvas(str(pdf), pagesize=letter)
+    c.drawString(100, 750, "Digital page")
+    c.showPage()
+    c.showPage()
+    c.save()
+
+    whole = pdf_to_text(pdf)
+    path = pdf_to_pages(pdf)
+
+    assert path == tmp_path / "mixed.jsonl"
+    assert not (tmp_path / "mixed.json").exists()
+    streamed = list(iter_pages(path))
+    assert streamed == [p.model_dump() for p in whole.pages]
+    assert streamed[1]["text"].startswith("ocr ")
+
+
+def test_pages_corpus_output(tmp_path: Path) -> None:
+    from extract.pdf_to_text import pdf_to_pages
+    from extract.text_files import read_text
+
+    pdf = tmp_path / "doc.pdf"
+    create_digital_pdf(pdf, pages=3)
+    pdf_to_text(pdf, out_dir=tmp_path)
+
+    path = pdf_to_pages(pdf, out_dir=tmp_path, text_format="pages")
+
+    assert path == tmp_path / "doc.pages"
+    assert not (tmp_path / "doc.json").exists()
+    assert read_text(path) == "Page 1 text\nPage 2 text\nPage 3 text"
@@ -200,3 +200,110 @@ def test_batch_token_split(monkeypatch, tmp_path):
     batches = pipeline.write_agent1_batch("drug", tmp_path, token_limit=100)
     assert len(batches) == 2
     assert all(p.exists() for p in batches)
+
+
+def test_extract_texts_parallel_isolates_failures(tmp_path):
+    pdfs = []
+    for name in ("a", "b", "c"):
+        pdf = tmp_path / f"{name}.pdf"
+        create_pdf(pdf)
+        pdfs.append(pdf)
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    pdfs.insert(1, broken)
+
+    out_dir = tmp_path / "text"
+    results = pipeline.extract_texts(pdfs, out_dir, jobs=2)
+
+    assert results == [
+        out_dir / "a.json",
+        None,
+        out_dir / "b.json",
+        out_dir / "c.json",
+    ]
+    assert all(p.exists() for p in results if p is not None)
+
+
+def test_ingest_skips_unchanged_pdfs(monkeypatch, tmp_path):
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    create_pdf(pdf_dir / "a.pdf")
+    create_pdf(pdf_dir / "b.pdf")
+    monkeypatch.setattr("ingest.collector.LOG_PATH", tmp_path / "log.jsonl")
+    dirs = pipeline.make_dirs(tmp_path)
+
+    first = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=first)
+    assert (first.hits, first.misses) == (0, 2)
+
+    calls = []
+    monkeypatch.setattr(
+        "extract.pdf_to_text.pdf_to_text", lambda *a, **k: calls.append(a)
+    )
+    second = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=second)
+    assert (second.hits, second.misses) == (2, 0)
+    assert calls == []
+
+    # A renamed artifact is still found.
+    (dirs.text / "a.json").rename(dirs.text / "10.1_a.json")
+    manifest = pipeline.ExtractionManifest(dirs.manifest, dirs.text)
+    manifest.relocate("a.json", "10.1_a.json")
+    manifest.save()
+    third = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=third)
+    assert (third.hits, third.misses) == (2, 0)
+    assert calls == []
+
+    # A changed config is a miss.
+    monkeypatch.setattr("extract.pdf_to_text.EXTRACTOR_VERSION", "next")
+    fourth = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(pdf_dir), dirs, stats=fourth)
+    assert (fourth.hits, fourth.misses) == (0, 2)
+
+
+def test_metadata_step_relocates_manifest_entries(monkeypatch, tmp_path):
+    text_dir = tmp_path / "text"
+    text_dir.mkdir()
+    (text_dir / "paper.json").write_text('{"pages":[{"page":1,"text":"x"}]}')
+    manifest = pipeline.ExtractionManifest(
+        tmp_path / "extraction_manifest.json", text_dir
+    )
+    manifest.record("md5", "cfg", text_dir / "paper.json", "paper.pdf")
+    manifest.save()
+
+    class RenamingExtractor:
+        def extract(self, path, drug):
+            path.rename(path.with_name("10.1_test.json"))
+            return PaperMetadata(**valid_metadata())
+
+    monkeypatch.setattr("pipeline.TEXT_DIR", text_dir)
+    monkeypatch.setattr(
+        "pipeline.MetadataExtractor", lambda *a, **k: RenamingExtractor()
+    )
+    pipeline.extract_metadata_from_text("drug")
+
+    reloaded = pipeline.ExtractionManifest(manifest.path, text_dir)
+    assert reloaded.lookup("md5", "cfg") == text_dir / "10.1_test.json"
+
+
+def test_metadata_step_runs_concurrently(monkeypatch, tmp_path):
+    text_dir = tmp_path / "text"
+    text_dir.mkdir()
+    for name in ("a", "b", "c"):
+        (text_dir / f"{name}.json").write_text('{"pages":[{"page":1,"text":"x"}]}')
+
+    class AsyncExtractor:
+        def extract(self, path, drug):
+            raise AssertionError("the sync path should not run")
+
+        async def aextract_many(self, paths, drug, *, concurrency):
+            assert concurrency == 4
+            for path in reversed(paths):
+                meta = None if path.stem == "b" else PaperMetadata(**valid_metadata())
+                yield path, meta
+
+    monkeypatch.setattr("pipeline.TEXT_DIR", text_dir)
+    monkeypatch.setattr("pipeline.MetadataExtractor", lambda *a, **k: AsyncExtractor())
+    results = pipeline.extract_metadata_from_text("drug", concurrency=4)
+    assert [p.stem for p in results] == ["c", "a"]
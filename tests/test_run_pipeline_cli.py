@@ -18,6 +18,21 @@ def test_main_invokes_pipeline(monkeypatch):
         embed_model: str | None,
         retrieval_method: str,
         batch: bool,
+        jobs: int,
+        page_jobs: int,
+        ocr_jobs: int,
+        profile: str,
+        backend: str,
+        text_format: str,
+        sections: list[str] | None,
+        lazy_pages: int | None,
+        extract_timeout: float | None,
+        extract_max_rss_mb: float | None,
+        near_duplicate_threshold: float | None,
+        shared_store: Path | None,
+        concurrency: int,
+        llm_cache: bool,
+        window_tokens: int | None,
     ) -> None:
         calls["pdf_dir"] = pdf_dir
         calls["drug"] = drug
@@ -27,6 +42,21 @@ def test_main_invokes_pipeline(monkeypatch):
         calls["embed_model"] = embed_model
         calls["retrieval_method"] = retrieval_method
         calls["batch"] = batch
+        calls["jobs"] = jobs
+        calls["page_jobs"] = page_jobs
+        calls["ocr_jobs"] = ocr_jobs
+        calls["profile"] = profile
+        calls["backend"] = backend
+        calls["text_format"] = text_format
+        calls["sections"] = sections
+        calls["lazy_pages"] = lazy_pages
+        calls["extract_timeout"] = extract_timeout
+        calls["extract_max_rss_mb"] = extract_max_rss_mb
+        calls["near_duplicate_threshold"] = near_duplicate_threshold
+        calls["shared_store"] = shared_store
+        calls["concurrency"] = concurrency
+        calls["llm_cache"] = llm_cache
+        calls["window_tokens"] = window_tokens
 
     monkeypatch.setattr("pipeline.run_pipeline", fake_run)
 
@@ -57,6 +87,21 @@ def test_main_invokes_pipeline(monkeypatch):
         "embed_model": "e",
         "retrieval_method": "faiss",
         "batch": False,
+        "jobs": 1,
+        "page_jobs": 1,
+        "ocr_jobs": 1,
+        "profile": "accurate",
+        "backend": "pdfminer",
+        "text_format": "json",
+        "sections": None,
+        "lazy_pages": None,
+        "extract_timeout": 600.0,
+        "extract_max_rss_mb": 4096.0,
+        "near_duplicate_threshold": 0.4,
+        "shared_store": None,
+        "concurrency": 1,
+        "llm_cache": True,
+        "window_tokens": None,
         "base_dir": Path("data"),
     }
 
@@ -74,6 +119,21 @@ def test_batch_flag(monkeypatch):
         embed_model: str | None,
         retrieval_method: str,
         batch: bool,
+        jobs: int,
+        page_jobs: int,
+        ocr_jobs: int,
+        profile: str,
+        backend: str,
+        text_format: str,
+        sections: list[str] | None,
+        lazy_pages: int | None,
+        extract_timeout: float | None,
+        extract_max_rss_mb: float | None,
+        near_duplicate_threshold: float | None,
+        shared_store: Path | None,
+        concurrency: int,
+        llm_cache: bool,
+        window_tokens: int | None,
     ) -> None:
         calls["batch"] = batch
 
@@ -91,3 +151,17 @@ def test_batch_flag(monkeypatch):
 
     assert code == 0
     assert calls == {"batch": True}
+
+
+def test_sections_all_sends_full_text(monkeypatch):
+    calls = {}
+    monkeypatch.setattr(
+        "pipeline.run_pipeline",
+        lambda *a, **k: calls.update(sections=k["sections"]),
+    )
+
+    run_pipeline.main(["--pdf_dir", "p", "--drug", "rapa", "--sections", "all"])
+    assert calls == {"sections": None}
+
+    run_pipeline.main(["--pdf_dir", "p", "--drug", "rapa", "--sections", "methods"])
+    assert calls == {"sections": ["methods"]}
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import orjson
+import pytest
+
+from extract.sections import detect_sections, select_sections
+from extract.text_files import open_page_writer, read_sections, read_text
+
+PAGES = [
+    "A Mendelian randomization study\ndoi:10.1/x\nAbstract\nWe studied mTOR.",
+    "1. Introduction\nRapamycin extends lifespan.\n2. Methods\nWe used GWAS data.",
+    "Results\nThe effect was 0.3.\nDiscussion\nIt works.",
+    "References\n1. Smith J. Nature.\nAcknowledgements\nThanks.",
+]
+
+
+def _names(spans):
+    return [span["name"] for span in spans]
+
+
+def test_detect_sections_finds_headings() -> None:
+    spans = detect_sections(PAGES)
+    assert _names(spans) == [
+        "front",
+        "introduction",
+        "methods",
+        "results",
+        "discussion",
+        "references",
+        "declarations",
+    ]
+    text = "\n".join(PAGES)
+    methods = next(s for s in spans if s["name"] == "methods")
+    assert text[methods["start"] : methods["end"]].strip() == (
+        "2. Methods\nWe used GWAS data."
+    )
+    assert methods["page"] == 2
+
+
+def test_front_covers_first_page() -> None:
+    spans = detect_sections(PAGES)
+    text = "\n".join(PAGES)
+    # The abstract heading is on page 1, so it is folded into the front matter.
+    assert text[: spans[0]["end"]].strip() == PAGES[0]
+
+
+def test_headings_require_a_capital_letter() -> None:
+    pages = ["Title", "Methods\nsee the methods\nresults\nmore"]
+    assert _names(detect_sections(pages)) == ["front", "methods"]
+
+
+def test_select_sections_keeps_front_and_requested() -> None:
+    text = "\n".join(PAGES)
+    selected = select_sections(text, detect_sections(PAGES), ["methods"])
+    assert selected == PAGES[0] + "\n2. Methods\nWe used GWAS data."
+
+
+def test_select_sections_falls_back_to_full_text() -> None:
+    text = "\n".join(PAGES)
+    spans = detect_sections(PAGES)
+    assert select_sections(text, spans, None) == text
+    assert select_sections(text, [], ["methods"]) == text
+    assert select_sections(text, spans, ["supplementary"]) == text
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".pages"])
+def test_streamed_files_store_sections(tmp_path: Path, suffix: str) -> None:
+    path = tmp_path / f"doc{suffix}"
+    with open_page_writer(path) as writer:
+        for text in PAGES:
+            writer.write(text)
+    assert read_sections(path) == detect_sections(PAGES)
+    assert read_text(path, ["methods"]).endswith("We used GWAS data.")
+    assert read_text(path) == "\n".join(PAGES)
+
+
+def test_read_sections_detects_missing_spans(tmp_path: Path) -> None:
+    path = tmp_path / "doc.json"
+    pages = [{"page": i + 1, "text": t} for i, t in enumerate(PAGES)]
+    path.write_bytes(orjson.dumps({"pages": pages, "extracted_at": "x"}))
+    assert read_sections(path) == detect_sections(PAGES)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import agent2.openai_index as openai_index
+import pipeline
+from extract.text_files import iter_pages, replace_pages
+from ingest.shared_store import SharedStore, main
+from utils.disk_cache import DiskCache
+
+
+def create_pdf(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    c = canvas.Canvas(str(path), pagesize=letter)
+    c.drawString(100, 750, "Shared paper")
+    c.showPage()
+    c.save()
+
+
+def test_workspaces_share_extraction(monkeypatch, tmp_path: Path, capsys) -> None:
+    monkeypatch.setattr("ingest.collector.LOG_PATH", tmp_path / "log.jsonl")
+    store = SharedStore(tmp_path / "shared")
+    create_pdf(tmp_path / "Rapa" / "pdfs" / "paper.pdf")
+    shutil.copytree(tmp_path / "Rapa" / "pdfs", tmp_path / "Metformin" / "pdfs")
+
+    rapa = pipeline.make_dirs(tmp_path / "Rapa")
+    first = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(rapa.pdfs), rapa, shared=store, stats=first)
+    assert (first.misses, first.shared) == (1, 0)
+
+    metformin = pipeline.make_dirs(tmp_path / "Metformin")
+    second = pipeline.ExtractionStats()
+    pipeline.ingest_pdfs(str(metformin.pdfs), metformin, shared=store, stats=second)
+    assert (second.hits, second.misses, second.shared) == (1, 0, 1)
+
+    a = rapa.text / "paper.json"
+    b = metformin.text / "paper.json"
+    assert a.stat().st_ino == b.stat().st_ino
+    assert a.stat().st_nlink == 3
+
+    # Rewriting one workspace's copy leaves the store and the other alone.
+    replace_pages(b, {1: "edited"})
+    assert [p["text"] for p in iter_pages(a)] == ["Shared paper"]
+    assert [p["text"] for p in iter_pages(b)] == ["edited"]
+
+    assert main([str(store.root)]) == 0
+    assert "1 papers, 1 text files" in capsys.readouterr().out
+
+
+def test_embeddings_are_cached(monkeypatch, tmp_path: Path) -> None:
+    requested = []
+
+    def fake_embed(chunks, *, model):
+        requested.extend(chunks)
+        return [[float(len(c)), 1.0] for c in chunks]
+
+    monkeypatch.setattr(openai_index, "embed_chunks", fake_embed)
+    with DiskCache(tmp_path / "emb.sqlite3", max_bytes=1 << 20) as cache:
+        first = openai_index.embed_with_cache(["a", "bb"], model="m", cache=cache)
+        second = openai_index.embed_with_cache(["bb", "ccc"], model="m", cache=cache)
+        openai_index.embed_with_cache(["a"], model="other", cache=cache)
+    assert first == [[1.0, 1.0], [2.0, 1.0]]
+    assert second == [[2.0, 1.0], [3.0, 1.0]]
+    assert requested == ["a", "bb", "ccc", "a"]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import orjson
+import pytest
+
+from extract.text_files import (
+    PageWriter,
+    find_text_file,
+    iter_pages,
+    list_text_files,
+    replace_pages,
+)
+
+
+def test_page_writer_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "doc.jsonl"
+    with PageWriter(path) as writer:
+        assert writer.write("first") == 1
+        assert not path.exists()
+        writer.write("second")
+
+    assert list(iter_pages(path)) == [
+        {"page": 1, "text": "first"},
+        {"page": 2, "text": "second"},
+    ]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_page_writer_discards_partial_output(tmp_path: Path) -> None:
+    path = tmp_path / "doc.jsonl"
+    with pytest.raises(RuntimeError):
+        with PageWriter(path) as writer:
+            writer.write("first")
+            raise RuntimeError("boom")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_iter_pages_reads_whole_document_json(tmp_path: Path) -> None:
+    path = tmp_path / "doc.json"
+    pages = [{"page": 1, "text": "a"}, {"page": 2, "text": "b"}]
+    path.write_bytes(orjson.dumps({"pages": pages, "extracted_at": "x"}))
+    assert list(iter_pages(path)) == pages
+
+
+def test_replace_pages(tmp_path: Path) -> None:
+    path = tmp_path / "doc.jsonl"
+    with PageWriter(path) as writer:
+        for text in ("a", "", "c"):
+            writer.write(text)
+    replace_pages(path, {2: "b"})
+    assert [p["text"] for p in iter_pages(path)] == ["a", "b", "c"]
+
+
+def test_meta_is_read_from_header_and_trailer(tmp_path: Path) -> None:
+    from extract import text_files
+
+    path = tmp_path / "doc.jsonl"
+    with PageWriter(path, meta={"lazy": {"deferred": [2]}}) as writer:
+        for text in ("a" * 100, "b" * 100):
+            writer.write(text)
+    with path.open("rb") as f:
+        assert text_files._last_line(f, block_size=7).startswith(b'{"sections"')
+    meta = text_files.read_meta(path)
+    assert meta["lazy"] == {"deferred": [2]} and "extracted_at" in meta
+    assert text_files.has_deferred_pages(path)
+
+
+def test_deferred_pages_found_without_parsing_json(tmp_path: Path) -> None:
+    from extract.text_files import has_deferred_pages
+
+    path = tmp_path / "doc.json"
+    pages = [{"page": 1, "text": 'quoted "lazy":{ text'}]
+    path.write_bytes(orjson.dumps({"pages": pages, "lazy": None}))
+    assert not has_deferred_pages(path)
+    path.write_bytes(orjson.dumps({"pages": pages, "lazy": {"deferred": [2]}}))
+    assert has_deferred_pages(path)
+
+
+def test_list_and_find_text_files(tmp_path: Path) -> None:
+    (tmp_path / "a.json").write_bytes(b"{}")
+    (tmp_path / "b.jsonl").write_bytes(b"")
+    (tmp_path / "notes.txt").write_bytes(b"")
+    assert [p.name for p in list_text_files(tmp_path)] == ["a.json", "b.jsonl"]
+    assert find_text_file(tmp_path, "b") == tmp_path / "b.jsonl"
+    assert find_text_file(tmp_path, "c") is None
+
+
+def test_page_corpus_files_are_text_files(tmp_path: Path) -> None:
+    from extract.text_files import open_page_writer, read_text
+
+    path = tmp_path / "doc.pages"
+    with open_page_writer(path, codec="zlib") as writer:
+        for text in ("a", "", "c"):
+            writer.write(text)
+    replace_pages(path, {2: "b"})
+
+    assert [p["text"] for p in iter_pages(path)] == ["a", "b", "c"]
+    assert read_text(path) == "a\nb\nc"
+    assert list_text_files(tmp_path) == [path]
+
+
+def test_convert_text_dir_updates_manifest(tmp_path: Path) -> None:
+    from extract.manifest import MANIFEST_NAME, ExtractionManifest
+    from extract.text_files import main, read_text
+
+    text_dir = tmp_path / "text"
+    text_dir.mkdir()
+    pages = [{"page": 1, "text": "one"}, {"page": 2, "text": "two"}]
+    (text_dir / "paper.json").write_bytes(orjson.dumps({"pages": pages}))
+    manifest = ExtractionManifest(tmp_path / MANIFEST_NAME, text_dir)
+    manifest.record("md5", "fp", text_dir / "paper.json", "paper.pdf")
+    manifest.save()
+
+    assert main([str(text_dir), "--to", "pages"]) == 0
+
+    converted = text_dir / "paper.pages"
+    assert list_text_files(text_dir) == [converted]
+    assert read_text(converted) == "one\ntwo"
+    reloaded = ExtractionManifest(tmp_path / MANIFEST_NAME, text_dir)
+    assert reloaded.lookup("md5", "fp") == converted
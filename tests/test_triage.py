@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PIL import Image
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+import extract.pdf_to_text as pdf_to_text
+import pipeline
+from extract.triage import Triage, main, triage_pdf
+from extract.workers import JobOutcome
+
+
+def create_pdf(path: Path, pages: str) -> None:
+    """Write one page per character of ``pages``: ``t`` text, ``s`` scan."""
+    scan = ImageReader(Image.new("RGB", (200, 100), "white"))
+    c = canvas.Canvas(str(path), pagesize=letter)
+    for i, kind in enumerate(pages):
+        if kind == "t":
+            c.drawString(100, 750, f"Page {i + 1} text")
+        else:
+            c.drawImage(scan, 100, 500, width=200, height=100)
+        c.showPage()
+    c.save()
+
+
+def test_triage_kinds(tmp_path: Path) -> None:
+    for name, pages in [("text", "tt"), ("scanned", "sss"), ("mixed", "tst")]:
+        create_pdf(tmp_path / f"{name}.pdf", pages)
+        triage = triage_pdf(tmp_path / f"{name}.pdf")
+        assert triage.pages == len(pages)
+        assert triage.kind == name
+    assert triage_pdf(tmp_path / "mixed.pdf").image_pages == [1]
+
+
+def test_estimate_seconds() -> None:
+    triage = Triage(pages=10, image_pages=[0, 1])
+    assert triage.estimate_seconds("accurate", "pdfminer") == 8 * 0.2 + 2 * 3.0
+    assert Triage(pages=10).estimate_seconds(backend="pdfium") < 0.1
+
+
+def test_image_pages_skip_text_backend(monkeypatch, tmp_path: Path) -> None:
+    pdf = tmp_path / "mixed.pdf"
+    create_pdf(pdf, "tst")
+    seen = []
+    real = pdf_to_text.extract_text
+
+    def spy(pdf_path, **kwargs):
+        seen.append(kwargs.get("page_numbers"))
+        return real(pdf_path, **kwargs)
+
+    monkeypatch.setattr(pdf_to_text, "extract_text", spy)
+    monkeypatch.setattr(pdf_to_text, "_ocr_blank_pages", lambda p, blank, **k: {})
+    result = pdf_to_text.pdf_to_text(pdf, out_dir=tmp_path, image_pages=[1])
+    assert seen == [[0, 2]]
+    assert [p.text for p in result.pages] == ["Page 1 text", "", "Page 3 text"]
+    assert result.lazy is None
+
+
+def test_extract_texts_routes_to_queues(monkeypatch, tmp_path: Path) -> None:
+    pdfs = []
+    for name, pages in [("short", "t"), ("long", "ttt"), ("scan", "ss")]:
+        pdfs.append(tmp_path / f"{name}.pdf")
+        create_pdf(pdfs[-1], pages)
+    queues = []
+
+    def fake_run(calls, *, workers, limits):
+        if calls[0][0] is triage_pdf:
+            return [JobOutcome(value=func(*args)) for func, args in calls]
+        queues.append(
+            (workers, [(args[0].name, args[2], list(args[7])) for _, args in calls])
+        )
+        return [JobOutcome(value=args[0]) for _, args in calls]
+
+    monkeypatch.setattr(pipeline, "run_isolated", fake_run)
+    monkeypatch.setattr(pipeline.os, "cpu_count", lambda: 8)
+    stats = pipeline.ExtractionStats()
+    results = pipeline.extract_texts(
+        pdfs, tmp_path / "text", jobs=4, ocr_jobs=2, stats=stats
+    )
+    assert results == pdfs
+    assert queues == [
+        (4, [("long.pdf", 1, []), ("short.pdf", 1, [])]),
+        (2, [("scan.pdf", 2, [0, 1])]),
+    ]
+    assert stats.triage["scan.pdf"].kind == "scanned"
+
+    # Page processes are capped so jobs x page jobs fits the CPUs.
+    queues.clear()
+    pipeline.extract_texts(pdfs, tmp_path / "text", jobs=4, ocr_jobs=2, page_jobs=8)
+    assert [[job[1] for job in jobs] for _, jobs in queues] == [[2, 2], [4]]
+
+
+def test_main_reports(tmp_path: Path, capsys) -> None:
+    create_pdf(tmp_path / "mixed.pdf", "ts")
+    assert main([str(tmp_path)]) == 0
+    out = capsys.readouterr().out
+    assert "mixed" in out and "0 text, 0 scanned, 1 mixed" in out
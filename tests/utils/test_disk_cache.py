@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from utils.disk_cache import DiskCache
+
+
+def test_get_set_roundtrip(tmp_path: Path) -> None:
+    with DiskCache(tmp_path / "c.sqlite3", max_bytes=100) as cache:
+        assert cache.get("a") is None
+        cache.set("a", b"value")
+        assert cache.get("a") == b"value"
+
+    with DiskCache(tmp_path / "c.sqlite3", max_bytes=100) as cache:
+        assert cache.get("a") == b"value"
+
+
+def test_evicts_least_recently_used(tmp_path: Path, monkeypatch) -> None:
+    clock = iter(range(100))
+    monkeypatch.setattr("utils.disk_cache.time.time", lambda: next(clock))
+
+    with DiskCache(tmp_path / "c.sqlite3", max_bytes=10) as cache:
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        cache.get("a")
+        cache.set("c", b"cccc")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"aaaa"
+        assert cache.get("c") == b"cccc"
+        assert cache.total_bytes() == 8
+        assert len(cache) == 2
+
+
+def test_ttl_expires_entries(tmp_path: Path, monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr("utils.disk_cache.time.time", lambda: now[0])
+
+    with DiskCache(tmp_path / "c.sqlite3", max_bytes=100, ttl=10) as cache:
+        cache.set("a", b"value")
+        now[0] += 5
+        assert cache.get("a") == b"value"
+        now[0] += 6
+        assert cache.get("a") is None
+        assert len(cache) == 0
+        plan = cache.conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM entries WHERE created <= 0"
+        ).fetchall()
+        assert "entries_created" in str(plan)
+
+
+def test_upgrades_caches_without_created_column(tmp_path: Path) -> None:
+    import sqlite3
+
+    path = tmp_path / "c.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+        "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO entries VALUES ('a', x'01', 1, 5.0)")
+    conn.commit()
+    conn.close()
+
+    with DiskCache(path, max_bytes=100) as cache:
+        assert cache.get("a") == b"\x01"
+        cache.set("b", b"\x02")
+        assert len(cache) == 2
+        assert cache.total_bytes() == 2
+
+
+def test_running_total_follows_writes(tmp_path: Path) -> None:
+    with DiskCache(tmp_path / "c.sqlite3", max_bytes=100) as cache:
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bb")
+        cache.set("a", b"a")
+        assert cache.total_bytes() == 3
+        cache.delete("b")
+        assert cache.total_bytes() == 1
+        (total,) = cache.conn.execute("SELECT SUM(size) FROM entries").fetchone()
+        assert total == 1
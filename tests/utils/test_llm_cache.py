@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import types
+
+import pytest
+
+from utils import llm_cache
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(llm_cache, "ENABLED", True)
+    monkeypatch.setattr(llm_cache, "STATS", llm_cache.LLMCacheStats())
+
+
+def test_cached_reply_is_reused(enabled) -> None:
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"answer": len(calls)}, 120
+
+    key = llm_cache.cache_key("chat.completions", "m", "system", "user", "json")
+    assert llm_cache.cached(key, compute) == {"answer": 1}
+    assert llm_cache.cached(key, compute) == {"answer": 1}
+    other = llm_cache.cache_key("chat.completions", "m2", "system", "user", "json")
+    assert llm_cache.cached(other, compute) == {"answer": 2}
+    stats = llm_cache.STATS
+    assert (stats.hits, stats.misses, stats.saved_tokens) == (1, 2, 120)
+
+    llm_cache.discard(key)
+    assert llm_cache.cached(key, compute) == {"answer": 3}
+    assert llm_cache.main([]) == 0
+
+
+def test_disabled_cache_always_computes(monkeypatch) -> None:
+    calls = []
+    key = llm_cache.cache_key("chat.completions", "m", "s", "u")
+    for _ in range(2):
+        llm_cache.cached(key, lambda: (calls.append(1), None))
+    assert len(calls) == 2
+    assert not llm_cache.LLM_CACHE_PATH.exists()
+
+
+def test_rejected_metadata_reply_is_not_reused(enabled, monkeypatch, tmp_path):
+    from agent1 import openai_client
+    from agent1.metadata_extractor import MetadataExtractor
+
+    replies = ['{"title": 1}', '{"title": "T"}']
+    requests = []
+
+    class Completions:
+        def create(self, **kwargs):
+            requests.append(kwargs)
+            message = types.SimpleNamespace(content=replies[len(requests) - 1])
+            return types.SimpleNamespace(
+                choices=[types.SimpleNamespace(message=message)], usage=None
+            )
+
+    fake = types.SimpleNamespace(chat=types.SimpleNamespace(completions=Completions()))
+    monkeypatch.setattr(openai_client, "get_client", lambda: fake)
+    monkeypatch.setattr("agent1.metadata_extractor.META_DIR", tmp_path / "meta")
+    extractor = MetadataExtractor(client=openai_client.OpenAIJSONCaller(model="m"))
+
+    assert extractor.extract("paper text").title == "T"
+    assert extractor.extract("paper text").title == "T"
+    assert len(requests) == 2
@@ -4,7 +4,6 @@ import orjson
 
 from utils.master_diff import generate_diffs
 
-
 FIXTURES = Path(__file__).parents[1] / "fixtures" / "masters"
 
 
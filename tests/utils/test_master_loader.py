@@ -5,7 +5,6 @@ import pytest
 
 from utils.master_loader import ensure_compat, load_master
 
-
 FIXTURES = Path(__file__).parents[1] / "fixtures" / "masters"
 
 
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import rate_limit
+from utils.rate_limit import RateGovernor, parse_duration, retry_after
+
+
+class RateLimitError(Exception):
+    def __init__(self, headers=None):
+        super().__init__("rate limited")
+        self.status_code = 429
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_parse_headers() -> None:
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("6m0s") == 360
+    assert parse_duration("1.5") == 1.5
+    assert parse_duration("soon") is None
+    assert retry_after({"retry-after": "2"}) == 2
+    assert retry_after({"retry-after-ms": "250"}) == 0.25
+    assert retry_after({"x-ratelimit-reset-tokens": "1s"}) == 1
+    assert retry_after({}) is None
+
+
+def test_aimd_and_retry_after(monkeypatch) -> None:
+    governor = RateGovernor()
+    for _ in range(8):
+        with governor.request("m"):
+            pass
+    assert governor.stats()["m"].limit > rate_limit.INITIAL_CONCURRENCY
+
+    # Two requests in flight when the limit is hit halve the window once.
+    first, second = governor.request("m"), governor.request("m")
+    first.__enter__(), second.__enter__()
+    limit = governor.stats()["m"].limit
+    first.__exit__(RateLimitError, RateLimitError({"retry-after-ms": "100"}), None)
+    second.__exit__(RateLimitError, RateLimitError(), None)
+    assert first.retry_after == 0.1 and second.retry_after is None
+    stats = governor.stats()["m"]
+    assert stats.limit == limit / 2
+    assert (stats.rate_limited, stats.in_flight) == (2, 0)
+
+    start = time.monotonic()
+    with governor.request("m"):
+        pass
+    assert time.monotonic() - start >= 0.09
+
+    # Only a retry without a server-timed wait sleeps on its own.
+    slept = []
+    monkeypatch.setattr(rate_limit.time, "sleep", slept.append)
+    first.backoff(1.0)
+    second.backoff(2.0)
+    asyncio.run(second.abackoff(0.0))
+    assert slept == [2.0]
+
+
+def test_request_quota_from_headers(monkeypatch) -> None:
+    monkeypatch.setattr(rate_limit, "WINDOW_SECONDS", 0.2)
+    governor = RateGovernor()
+    headers = {"x-ratelimit-limit-requests": "2", "x-ratelimit-limit-tokens": "100"}
+
+    class Raw:
+        def create(self, **kwargs):
+            usage = SimpleNamespace(total_tokens=30)
+            return SimpleNamespace(
+                headers=headers, parse=lambda: SimpleNamespace(usage=usage)
+            )
+
+    endpoint = SimpleNamespace(with_raw_response=Raw())
+    start = time.monotonic()
+    for _ in range(3):
+        with governor.request("m", tokens=10) as slot:
+            slot.call(endpoint, model="m")
+    assert time.monotonic() - start >= 0.19
+    stats = governor.stats()["m"]
+    assert (stats.rpm, stats.tpm, stats.tokens) == (2, 100, 30)
+
+
+def test_async_requests_share_concurrency(monkeypatch) -> None:
+    monkeypatch.setattr(rate_limit, "INITIAL_CONCURRENCY", 2.0)
+    monkeypatch.setattr(rate_limit, "MAX_CONCURRENCY", 2.0)
+    governor = RateGovernor()
+    peak = 0
+
+    async def request() -> None:
+        nonlocal peak
+        async with governor.request("m"):
+            peak = max(peak, governor.stats()["m"].in_flight)
+            await asyncio.sleep(0.01)
+
+    async def main() -> None:
+        await asyncio.gather(*(request() for _ in range(10)))
+
+    asyncio.run(main())
+    assert peak == 2
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import types
+
+from utils import tokens
+
+
+def test_estimate_counts_pieces(monkeypatch) -> None:
+    monkeypatch.setattr(tokens, "tiktoken", None)
+    tokens._encoding.cache_clear()
+
+    assert tokens.estimate_tokens("the mouse") == 2
+    # Long words, numbers in groups of three, symbol pairs and line breaks.
+    assert tokens.estimate_tokens("immunosuppressive") == 3
+    assert tokens.estimate_tokens("1234567") == 3
+    assert tokens.estimate_tokens("(P<0.05).") == 7
+    assert tokens.estimate_tokens("a\n\nb  c") == 5
+    assert tokens.count_tokens("the mouse") == 2
+    assert tokens.encoding_name() == "estimate"
+    messages = [{"role": "system", "content": "x"}, {"role": "user", "content": "y"}]
+    assert tokens.count_chat_tokens(messages) == 2 + 2 * 3 + 3
+    tokens._encoding.cache_clear()
+
+
+def test_encoding_used_when_available(monkeypatch) -> None:
+    encoding = types.SimpleNamespace(
+        name="fake", encode_ordinary=lambda text: list(text)
+    )
+    fake = types.SimpleNamespace(encoding_for_model=lambda model: encoding)
+    monkeypatch.setattr(tokens, "tiktoken", fake)
+    tokens._encoding.cache_clear()
+
+    assert tokens.count_tokens("abcd", "gpt-4o") == 4
+    assert tokens.encoding_name("gpt-4o") == "fake"
+    tokens._encoding.cache_clear()
+
+
+def test_context_window() -> None:
+    assert tokens.context_window("gpt-4o-2024-05-13") == 128_000
+    assert tokens.context_window("gpt-4-0613") == 8_192
+    assert tokens.context_window("unknown") == tokens.DEFAULT_CONTEXT_WINDOW
+    assert tokens.fits_context(120_000, "gpt-4o")
+    assert not tokens.fits_context(125_000, "gpt-4o")
+
+
+def test_split_text_respects_limit() -> None:
+    text = "\n".join(f"line {i} with several words" for i in range(30))
+    pieces = tokens.split_text(text, 40)
+    assert len(pieces) > 1
+    assert "\n".join(pieces) == text
+    assert all(tokens.count_tokens(p) <= 40 for p in pieces)
+    # A line longer than the limit is broken between words.
+    assert tokens.split_text("a b c d e f", 2) == ["a b", "c d", "e f"]
@@ -12,6 +12,7 @@ if str(ROOT_DIR) not in sys.path:
 
 import aggregate  # noqa: E402
 from ingest.collector import LOG_PATH  # noqa: E402
+from ingest.checksum_store import store_path_for  # noqa: E402
 from ingest.list_pdfs import DATA_DIR as PDF_DIR  # noqa: E402
 from extract.pdf_to_text import DATA_DIR as TEXT_DIR  # noqa: E402
 from agent1.metadata_extractor import META_DIR  # noqa: E402
@@ -47,6 +48,8 @@ def wipe_data(delete_pdfs: bool = False) -> None:
     ]
     for path in targets:
         _remove(path)
+    store = store_path_for(LOG_PATH)
+    files.extend(store.with_name(store.name + sfx) for sfx in ("", "-wal", "-shm"))
     for path in files:
         _remove(path)
     if delete_pdfs and PDF_DIR.exists():
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+from types import TracebackType
+from typing import Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    created REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET size = size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size + NEW.size;
+END;
+"""
+
+
+def _add_totals_row(conn: sqlite3.Connection) -> None:
+    """Seed the running size total, summing entries written before it existed.
+
+    The triggers keep ``totals`` in step from then on, so writes no longer sum
+    the sizes of all entries. Entries inserted by another process between the
+    triggers' creation and this seeding are counted by the sum.
+    """
+    if conn.execute("SELECT 1 FROM totals").fetchone() is not None:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(
+        "INSERT OR IGNORE INTO totals (id, size) "
+        "SELECT 0, COALESCE(SUM(size), 0) FROM entries"
+    )
+    conn.execute("COMMIT")
+
+
+def _add_created_column(conn: sqlite3.Connection) -> None:
+    """Upgrade caches written before entries recorded their creation time.
+
+    The column is indexed so the TTL purge on each write is a range scan.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+    if "created" not in columns:
+        conn.execute("ALTER TABLE entries ADD COLUMN created REAL NOT NULL DEFAULT 0")
+        conn.execute("UPDATE entries SET created = last_used")
+    conn.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created)")
+
+
+class DiskCache:
+    """Size-bounded key/value cache in a SQLite file with LRU eviction.
+
+    Values are bytes. Reading an entry refreshes its ``last_used`` time and
+    writes evict the least recently used entries until the stored values fit
+    in ``max_bytes``. With a ``ttl`` (seconds), entries written longer ago
+    than that are treated as missing and dropped. The database runs in WAL
+    mode so several processes can share one cache file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int,
+        timeout: float = 30.0,
+        ttl: float | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.ttl = ttl
+        self._conn: sqlite3.Connection | None = None
+        self._lock = Lock()
+
+    def open(self) -> "DiskCache":
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            _add_created_column(conn)
+            _add_totals_row(conn)
+            self._conn = conn
+        return self
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "DiskCache":
+        return self.open()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError("DiskCache is not open")
+        return self._conn
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, created FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if self.ttl is not None and row[1] <= now - self.ttl:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self.conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (now, key)
+            )
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                # An upsert, not INSERT OR REPLACE: the rows REPLACE deletes
+                # do not fire the delete trigger that maintains ``totals``.
+                conn.execute(
+                    "INSERT INTO entries (key, value, size, last_used, created) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "value = excluded.value, size = excluded.size, "
+                    "last_used = excluded.last_used, created = excluded.created",
+                    (key, value, len(value), now, now),
+                )
+                self._evict()
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self) -> None:
+        if self.ttl is not None:
+            self.conn.execute(
+                "DELETE FROM entries WHERE created <= ?", (time.time() - self.ttl,)
+            )
+        excess = self._total() - self.max_bytes
+        if excess <= 0:
+            return
+        doomed = []
+        rows = self.conn.execute("SELECT key, size FROM entries ORDER BY last_used")
+        for key, size in rows:
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self.conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def _total(self) -> int:
+        return self.conn.execute("SELECT size FROM totals").fetchone()[0]
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import orjson
+
+from utils.disk_cache import DiskCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Model replies keyed by everything that shapes them, so a rerun on unchanged
+# inputs makes no API calls. ``ENABLED = False`` (``--no-llm-cache``) always
+# calls the API and leaves the cache untouched.
+LLM_CACHE_PATH = Path(__file__).resolve().parents[1] / "data" / "llm_cache.sqlite3"
+LLM_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Replies older than this are requested again, e.g. after a model alias moves.
+LLM_CACHE_TTL = 30 * 24 * 3600.0
+ENABLED = True
+
+# A compute function returns the reply and the tokens it cost (if known).
+Reply = Tuple[Any, Optional[int]]
+
+
+@dataclass
+class LLMCacheStats:
+    """Lookups of this process and what the hits saved."""
+
+    hits: int = 0
+    misses: int = 0
+    saved_tokens: int = 0
+    saved_seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses; saved "
+            f"{self.saved_tokens} tokens and {self.saved_seconds:.1f}s"
+        )
+
+
+STATS = LLMCacheStats()
+
+_cache: DiskCache | None = None
+
+
+def _open_cache() -> DiskCache:
+    global _cache
+    if _cache is None or _cache.path != LLM_CACHE_PATH:
+        if _cache is not None:
+            _cache.close()
+        _cache = DiskCache(
+            LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL
+        ).open()
+    return _cache
+
+
+def cache_key(
+    endpoint: str,
+    model: str,
+    system: str,
+    user: str,
+    response_format: str | None = None,
+) -> str:
+    """Return the cache key of one request."""
+    payload = orjson.dumps([endpoint, model, system, user, response_format])
+    return blake2b(payload, digest_size=20).hexdigest()
+
+
+def _lookup(key: str) -> Tuple[bool, Any]:
+    raw = _open_cache().get(key)
+    if raw is None:
+        STATS.misses += 1
+        return False, None
+    record = orjson.loads(raw)
+    STATS.hits += 1
+    STATS.saved_tokens += record.get("tokens") or 0
+    STATS.saved_seconds += record.get("seconds") or 0.0
+    return True, record["value"]
+
+
+def _store(key: str, value: Any, tokens: Optional[int], seconds: float) -> None:
+    record = {"value": value, "tokens": tokens, "seconds": seconds}
+    _open_cache().set(key, orjson.dumps(record))
+
+
+def cached(key: str, compute: Callable[[], Reply]) -> Any:
+    """Return the reply stored under ``key`` or compute and store it.
+
+    ``compute`` is only called on a miss, and exceptions it raises are not
+    cached.
+    """
+    if not ENABLED:
+        return compute()[0]
+    hit, value = _lookup(key)
+    if hit:
+        return value
+    start = time.perf_counter()
+    value, tokens = compute()
+    _store(key, value, tokens, time.perf_counter() - start)
+    return value
+
+
+async def acached(key: str, compute: Callable[[], Awaitable[Reply]]) -> Any:
+    """Async variant of :func:`cached`."""
+    if not ENABLED:
+        return (await compute())[0]
+    hit, value = _lookup(key)
+    if hit:
+        return value
+    start = time.perf_counter()
+    value, tokens = await compute()
+    _store(key, value, tokens, time.perf_counter() - start)
+    return value
+
+
+def discard(key: str) -> None:
+    """Drop the reply stored under ``key``, e.g. after it failed validation."""
+    if ENABLED:
+        _open_cache().delete(key)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect the LLM response cache")
+    parser.add_argument("--clear", action="store_true", help="Remove all replies")
+    args = parser.parse_args(argv)
+
+    if not LLM_CACHE_PATH.exists():
+        print("No LLM response cache")
+        return 0
+    with DiskCache(LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_BYTES) as cache:
+        if args.clear:
+            cache.conn.execute("DELETE FROM entries")
+        print(
+            f"{len(cache)} replies, {cache.total_bytes() / 1e6:.1f} MB "
+            f"in {LLM_CACHE_PATH}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
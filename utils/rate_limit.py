@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# AIMD concurrency per model: every successful request raises the limit by
+# ``1 / limit`` (about one slot per round of requests), every 429 halves it.
+INITIAL_CONCURRENCY = 8.0
+MIN_CONCURRENCY = 1.0
+MAX_CONCURRENCY = 64.0
+DECREASE_FACTOR = 0.5
+
+# Requests and tokens are counted over a sliding minute and checked against
+# the per-model quota reported in the ``x-ratelimit-limit-*`` headers.
+WINDOW_SECONDS = 60.0
+
+# Longest single wait between checks; a finished request can free a slot
+# sooner than any computed deadline.
+POLL_SECONDS = 0.05
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: str | None) -> Optional[float]:
+    """Parse a reset time such as ``"20ms"``, ``"1.5s"`` or ``"6m0s"``."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _UNITS[unit] for number, unit in parts)
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def retry_after(headers: Mapping[str, str] | None) -> Optional[float]:
+    """Return the wait in seconds the server asked for in ``headers``."""
+    if not headers:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms is not None:
+        try:
+            return float(ms) / 1000
+        except ValueError:
+            pass
+    seconds = parse_duration(headers.get("retry-after"))
+    if seconds is not None:
+        return seconds
+    resets = [
+        parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+        for kind in ("requests", "tokens")
+    ]
+    found = [r for r in resets if r is not None]
+    return max(found) if found else None
+
+
+def _headers_of(exc: BaseException) -> Optional[Mapping[str, str]]:
+    response = getattr(exc, "response", None)
+    return getattr(response, "headers", None)
+
+
+def is_rate_limit(exc: BaseException) -> bool:
+    return (
+        getattr(exc, "status_code", None) == 429
+        or type(exc).__name__ == "RateLimitError"
+    )
+
+
+@dataclass
+class ModelStats:
+    """Rate-limit state of one model, as returned by ``RateGovernor.stats``."""
+
+    limit: float
+    in_flight: int
+    requests: int
+    tokens: int
+    rate_limited: int
+    rpm: Optional[int]
+    tpm: Optional[int]
+
+
+@dataclass
+class _ModelState:
+    limit: float
+    in_flight: int = 0
+    # ``[started_at, tokens]`` of each request started in the last minute.
+    window: Deque[List[float]] = field(default_factory=deque)
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
+    blocked_until: float = 0.0
+    last_decrease: float = 0.0
+    rate_limited: int = 0
+
+
+class Slot:
+    """One admitted request. Use as a (async) context manager.
+
+    Leaving the block normally counts as a success and widens the model's
+    concurrency; a rate-limit error narrows it and, when the server sent
+    ``Retry-After`` or ``x-ratelimit-reset-*``, blocks the model until then.
+    ``retry_after`` then holds that wait; :meth:`backoff` sleeps only when it
+    is ``None``.
+    """
+
+    def __init__(self, governor: "RateGovernor", model: str, tokens: int) -> None:
+        self.governor = governor
+        self.model = model
+        self.tokens = tokens
+        self.retry_after: Optional[float] = None
+        self._entry: Optional[List[float]] = None
+
+    def __enter__(self) -> "Slot":
+        self._entry = self.governor._acquire(self.model, self.tokens)
+        return self
+
+    async def __aenter__(self) -> "Slot":
+        self._entry = await self.governor._aacquire(self.model, self.tokens)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self._finish(exc)
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self._finish(exc)
+
+    def _finish(self, exc: Optional[BaseException]) -> None:
+        if self._entry is None:
+            return
+        entry, self._entry = self._entry, None
+        if exc is not None and is_rate_limit(exc):
+            headers = _headers_of(exc)
+            self.governor.observe(self.model, headers)
+            self.retry_after = self.governor._throttled(
+                self.model, entry[0], retry_after(headers)
+            )
+        self.governor._release(self.model, success=exc is None)
+
+    def backoff(self, delay: float) -> None:
+        """Sleep ``delay`` seconds before a retry, unless the server timed one.
+
+        After a rate limit with ``retry_after`` the governor already holds the
+        model's next request until then, so sleeping here would wait twice.
+        """
+        if self.retry_after is None:
+            time.sleep(delay)
+
+    async def abackoff(self, delay: float) -> None:
+        """Async variant of :meth:`backoff`."""
+        if self.retry_after is None:
+            await asyncio.sleep(delay)
+
+    def used(self, tokens: int | None) -> None:
+        """Replace the reserved token estimate with the actual usage."""
+        if tokens is not None and self._entry is not None:
+            with self.governor._cond:
+                self._entry[1] = tokens
+
+    def _record(self, response: Any, headers: Mapping[str, str] | None) -> Any:
+        self.governor.observe(self.model, headers)
+        usage = getattr(response, "usage", None)
+        total = (
+            usage.get("total_tokens")
+            if isinstance(usage, dict)
+            else getattr(usage, "total_tokens", None)
+        )
+        self.used(total if isinstance(total, int) else None)
+        return response
+
+    def call(self, endpoint: Any, **kwargs: Any) -> Any:
+        """Return ``endpoint.create(**kwargs)``, reading the rate-limit headers.
+
+        ``endpoint`` is an SDK resource such as ``client.chat.completions``.
+        """
+        raw = getattr(endpoint, "with_raw_response", None)
+        if raw is None:
+            return self._record(endpoint.create(**kwargs), None)
+        response = raw.create(**kwargs)
+        return self._record(response.parse(), response.headers)
+
+    async def acall(self, endpoint: Any, **kwargs: Any) -> Any:
+        """Async variant of :meth:`call` for ``AsyncOpenAI`` resources."""
+        raw = getattr(endpoint, "with_raw_response", None)
+        if raw is None:
+            return self._record(await endpoint.create(**kwargs), None)
+        response = await raw.create(**kwargs)
+        parsed = response.parse()
+        if inspect.isawaitable(parsed):
+            parsed = await parsed
+        return self._record(parsed, response.headers)
+
+
+class RateGovernor:
+    """Process-wide admission control for OpenAI requests, per model.
+
+    A request waits until its model has a free concurrency slot, the model
+    is not blocked by a ``Retry-After``, and, once the quota is known from
+    the response headers, the last minute's requests and tokens leave room
+    for it. Threads and asyncio tasks share the same state.
+    """
+
+    def __init__(self) -> None:
+        self._models: Dict[str, _ModelState] = {}
+        self._cond = threading.Condition()
+
+    def request(self, model: str, tokens: int = 0) -> Slot:
+        """Return a slot for one request to ``model`` reserving ``tokens``."""
+        return Slot(self, model, tokens)
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = self._models[model] = _ModelState(limit=INITIAL_CONCURRENCY)
+        return state
+
+    def _wait(self, state: _ModelState, tokens: int, now: float) -> float:
+        """Return how long a request must wait, ``0`` if it may start now."""
+        while state.window and state.window[0][0] <= now - WINDOW_SECONDS:
+            state.window.popleft()
+        if now < state.blocked_until:
+            return state.blocked_until - now
+        if state.in_flight >= int(state.limit):
+            return POLL_SECONDS
+        if state.window:
+            until_oldest_expires = state.window[0][0] + WINDOW_SECONDS - now
+            if state.rpm is not None and len(state.window) >= state.rpm:
+                return until_oldest_expires
+            used = sum(tokens for _, tokens in state.window)
+            if state.tpm is not None and used + tokens > state.tpm:
+                return until_oldest_expires
+        return 0.0
+
+    def _try_acquire(self, model: str, tokens: int) -> Tuple[float, List[float]]:
+        now = time.monotonic()
+        state = self._state(model)
+        wait = self._wait(state, tokens, now)
+        if wait > 0:
+            return wait, []
+        state.in_flight += 1
+        entry = [now, float(tokens)]
+        state.window.append(entry)
+        return 0.0, entry
+
+    def _acquire(self, model: str, tokens: int) -> List[float]:
+        with self._cond:
+            while True:
+                wait, entry = self._try_acquire(model, tokens)
+                if not wait:
+                    return entry
+                self._cond.wait(min(wait, 1.0))
+
+    async def _aacquire(self, model: str, tokens: int) -> List[float]:
+        while True:
+            with self._cond:
+                wait, entry = self._try_acquire(model, tokens)
+            if not wait:
+                return entry
+            await asyncio.sleep(min(wait, POLL_SECONDS))
+
+    def _release(self, model: str, *, success: bool) -> None:
+        with self._cond:
+            state = self._state(model)
+            state.in_flight -= 1
+            if success:
+                state.limit = min(MAX_CONCURRENCY, state.limit + 1 / state.limit)
+            self._cond.notify_all()
+
+    def _throttled(
+        self, model: str, started: float, wait: Optional[float]
+    ) -> Optional[float]:
+        with self._cond:
+            state = self._state(model)
+            state.rate_limited += 1
+            now = time.monotonic()
+            # Requests already in flight when the limit was cut report the
+            # same congestion; only the first of them shrinks the window.
+            if started >= state.last_decrease:
+                state.limit = max(MIN_CONCURRENCY, state.limit * DECREASE_FACTOR)
+                state.last_decrease = now
+                logger.warning(
+                    "Rate limited on %s; concurrency reduced to %d",
+                    model,
+                    int(state.limit),
+                )
+            if wait is not None:
+                state.blocked_until = max(state.blocked_until, now + wait)
+            return wait
+
+    def observe(self, model: str, headers: Mapping[str, str] | None) -> None:
+        """Update the quota of ``model`` from ``x-ratelimit-*`` headers."""
+        if not headers:
+            return
+        with self._cond:
+            state = self._state(model)
+            rpm = _int_header(headers, "x-ratelimit-limit-requests")
+            tpm = _int_header(headers, "x-ratelimit-limit-tokens")
+            state.rpm = rpm if rpm is not None else state.rpm
+            state.tpm = tpm if tpm is not None else state.tpm
+            now = time.monotonic()
+            for kind in ("requests", "tokens"):
+                if _int_header(headers, f"x-ratelimit-remaining-{kind}") == 0:
+                    reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                    if reset is not None:
+                        state.blocked_until = max(state.blocked_until, now + reset)
+
+    def stats(self) -> Dict[str, ModelStats]:
+        with self._cond:
+            now = time.monotonic()
+            result = {}
+            for model, state in self._models.items():
+                window = [e for e in state.window if e[0] > now - WINDOW_SECONDS]
+                result[model] = ModelStats(
+                    limit=state.limit,
+                    in_flight=state.in_flight,
+                    requests=len(window),
+                    tokens=int(sum(tokens for _, tokens in window)),
+                    rate_limited=state.rate_limited,
+                    rpm=state.rpm,
+                    tpm=state.tpm,
+                )
+            return result
+
+
+GOVERNOR = RateGovernor()
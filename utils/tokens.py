@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+try:  # exact BPE counts when the encodings are installed or cached
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None  # type: ignore
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MODEL = "gpt-4o-2024-05-13"
+
+# Context window per model family in tokens, matched by the longest prefix of
+# the model name. Unknown models get ``DEFAULT_CONTEXT_WINDOW``.
+CONTEXT_WINDOWS = {
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_047_576,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4": 200_000,
+    "text-embedding-3": 8_191,
+}
+DEFAULT_CONTEXT_WINDOW = 128_000
+# Tokens kept free for the reply when checking whether a request fits.
+COMPLETION_RESERVE = 4_096
+
+# Chat requests cost a few tokens per message on top of the contents.
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Without a BPE encoding the count is estimated from the pieces the encoders
+# split text into before merging: letter runs, digit runs (merged in groups
+# of up to three), symbol runs, runs of extra spaces and line breaks. A letter
+# run of ``n`` ASCII letters counts ``1 + (n - 1) // LETTERS_PER_TOKEN``
+# tokens, non-ASCII letters one token each, and adjacent symbols merge in
+# pairs. The constants err on the high side (about 3 characters per token on
+# the Rapamycin corpus, where BPE encoders typically get 3.5-4), so batches
+# sized with the estimate stay below their limits.
+LETTERS_PER_TOKEN = 6
+DIGITS_PER_TOKEN = 3
+SYMBOLS_PER_TOKEN = 2
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+_NUMBER_RE = re.compile(r"\d+")
+_SYMBOL_RE = re.compile(r"[^\w\s]+|_+")
+_SPACES_RE = re.compile(r"[ \t]{2,}")
+_BREAK_RE = re.compile(r"\s*\n\s*")
+
+
+def context_window(model: str) -> int:
+    """Return the context window of ``model`` in tokens."""
+    matches = [prefix for prefix in CONTEXT_WINDOWS if model.startswith(prefix)]
+    if not matches:
+        return DEFAULT_CONTEXT_WINDOW
+    return CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+def fits_context(tokens: int, model: str) -> bool:
+    """Return ``True`` if a request of ``tokens`` leaves room for the reply."""
+    return tokens + COMPLETION_RESERVE <= context_window(model)
+
+
+def is_context_overflow(exc: BaseException) -> bool:
+    """Return ``True`` if ``exc`` rejected a request longer than the window."""
+    return getattr(exc, "code", None) == "context_length_exceeded"
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> Any:
+    """Return the tiktoken encoding of ``model`` or ``None`` if unavailable.
+
+    tiktoken downloads encodings on first use; offline and without a cached
+    copy (``TIKTOKEN_CACHE_DIR``) the estimator is used instead.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as exc:
+        logger.warning("No BPE encoding for %s, estimating tokens (%s)", model, exc)
+        return None
+
+
+def encoding_name(model: str = DEFAULT_MODEL) -> str:
+    """Return the name of the encoding used to count tokens for ``model``."""
+    encoding = _encoding(model)
+    return encoding.name if encoding is not None else "estimate"
+
+
+def estimate_tokens(text: str) -> int:
+    """Return the estimated number of tokens in ``text`` (see above)."""
+    count = 0
+    for word in _WORD_RE.findall(text):
+        if word.isascii():
+            count += 1 + (len(word) - 1) // LETTERS_PER_TOKEN
+        else:
+            count += len(word)
+    for number in _NUMBER_RE.findall(text):
+        count += -(-len(number) // DIGITS_PER_TOKEN)
+    for symbols in _SYMBOL_RE.findall(text):
+        count += -(-len(symbols) // SYMBOLS_PER_TOKEN)
+    count += len(_SPACES_RE.findall(text))
+    count += len(_BREAK_RE.findall(text))
+    return count
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Return the number of tokens ``model`` sees in ``text``."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode_ordinary(text))
+
+
+def count_chat_tokens(
+    messages: Iterable[Mapping[str, str]], model: str = DEFAULT_MODEL
+) -> int:
+    """Return the prompt tokens of a chat request with ``messages``."""
+    return TOKENS_PER_REPLY + sum(
+        TOKENS_PER_MESSAGE + count_tokens(m["content"], model) for m in messages
+    )
+
+
+def _split_units(text: str, max_tokens: int, model: str) -> Iterator[Tuple[str, int]]:
+    """Yield the lines of ``text`` with their tokens, splitting long lines."""
+    for line in text.splitlines():
+        tokens = count_tokens(line, model) + 1
+        if tokens <= max_tokens:
+            yield line, tokens
+            continue
+        words: List[str] = []
+        total = 0
+        for word in line.split():
+            n = count_tokens(word, model)
+            if words and total + n > max_tokens:
+                yield " ".join(words), total
+                words, total = [], 0
+            words.append(word)
+            total += n
+        if words:
+            yield " ".join(words), total
+
+
+def split_text(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> List[str]:
+    """Split ``text`` into pieces of at most ``max_tokens`` tokens.
+
+    Pieces break at line ends and are about equal in size, so no piece is
+    much longer than the others. A line longer than ``max_tokens`` is broken
+    between words; only a single word longer than that exceeds the limit.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    units = list(_split_units(text, max_tokens, model))
+    total = sum(tokens for _, tokens in units)
+    target = -(-total // max(1, -(-total // max_tokens)))
+    groups: List[Tuple[List[str], int]] = []
+    lines: List[str] = []
+    size = 0
+    for line, tokens in units:
+        if lines and size + tokens > target:
+            groups.append((lines, size))
+            lines, size = [], 0
+        lines.append(line)
+        size += tokens
+    if lines:
+        # Whole lines rarely add up to ``target`` exactly; fold a short
+        # remainder into the previous piece when it still fits.
+        if groups and groups[-1][1] + size <= max_tokens:
+            previous, previous_size = groups.pop()
+            lines, size = previous + lines, previous_size + size
+        groups.append((lines, size))
+    return ["\n".join(lines) for lines, _ in groups]
+
+
+def _load_texts(paths: Sequence[Path]) -> Dict[str, str]:
+    """Return the text of each PDF or extracted text file under ``paths``."""
+    from extract.pdf_to_text import extract_text
+    from extract.text_files import TEXT_SUFFIXES, read_text
+
+    files: List[Path] = []
+    for path in paths:
+        files.extend(sorted(path.iterdir()) if path.is_dir() else [path])
+    texts = {}
+    for path in files:
+        if path.suffix.lower() == ".pdf":
+            texts[path.name] = "\n".join(extract_text(path))
+        elif path.suffix in TEXT_SUFFIXES:
+            texts[path.name] = read_text(path)
+    return texts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Count tokens in a corpus and report the counter's throughput"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["data/Rapamycin/pdfs"],
+        help="PDFs, text files or directories (default: data/Rapamycin/pdfs)",
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Passes over the corpus to time"
+    )
+    args = parser.parse_args(argv)
+
+    texts = _load_texts([Path(p) for p in args.paths])
+    if not texts:
+        print(f"No PDFs or text files found in {', '.join(args.paths)}")
+        return 1
+    chars = sum(len(t) for t in texts.values())
+    words = sum(len(t.split()) for t in texts.values())
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        tokens = sum(count_tokens(t, args.model) for t in texts.values())
+    seconds = (time.perf_counter() - start) / args.repeat
+
+    print(f"{len(texts)} documents, {chars} chars, {words} words")
+    print(
+        f"{tokens} tokens ({encoding_name(args.model)}): "
+        f"{chars / tokens:.2f} chars/token, {tokens / words:.2f} tokens/word"
+    )
+    print(
+        f"{seconds * 1000:.1f} ms per pass, {tokens / seconds / 1e6:.2f} M tokens/s, "
+        f"{chars / seconds / 1e6:.1f} M chars/s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())